@@ -5,14 +5,45 @@ from functools import partial
 from PySide6.QtWidgets import QWidget, QTableWidgetItem, QPushButton, QHBoxLayout, QCheckBox, QLabel, QColorDialog
 from PySide6.QtCore import Qt, QTimer, QObject
 from PySide6.QtGui import QPixmap, QColor
+import numpy as np
 import bpy
-
-from LightManagerUI import CustomLineEditNum
+from bpy.app.handlers import persistent
+
+from LightManagerUI import (CustomLineEditNum, LightContactSheetUI, LightAnimationUI, LightStatsUI, LightRigDiffUI,
+                            RankedTableItem, RANK_ROLE, HANDLE_ROLE)
+import LightCore
+from LightModel import LightModelCache, context_key, snapshot_light
+from LightJournal import (LightJournal, Delta, capture_light, park_light, unpark_light, restore_light,
+                          change_deltas, read_value, write_value)
+from LightCommandServer import LightCommandServer
+from LightRenderQueue import LightRenderQueue
+from LightColor import EffectiveColorCache, color_key
+import LightAnimation
+from LightStats import LightStats, OUTLIER_STOPS
+import LightCost
+from LightSort import LightSortKeys, SORT_COLUMNS
+from LightHandles import LightHandles
+import LightDiff
 
 
 SCRIPT_PATH = os.path.dirname(os.path.abspath(__file__))
 
 
+class TableView:
+    """
+    The light table of one (scene, view layer) context and its bookkeeping.
+    Kept alive while another context is shown, so switching back swaps it in instead of rebuilding it.
+    """
+
+    def __init__(self, light_table: object):
+        self.light_table = light_table
+        self.script_jobs = []  # PER-WIDGET DEPSGRAPH HANDLERS OF THE TABLE
+        self.names = []  # LIGHT NAMES DISPLAYED, IN MODEL ORDER
+        self.sort_keys = LightSortKeys()  # PRECOMPUTED SORT KEYS OF THE MODEL
+        self.sort_order = []  # SORT ORDER LAST APPLIED TO THE TABLE
+        self.temperature_tint = False  # TINT LAST APPLIED TO THE TABLE
+
+
 class BlenderLightLogic(QObject):
     """
     A class that handles the logic and interaction between the UI and Blender.
@@ -27,22 +58,237 @@ class BlenderLightLogic(QObject):
         """
         super().__init__()
         self.ui = ui
-        self.script_jobs = []  # JOB ID COLLECTOR
-        self.lightTypes = ["POINT", "SUN", "SPOT", "AREA"]
+        self.lightTypes = LightCore.LIGHT_TYPES
+        self.models = LightModelCache()  # ONE WARM MODEL PER (SCENE, VIEW LAYER)
+        self.model = None  # MODEL OF THE ACTIVE CONTEXT
+        self.views = {}  # (SCENE NAME, VIEW LAYER NAME) -> TableView
+        self.view = None  # TABLE VIEW OF THE ACTIVE CONTEXT
+        self.switching = False  # THE TABLE OF THE NEW ACTIVE CONTEXT IS NOT SHOWN YET
+        self.journal = LightJournal(on_discard=self.remove_parked)  # UNDO/REDO HISTORY, KEYED BY LIGHT HANDLE
+        self.handles = LightHandles()  # STABLE LIGHT HANDLES FOR THE ROW CLOSURES AND THE JOURNAL
+        self.command_server = None  # OPTIONAL PIPELINE COMMAND SERVER
+        self.render_queue = LightRenderQueue(self.on_render_progress, self.on_render_finished,
+                                             on_error=self.on_render_error)
+        self.contact_sheet = None
+        self.animation_window = None
+        self.stats = LightStats()  # COLUMNAR STATISTICS OF THE DISPLAYED MODEL
+        self.stats_window = None
+        self.stats_timer = QTimer()  # COALESCES DEPSGRAPH UPDATES INTO ONE RECOMPUTE
+        self.stats_timer.setSingleShot(True)
+        self.stats_timer.setInterval(250)
+        self.stats_timer.timeout.connect(self.refresh_stats)
+        self.sort_order = []  # (KEY, DESCENDING) TUPLES, MOST SIGNIFICANT FIRST
+        self.diff_window = None
+        self.diff_settings = None  # SETTINGS OF THE LAST RIG COMPARISON, REUSED AFTER A MERGE
+        self.diff_handles = {}  # LIGHT NAME -> HANDLE AT THE LAST RIG COMPARISON
+        self.cost_flags = {}  # LIGHT HANDLE -> REASONS OF THE LAST COST ESTIMATE
+        self.color_cache = EffectiveColorCache()  # EFFECTIVE SWATCH COLORS BY (COLOR, TEMPERATURE)
+        self.temperature_tint = False  # TINT THE TEMPERATURE ENTRIES WITH THEIR BLACKBODY COLOR
+
+        @persistent
+        def _on_depsgraph_update(scene, depsgraph):
+            self.on_depsgraph_update(depsgraph)
+
+        @persistent
+        def _on_load_post(*args):
+            self.on_load_post()
+
+        @persistent
+        def _on_undo_redo(*args):
+            self.handles.invalidate()  # BLENDER UNDO REALLOCATES THE OBJECTS
+
+        # PERSISTENT HANDLERS SURVIVE FILE LOADS AND ARE REMOVED IN shutdown()
+        self.context_handlers = [
+            (bpy.app.handlers.depsgraph_update_post, _on_depsgraph_update),
+            (bpy.app.handlers.load_post, _on_load_post),
+            (bpy.app.handlers.undo_post, _on_undo_redo),
+            (bpy.app.handlers.redo_post, _on_undo_redo),
+        ]
+        for handlers, handler in self.context_handlers:
+            handlers.append(handler)
+
+    def start_command_server(self, address: str):
+        """
+        Starts serving the Light Manager operations to pipeline scripts.
+        Args:
+            address (str): "host:port" or a UNIX socket path.
+        """
+        if self.command_server is not None:
+            return
+        try:
+            self.command_server = LightCommandServer(self, address)
+            self.command_server.start()
+        except OSError as error:
+            self.command_server = None
+            self.info_timer(f"Error: Could not start the command server on '{address}': {error}")
+            return
+        self.info_timer(f"Command server listening on '{address}'")
+
+    def shutdown(self):
+        """ Removes every handler registered by the Light Manager. """
+        if self.command_server is not None:
+            self.command_server.stop()
+            self.command_server = None
+        self.render_queue.cancel()
+        if self.contact_sheet is not None:
+            self.contact_sheet.close()
+        if self.animation_window is not None:
+            self.animation_window.close()
+        if self.stats_window is not None:
+            self.stats_window.close()
+        if self.diff_window is not None:
+            self.diff_window.close()
+        self.stats_timer.stop()
+        for view in self.views.values():
+            self.clear_script_jobs(view)
+        for handlers, handler in self.context_handlers:
+            if handler in handlers:
+                handlers.remove(handler)
+        self.context_handlers.clear()
+        self.models.clear()
+
+    def clear_script_jobs(self, view: TableView = None):
+        """ Removes the per-widget depsgraph handlers of a table, the displayed one by default. """
+        view = view or self.view
+        if view is None:
+            return
+        for job_id in view.script_jobs:
+            if job_id in bpy.app.handlers.depsgraph_update_post:
+                bpy.app.handlers.depsgraph_update_post.remove(job_id)
+        view.script_jobs.clear()
+
+    def active_model(self):
+        """ Returns the cached model of the active scene and view layer. """
+        # DURING A SWITCH, show_active_table() REFRESHES THE MODEL: IT NEEDS TO KNOW WHAT CHANGED
+        return self.models.get(bpy.context.scene, bpy.context.view_layer, refresh=not self.switching)
+
+    def on_depsgraph_update(self, depsgraph: bpy.types.Depsgraph):
+        """
+        Keeps the cached models up to date and swaps the displayed model when the
+        active scene or view layer changes.
+        """
+        if self.model is None:
+            return
+        self.handles.check_deletions()  # REFERENCES TO REMOVED OBJECTS ARE FREED
+        active_key = context_key(bpy.context.scene, bpy.context.view_layer)
+        if active_key != self.model.key:
+            # CONTEXT SWITCH: SWAP TO THE CACHED MODEL AND ITS TABLE INSTEAD OF RESCANNING AND REBUILDING
+            self.models.prune()
+            self.model = self.models.get(bpy.context.scene, bpy.context.view_layer, refresh=False)
+            self.handles.invalidate()  # THE LIGHTS OF THE NEW CONTEXT MAY HAVE BEEN DELETED MEANWHILE
+            if not self.switching:
+                self.switching = True
+                # DEFER: SHOWING THE TABLE MAY EDIT THE HANDLER LIST BEING DISPATCHED
+                QTimer.singleShot(0, self.show_active_table)
+            return
+        if self.switching:
+            # THE TABLE OF THE ACTIVE CONTEXT IS NOT SHOWN YET: ITS MODEL CATCHES UP WHEN IT IS
+            self.models.mark_stale(depsgraph)
+            return
+
+        model, changed, structural = self.models.update(depsgraph)
+        if structural:
+            self.handles.invalidate()  # LIGHTS ADDED OR REMOVED
+        if model is self.model and structural:
+            self.stats.load(model.records)
+            self.schedule_stats()
+        elif model is self.model and changed:
+            self.stats.update(model.records, changed)
+            self.schedule_stats()
+        if model is self.model and changed and not structural:
+            # COLOR OR TEMPERATURE EDITED IN BLENDER: THE SWATCHES HAVE NO HANDLER OF THEIR OWN
+            self.update_swatches(self.ui.light_table, changed)
+            changed_keys = self.view.sort_keys.update(model.records, changed)
+            if any(key in changed_keys for key, descending in self.sort_order):
+                self.apply_sort(self.ui.light_table)
+        if model is self.model and structural and model.order != self.view.names:
+            # DEFER: THE TABLE REBUILD EDITS THE HANDLER LIST BEING DISPATCHED
+            QTimer.singleShot(0, lambda: self.populate_table(self.ui.light_table))
+
+    def show_active_table(self):
+        """
+        Swaps in the table of the active context. A table shown before is only caught up on the
+        lights edited while it was hidden; it is rebuilt only if lights were added or removed.
+        """
+        self.switching = False
+        model = self.model
+        changed, structural = model.refresh() if model.stale else (set(), False)
+        created = self.show_view(model)
+        self.prune_views()
+        light_table = self.view.light_table
+        if created or structural or model.order != self.view.names:
+            self.populate_table(light_table)
+        else:
+            if changed:
+                self.update_rows(light_table, changed)
+                self.view.sort_keys.update(model.records, changed)
+            if self.view.temperature_tint != self.temperature_tint:
+                self.view.temperature_tint = self.temperature_tint
+                self.update_swatches(light_table, set(self.view.names))
+            self.stats.load(model.records)
+            self.schedule_stats()
+            if self.sort_order and (changed or self.view.sort_order != self.sort_order):
+                self.apply_sort(light_table)
+        search_text = self.ui.entry_ligh_search.text()
+        if search_text:
+            self.search_light(search_text, light_table)
+
+    def show_view(self, model: object) -> bool:
+        """
+        Shows the table of a model's context, creating it on first use.
+        Returns True if the table is new and has to be populated.
+        """
+        view = self.views.get(model.key)
+        created = view is None
+        if created:
+            owned = [other.light_table for other in self.views.values()]
+            light_table = self.ui.light_table if self.ui.light_table not in owned else self.ui.new_light_table()
+            view = TableView(light_table)
+            self.views[model.key] = view
+        self.view = view
+        self.ui.show_light_table(view.light_table)
+        return created
+
+    def prune_views(self):
+        """ Drops the tables of contexts whose model is no longer cached. """
+        for key in [key for key in self.views if key not in self.models.models]:
+            view = self.views.pop(key)
+            self.clear_script_jobs(view)
+            if view is not self.view:
+                self.ui.remove_light_table(view.light_table)
+
+    def on_load_post(self):
+        """ Drops the models and tables of the previous file and shows the lights of the new one. """
+        self.models.clear()
+        self.journal.clear()
+        self.handles.clear()
+        for view in self.views.values():
+            view.script_jobs.clear()  # NON PERSISTENT HANDLERS ARE REMOVED BY BLENDER ON LOAD
+            if view is not self.view:
+                self.ui.remove_light_table(view.light_table)
+        self.views.clear()
+        self.view = None
+        if self.model is None:
+            return
+        self.model = self.active_model()
+        self.switching = False
+        self.show_view(self.model)
+        QTimer.singleShot(0, lambda: self.populate_table(self.ui.light_table))
 
     def rename_light(self, old_name: str, new_name: str, light_table: object):
         """
         Renames a light in the Blender scene and updates the UI accordingly.
         """
-        num = 0
-        naming_convention = f"{new_name}.{num:03d}"
+        naming_convention = LightCore.rename_convention(new_name)
 
         if not new_name.strip():
             self.info_timer("Error: New name cannot be empty.")
             return
 
         if old_name in bpy.data.objects:
-            bpy.data.objects[old_name].name = naming_convention
+            light = bpy.data.objects[old_name]
+            light.name = naming_convention
+            self.journal.record(f"Rename {old_name}", [Delta(self.handles.handle(light), "name", old_name, light.name)])
             self.refresh(light_table)
             self.info_timer(f"Light: '{old_name}' renamed to '{new_name}'")
         else:
@@ -52,12 +298,22 @@ class BlenderLightLogic(QObject):
         """
         Refreshes  UI to reflect the current state of lights in the Blender scene.
         """
+        self.model = self.models.rebuild(bpy.context.scene, bpy.context.view_layer)  # RESCAN THE ACTIVE VIEW LAYER
+        self.switching = False
+        self.show_view(self.model)
+        bpy.ops.object.select_all(action='DESELECT')
+        self.populate_table(self.ui.light_table)
+        self.info_timer("Light Manager refreshed successfully.")
+
+    def populate_table(self, light_table: object):
+        """
+        Rebuilds the table rows from the cached model of the active context.
+        """
+        if self.model is None:
+            return
 
         # REMOVE ALL EXISTING HANDLERS TO AVOID DUPLICATES
-        for job_id in self.script_jobs:
-            if job_id in bpy.app.handlers.depsgraph_update_post:
-                bpy.app.handlers.depsgraph_update_post.remove(job_id)
-        self.script_jobs.clear()
+        self.clear_script_jobs()
 
         # SAVE CURRENT SCROLL POSITION
         v_scroll_bar = light_table.verticalScrollBar()
@@ -66,13 +322,9 @@ class BlenderLightLogic(QObject):
         max_range = v_scroll_bar.maximum()
 
         # REPOPULATE THE TABLE
-        bpy.ops.object.select_all(action='DESELECT')
-        all_lights = []
-        for obj in bpy.data.objects:
-            if obj.type == 'LIGHT':
-                all_lights.append(obj)
-
-        for light in all_lights:
+        lights = self.model.lights()
+        self.prefetch_colors(lights)
+        for light in lights:
             light_type = light.data.type
 
             self.light_name_to_list(light, light_type, light_table)
@@ -82,7 +334,6 @@ class BlenderLightLogic(QObject):
             use_temp = self.checkbox_attr_to_list(light, "use_temperature", 6, light_table)
             if use_temp == True:
                 self.entry_attr_num_to_list(light, "temperature", 7, light_table)
-                self.info_timer("Temperature enabled for this light")
             else:
                 widget = QLabel("N/A")
                 widget.setAlignment(Qt.AlignCenter)
@@ -96,15 +347,20 @@ class BlenderLightLogic(QObject):
             self.checkbox_attr_to_list(light, "use_shadow", 9, light_table)
             #  add more attributes here based on your UI
 
-            # RESTORE SCROLL POSITION
-            new_max_range = v_scroll_bar.maximum()
+        # RESTORE SCROLL POSITION
+        new_max_range = v_scroll_bar.maximum()
+        if max_range - current_pos <= 1:
+            v_scroll_bar.setValue(new_max_range)
+        else:
             v_scroll_bar.setValue(current_pos)
-            if max_range - current_pos <= 1:
-                v_scroll_bar.setValue(new_max_range)
-            else:
-                v_scroll_bar.setValue(current_pos)
 
-        self.info_timer("Light Manager refreshed successfully.")
+        self.view.names = list(self.model.order)
+        self.view.temperature_tint = self.temperature_tint
+        self.stats.load(self.model.records)
+        self.schedule_stats()
+        self.view.sort_keys.load(self.model.records)
+        if self.sort_order:
+            self.apply_sort(light_table)
 
     def delete(self, light_table: object):
         """
@@ -117,9 +373,9 @@ class BlenderLightLogic(QObject):
         light_name = selected_items[0].text()  # Get the name of the selected light
         obj_to_remove = bpy.data.objects.get(light_name)  # Get object by name
         if obj_to_remove:
-            bpy.data.objects.remove(obj_to_remove, do_unlink=True)
+            # CAPTURED IN THE JOURNAL SO THE DELETE CAN BE UNDONE
+            self.write_changes([(light_name, "exists", None)], f"Delete {light_name}")
             self.info_timer(f"Light '{light_name}' deleted successfully.")
-            self.refresh(light_table)
         else:
             self.info_timer(f"Error: Could not find actor '{light_name}' to delete.")
 
@@ -150,26 +406,22 @@ class BlenderLightLogic(QObject):
             self.info_timer(f"Error: Light type '{light_type}' is invalid.")
             return
 
-        if not light_name.strip():
-            light_name = light_type
-
-        # INCREMENTAL NAMING CONVENTION
-        num = 0
-        naming_convention = f"LGT_{light_name}.{num:03d}"
-
-        # Create a new light data-block
-        light_data = bpy.data.lights.new(name=naming_convention, type=light_type)
-
-        # Create a new object with the light data-block
-        light_object = bpy.data.objects.new(name=naming_convention, object_data=light_data)
-
-        # Link the object to the scene
-        bpy.context.collection.objects.link(light_object)
+        light_object = self.new_light(light_name, light_type)
+        self.journal.record(f"Create {light_object.name}",
+                            [Delta(self.handles.handle(light_object), "exists", None, capture_light(light_object))])
 
         # POPULATE THE TABLE LIST
         self.refresh(light_table)  # REFRESH THE ENTIRE TABLE
 
-        self.info_timer(f" '{naming_convention}' has been created successfully.")
+        self.info_timer(f" '{light_object.name}' has been created successfully.")
+
+    def new_light(self, light_name: str, light_type: str) -> bpy.types.Object:
+        """
+        Creates a light object following the naming convention, without touching the UI.
+        Returns the new light object.
+        """
+        # Link the object to the active collection of the active view layer
+        return LightCore.new_light(light_name, light_type, bpy.context.view_layer.active_layer_collection.collection)
 
     def light_name_to_list(self, light: bpy.types.Object, light_type: str, light_table: object):
         """
@@ -179,8 +431,10 @@ class BlenderLightLogic(QObject):
         light_table.insertRow(self.row_position)
 
         # POPULATE THE "Name" COLUMN
-        name_item = QTableWidgetItem(light.name)
+        name_item = RankedTableItem(light.name)
+        name_item.setData(HANDLE_ROLE, self.handles.handle(light))
         name_item.setTextAlignment(Qt.AlignCenter | Qt.AlignVCenter)
+        self.highlight_cost(name_item)
         light_table.setItem(self.row_position, 0, name_item)
 
         # POPULATE THE "Light Type" COLUMN
@@ -199,9 +453,9 @@ class BlenderLightLogic(QObject):
         mute_widget = QWidget()
         mute_checkbox = QCheckBox()
         mute_checkbox.setStyleSheet("QCheckBox::indicator:unchecked { background-color: #f94144 }")
-        actual_visibility = light.visible_get()
+        actual_visibility = read_value(light, "visible")
         mute_checkbox.setChecked(actual_visibility)
-        mute_checkbox.stateChanged.connect(partial(self.update_all_lights_visibility, light_table, light))
+        mute_checkbox.stateChanged.connect(partial(self.update_all_lights_visibility, light_table))
         mute_layout = QHBoxLayout(mute_widget)
         mute_layout.addWidget(mute_checkbox)
         mute_layout.setAlignment(Qt.AlignCenter)
@@ -210,7 +464,7 @@ class BlenderLightLogic(QObject):
         solo_widget = QWidget()
         solo_checkbox = QCheckBox()
         solo_checkbox.setStyleSheet("QCheckBox::indicator:checked { background-color: #adb5bd }")
-        solo_checkbox.stateChanged.connect(partial(self.on_solo_toggled, self.row_position, light_table, light))
+        solo_checkbox.stateChanged.connect(partial(self.on_solo_toggled, self.handles.handle(light), light_table))
         solo_layout = QHBoxLayout(solo_widget)
         solo_layout.addWidget(solo_checkbox)
         solo_layout.setAlignment(Qt.AlignCenter)
@@ -228,7 +482,7 @@ class BlenderLightLogic(QObject):
         colorBtn = QPushButton()
         colorBtn.setFixedSize(56, 26)
         self.set_button_color(light, colorBtn)
-        colorBtn.clicked.connect(partial(self.set_color, light, colorBtn))
+        colorBtn.clicked.connect(partial(self.set_color, self.handles.handle(light), colorBtn))
 
         colorBtn_layout = QHBoxLayout(colorBtn_widget)
         colorBtn_layout.addWidget(colorBtn)
@@ -248,6 +502,7 @@ class BlenderLightLogic(QObject):
             return
 
         # Create the numeric input field
+        handle = self.handles.handle(light)  # THE CLOSURES RESOLVE THE LIGHT, IT MAY BE RENAMED OR DELETED
         bar_text = CustomLineEditNum()
         bar_text.setFixedSize(65, 29)
         bar_text.setAlignment(Qt.AlignCenter)
@@ -261,10 +516,14 @@ class BlenderLightLogic(QObject):
         def _update_blender_from_ui():
             """Gets called when the user finishes editing the text field."""
 
+            current_light = self.handles.resolve(handle)
+            if current_light is None:
+                self.info_timer(f"Error: Could not update '{attribute_name}',light deleted")
+                return
             try:
                 # SET VALUE IN BLENDER
                 new_value = float(bar_text.text())
-                setattr(light.data, attribute_name, new_value)
+                self.write_changes([(current_light, attribute_name, new_value)], f"Set {attribute_name}")
             except ValueError:
                 self.info_timer(f"Wrong input:  Please enter a number")
                 # ON ERROR, Reset the text to the current value in BLENDER
@@ -273,10 +532,10 @@ class BlenderLightLogic(QObject):
                     bar_text.setText(f"{current_blender_val:.3f}")
                 elif isinstance(current_blender_val, (int)):
                     bar_text.setText(f"{current_blender_val}")
-            except ReferenceError:
-                self.info_timer(f"Error: Could not update '{attribute_name}',light deleted")
 
         bar_text.editingFinished.connect(_update_blender_from_ui)
+        if attribute_name == "temperature":
+            self.set_temperature_tint(light, bar_text)
 
         """
         Use a weak reference to the widget to prevent dangling pointers.
@@ -286,17 +545,14 @@ class BlenderLightLogic(QObject):
 
         def _update_ui_from_blender(scene, depsgraph):
             widget = bar_text_weak_ref()
-            try:
-                if widget is None or light.name not in bpy.data.objects:
-                    return
-            except ReferenceError:
-                # The light object has been deleted.
-                return
+            current_light = self.handles.resolve(handle)
+            if widget is None or current_light is None:
+                return  # THE ROW OR THE LIGHT IS GONE
             # Check if the specific light data-block was updated
             for update in depsgraph.updates:
-                if update.id.name == light.data.name:
+                if update.id.name == current_light.data.name:
                     widget.blockSignals(True)
-                    new_value = getattr(light.data, attribute_name)
+                    new_value = getattr(current_light.data, attribute_name)
                     try:
                         if isinstance(new_value, (float)):
                             widget.setText(f"{new_value:.3f}")
@@ -307,8 +563,8 @@ class BlenderLightLogic(QObject):
                         widget.blockSignals(False)
 
         # # CREATE A HANDLER TO LISTEN FOR CHANGES AND STORE ID FOR CLEANUP
-        job_id = bpy.app.handlers.depsgraph_update_post.append(_update_ui_from_blender)
-        self.script_jobs.append(job_id)
+        bpy.app.handlers.depsgraph_update_post.append(_update_ui_from_blender)
+        self.view.script_jobs.append(_update_ui_from_blender)
 
         widget = QWidget()
         bar_text_layout = QHBoxLayout(widget)
@@ -339,12 +595,14 @@ class BlenderLightLogic(QObject):
             checkbox = QCheckBox()
             checkbox.setChecked(bool(current_value))
 
+        handle = self.handles.handle(light)  # THE CLOSURES RESOLVE THE LIGHT, IT MAY BE RENAMED OR DELETED
+
         def _update_blender_from_ui(checked):
-            try:
-                setattr(light.data, attribute_name, bool(checked))
-                self.refresh(light_table)
-            except (ReferenceError, RuntimeError):
+            current_light = self.handles.resolve(handle)
+            if current_light is None:
                 self.info_timer(f"Error: Could not update '{attribute_name}' for light deleted")
+                return
+            self.write_changes([(current_light, attribute_name, bool(checked))], f"Set {attribute_name}")
 
         checkbox.clicked.connect(_update_blender_from_ui)
 
@@ -354,23 +612,20 @@ class BlenderLightLogic(QObject):
 
         def _update_ui_from_blender(scene, depsgraph):
             widget = checkbox_weak_ref()
-            try:
-                if widget is None or light.name not in bpy.data.objects:
-                    return
-            except ReferenceError:
-                # The light object has been deleted.
-                return
+            current_light = self.handles.resolve(handle)
+            if widget is None or current_light is None:
+                return  # THE ROW OR THE LIGHT IS GONE
             # Check if the specific light data-block was updated
             for update in depsgraph.updates:
-                if update.id.name == light.data.name:
-                    current_value = getattr(light.data, attribute_name)
+                if update.id.name == current_light.data.name:
+                    current_value = getattr(current_light.data, attribute_name)
                     widget.blockSignals(True)
                     widget.setChecked(bool(current_value))
                     widget.blockSignals(False)
                     break
 
-        job_id = bpy.app.handlers.depsgraph_update_post.append(_update_ui_from_blender)
-        self.script_jobs.append(job_id)
+        bpy.app.handlers.depsgraph_update_post.append(_update_ui_from_blender)
+        self.view.script_jobs.append(_update_ui_from_blender)
 
         layout = QHBoxLayout(widget)
         layout.addWidget(checkbox)
@@ -379,15 +634,18 @@ class BlenderLightLogic(QObject):
         light_table.setCellWidget(self.row_position, column, widget)
         return current_value
 
-    def on_solo_toggled(self, toggled_row: int, light_table: object, state: bool, light: bpy.types.Object, *args: str):
+    def on_solo_toggled(self, handle: int, light_table: object, state: int):
         """
         Ensures that only one 'Solo' checkbox can be active at a time.
         When a 'Solo' checkbox is checked, all other 'Solo' checkboxes are unchecked.
+        The row is found by light handle: sorting moves rows and renames change the name
+        after the checkbox is created.
         """
         if state:
             # SKIP the ROW OF THE CHECKBOX THAT WAS JUST TOGGLED
             for i in range(light_table.rowCount()):
-                if i != toggled_row:
+                name_item = light_table.item(i, 0)
+                if not name_item or name_item.data(HANDLE_ROLE) != handle:
                     solo_widget = light_table.cellWidget(i, 2)
                     if solo_widget:
                         # RETRIEVE THE CUSTOM WIDGET IN THE  'Solo' COLUMN
@@ -414,6 +672,7 @@ class BlenderLightLogic(QObject):
                     break
 
         # ITERATE THROUGH ALL LIGHTS TO SET THEIR VISIBILITY
+        changes = []
         for i in range(light_table.rowCount()):
             light_name_item = light_table.item(i, 0)
             mute_widget = light_table.cellWidget(i, 1)
@@ -421,56 +680,316 @@ class BlenderLightLogic(QObject):
             if not (light_name_item and mute_widget):
                 continue
 
-            light_name = light_name_item.text()
-            try:
-                if not bpy.data.objects[light_name]:
-                    continue
-            except KeyError:
-                continue
-
+            light = self.handles.resolve(light_name_item.data(HANDLE_ROLE))
             mute_checkbox = mute_widget.findChild(QCheckBox)
 
-            if bpy.data.objects[light_name] and mute_checkbox:
+            if light is not None and mute_checkbox:
                 # DETERMINE VISIBILITY BASED ON SOLO AND MUTE STATES
                 is_visible = (i == soloed_row) if soloed_row != -1 else mute_checkbox.isChecked()
-                # SET THE VISIBILITY IN BLENDER
-                bpy.data.objects[light_name].hide_set(not is_visible)  # VIEWPORT VISIBILITY
-                bpy.data.objects[light_name].hide_render = not is_visible  # RENDER VISIBILITY
+                changes.append((light, "visible", is_visible))
+
+        # SET THE VISIBILITY IN BLENDER AS ONE UNDO STEP, CHECKBOXES ALREADY SHOW THE NEW STATE
+        self.write_changes(changes, "Visibility", sync_rows=False)
 
-    def set_color(self, light: bpy, color_button: QPushButton):
+    def set_color(self, handle: int, color_button: QPushButton):
         """
         Opens a color picker dialog to set the light's color and updates the button's background color.
         """
-        if not light.data.color:
+        light = self.handles.resolve(handle)
+        if light is None:
+            self.info_timer("Cannot change color. The light may have been deleted.")
             return
         # GET THE ACTUAL LIGHT COLOR
         linear_color = light.data.color
-        try:
-            # OPEN COLOR PICKER DIALOG
-            color_dialog = QColorDialog(currentColor=QColor(
-                linear_color[0]*255, linear_color[1]*255, linear_color[2]*255), parent=self.ui)
-        except ReferenceError:
-            self.info_timer("Cannot change color. The light may have been deleted.")
+        # OPEN COLOR PICKER DIALOG
+        color_dialog = QColorDialog(currentColor=QColor(
+            linear_color[0]*255, linear_color[1]*255, linear_color[2]*255), parent=self.ui)
 
         if color_dialog.exec() == QColorDialog.Accepted:
+            light = self.handles.resolve(handle)  # THE DIALOG IS MODAL BUT BLENDER MAY HAVE CHANGED MEANWHILE
+            if light is None:
+                return
             new_color = color_dialog.selectedColor()
             r, g, b = new_color.redF(), new_color.greenF(), new_color.blueF()
-            light.data.color = (r, g, b)  # SET THE NEW COLOR TO THE LIGHT
+            self.write_changes([(light, "color", (r, g, b))], "Set color")  # ALSO UPDATES THE BUTTON
+
+    def write_changes(self, changes: list, label: str, sync_rows: bool = True):
+        """
+        Batched write path of the Light Manager: applies attribute changes to Blender,
+        records them as one undo step and updates only the affected rows.
+        Args:
+            changes (list): (light, attribute_name, value) tuples. The light is an object or its name.
+            label (str): A short description of the operation, shown on undo/redo.
+            sync_rows (bool, optional): Whether to update the table rows of the changed lights. Defaults to True.
+        """
+        deltas = []
+        for light, attribute_name, value in changes:
+            if isinstance(light, str):
+                light = bpy.data.objects.get(light)
+            if light is None:
+                continue
+            deltas += change_deltas(self.handles.handle(light), light, attribute_name, value)
+        deltas = [delta for delta in deltas if delta.old != delta.new]
+        if not deltas:
+            return
+
+        affected, structural = self.apply_deltas(deltas, undo=False)
+        self.journal.record(label, deltas)
+        if sync_rows or structural:
+            self.update_rows(self.ui.light_table, affected, structural)
+
+    def apply_deltas(self, deltas: list, undo: bool) -> tuple:
+        """
+        Writes a batch of deltas to Blender, backwards to undo it or forwards to redo it.
+        Returns:
+            tuple: (affected, structural) - the names of the written lights and whether lights
+            were created, deleted, renamed or changed type.
+        """
+        affected = set()
+        structural = False
+        for delta in (reversed(deltas) if undo else deltas):
+            value = delta.old if undo else delta.new
+            if delta.attribute == "exists":
+                structural = True
+                light = self.handles.resolve(delta.light, parked=True)
+                if value is None:
+                    if light is not None:
+                        park_light(light)  # REMOVED FOR GOOD WHEN ITS STEP LEAVES THE JOURNAL
+                elif light is None:
+                    # THE PARKED LIGHT WAS LOST (PURGED, BLENDER UNDO): RECREATE IT FROM THE CAPTURE,
+                    # UNDER A NEW HANDLE OLDER DELTAS ARE REDIRECTED TO
+                    self.handles.remap(delta.light, restore_light(value))
+                elif not light.users_collection:
+                    unpark_light(light, value)
+                continue
+
+            # THE HANDLE FINDS THE LIGHT WHATEVER ITS CURRENT NAME
+            light = self.handles.resolve(delta.light)
+            if light is None:
+                continue
+            # A NEW TYPE CHANGES THE TYPE ICON AND THE RADIUS CELL, WHICH ONLY populate_table BUILDS
+            structural = structural or delta.attribute in ("name", "type")
+            write_value(light, delta.attribute, value)
+            affected.add(light.name)
+        return affected, structural
+
+    def remove_parked(self, steps: list):
+        """
+        Removes the lights parked by journal steps that can no longer be undone or redone.
+        Args:
+            steps (list): The (label, deltas) steps dropped from the journal.
+        """
+        for _label, deltas in steps:
+            for delta in deltas:
+                if delta.attribute != "exists":
+                    continue
+                light = self.handles.resolve(delta.light, parked=True)
+                if light is not None and not light.users_collection:
+                    self.handles.forget(delta.light)
+                    bpy.data.objects.remove(light, do_unlink=True)
+
+    def undo(self, light_table: object):
+        """ Reverts the last operation made through the Light Manager. """
+        step = self.journal.pop_undo()
+        if step is None:
+            self.info_timer("Nothing to undo.")
+            return
+        label, deltas = step
+        affected, structural = self.apply_deltas(deltas, undo=True)
+        self.update_rows(light_table, affected, structural, clear_solo=True)
+        self.info_timer(f"Undo: {label}")
+
+    def redo(self, light_table: object):
+        """ Re-applies the last operation undone through the Light Manager. """
+        step = self.journal.pop_redo()
+        if step is None:
+            self.info_timer("Nothing to redo.")
+            return
+        label, deltas = step
+        affected, structural = self.apply_deltas(deltas, undo=False)
+        self.update_rows(light_table, affected, structural, clear_solo=True)
+        self.info_timer(f"Redo: {label}")
+
+    def update_rows(self, light_table: object, light_names: set, structural: bool = False, clear_solo: bool = False):
+        """
+        Updates the table after a batched write.
+        Only the rows of the given lights are touched, unless lights were created, deleted, renamed
+        or changed type.
+        """
+        if structural:
+            self.model = self.models.rebuild(bpy.context.scene, bpy.context.view_layer)
+            self.populate_table(light_table)
+            return
+
+        rows = {}
+        for row in range(light_table.rowCount()):
+            name_item = light_table.item(row, 0)
+            if name_item:
+                rows[name_item.text()] = row
+
+        lights = [bpy.data.objects[name] for name in light_names if name in bpy.data.objects]
+        self.prefetch_colors(lights)
+        for light in lights:
+            row = rows.get(light.name)
+            if row is not None:
+                self.sync_row(row, light, light_table, clear_solo)
+
+    def sync_row(self, row: int, light: bpy.types.Object, light_table: object, clear_solo: bool = False):
+        """
+        Sets the widgets of an existing row to the current values of its light, without emitting signals.
+        """
+        def _set_checked(column, value):
+            widget = light_table.cellWidget(row, column)
+            checkbox = widget.findChild(QCheckBox) if widget else None
+            if checkbox:
+                checkbox.blockSignals(True)
+                checkbox.setChecked(bool(value))
+                checkbox.blockSignals(False)
+
+        _set_checked(1, read_value(light, "visible"))
+        if clear_solo:
+            _set_checked(2, False)
+
+        color_widget = light_table.cellWidget(row, 4)
+        color_button = color_widget.findChild(QPushButton) if color_widget else None
+        if color_button:
             self.set_button_color(light, color_button)
 
+        _set_checked(6, light.data.use_temperature)
+        _set_checked(9, light.data.use_shadow)
+
+        # THE TEMPERATURE CELL SWITCHES BETWEEN AN ENTRY AND "N/A" WITH "Use Temp."
+        temperature_widget = light_table.cellWidget(row, 7)
+        has_entry = bool(temperature_widget and temperature_widget.findChild(CustomLineEditNum))
+        if has_entry != light.data.use_temperature:
+            self.row_position = row
+            if light.data.use_temperature:
+                self.entry_attr_num_to_list(light, "temperature", 7, light_table)
+            else:
+                widget = QLabel("N/A")
+                widget.setAlignment(Qt.AlignCenter)
+                light_table.setCellWidget(row, 7, widget)
+
+        for column, attribute_name in ((5, "exposure"), (7, "temperature"), (8, "shadow_soft_size")):
+            widget = light_table.cellWidget(row, column)
+            entry = widget.findChild(CustomLineEditNum) if widget else None
+            if entry:
+                entry.blockSignals(True)
+                entry.setText(self.format_value(getattr(light.data, attribute_name)))
+                entry.blockSignals(False)
+                if column == 7:
+                    self.set_temperature_tint(light, entry)
+
+    def format_value(self, value: float | int) -> str:
+        """ Formats a numeric attribute the way the table entries display it. """
+        if isinstance(value, (float)):
+            return f"{value:.3f}"
+        return f"{value}"
+
     def set_button_color(self, light: bpy.types.Object, color_button: QPushButton, color: tuple = None):
         """
-        Sets the background color of a QPushButton to match the light's color.
+        Sets the background color of a QPushButton to match the light's effective color:
+        its color tinted by the blackbody color of its temperature when "Use Temp." is on.
         """
         if not light:
             return
 
-        linear_color = light.data.color
+        # A CACHE HIT WHEN THE BATCH WAS PREFETCHED
+        linear_color = color if color is not None else self.color_cache.lookup([color_key(light)])[0]
         r = int(linear_color[0] * 255)
         g = int(linear_color[1] * 255)
         b = int(linear_color[2] * 255)
         color_button.setStyleSheet(f"background-color: rgba({r},{g},{b},1)")
 
+    def prefetch_colors(self, lights: list):
+        """
+        Computes the effective colors of a refresh or update batch in one vectorized pass,
+        along with the plain blackbody tints used by the temperature column.
+        """
+        keys = [color_key(light) for light in lights]
+        if self.temperature_tint:
+            keys += [(1.0, 1.0, 1.0, key[3]) for key in keys if key[3] is not None]
+        self.color_cache.lookup(keys)
+
+    def update_swatches(self, light_table: object, light_names: set):
+        """ Updates the color swatches and temperature tints of the given lights only. """
+        lights = [bpy.data.objects[name] for name in light_names if name in bpy.data.objects]
+        self.prefetch_colors(lights)
+        lights = {light.name: light for light in lights}
+        for row in range(light_table.rowCount()):
+            name_item = light_table.item(row, 0)
+            light = lights.get(name_item.text()) if name_item else None
+            if light is None:
+                continue
+            color_widget = light_table.cellWidget(row, 4)
+            color_button = color_widget.findChild(QPushButton) if color_widget else None
+            if color_button:
+                self.set_button_color(light, color_button)
+            temperature_widget = light_table.cellWidget(row, 7)
+            entry = temperature_widget.findChild(CustomLineEditNum) if temperature_widget else None
+            if entry:
+                self.set_temperature_tint(light, entry)
+
+    def set_temperature_tint(self, light: bpy.types.Object, entry: QWidget):
+        """ Paints a temperature entry with a gradient towards the blackbody color of its temperature. """
+        if not self.temperature_tint:
+            entry.setStyleSheet("")
+            return
+        r, g, b = (int(channel * 255) for channel in self.color_cache.lookup([(1.0, 1.0, 1.0, light.data.temperature)])[0])
+        entry.setStyleSheet(
+            "QLineEdit { color: black; background: qlineargradient(x1:0, y1:0, x2:1, y2:0, "
+            f"stop:0 rgba({r},{g},{b},90), stop:1 rgba({r},{g},{b},255)); }}")
+
+    def toggle_temperature_tint(self, enabled: bool, light_table: object):
+        """ Shows or hides the blackbody gradient of the temperature column. """
+        self.temperature_tint = enabled
+        self.view.temperature_tint = enabled
+        self.update_swatches(light_table, set(self.view.names))
+
+    def sort_by_column(self, column: int, add_key: bool, light_table: object):
+        """
+        Sorts the table by a column. Clicking the primary column again reverses it;
+        add_key (shift+click) adds the column as a further key, or reverses it if already a key.
+        """
+        key = SORT_COLUMNS.get(column)
+        if key is None:
+            return
+        keys = [sort_key for sort_key, descending in self.sort_order]
+        if add_key and key in keys:
+            index = keys.index(key)
+            self.sort_order[index] = (key, not self.sort_order[index][1])
+        elif add_key:
+            self.sort_order.append((key, False))
+        elif keys == [key]:
+            self.sort_order = [(key, not self.sort_order[0][1])]
+        else:
+            self.sort_order = [(key, False)]
+        self.apply_sort(light_table)
+        self.info_timer("Sorted by " + ", ".join(f"{sort_key} {'descending' if descending else 'ascending'}"
+                                                 for sort_key, descending in self.sort_order))
+
+    def apply_sort(self, light_table: object):
+        """
+        Moves the rows into the order of the precomputed sort keys.
+        Only the rank of each name item is written, the cell widgets move with their row.
+        """
+        ranks = self.view.sort_keys.ranks(self.sort_order)
+        self.view.sort_order = list(self.sort_order)
+        for row in range(light_table.rowCount()):
+            name_item = light_table.item(row, 0)
+            if name_item:
+                name_item.setData(RANK_ROLE, ranks.get(name_item.text(), len(ranks)))
+        light_table.sortItems(0, Qt.AscendingOrder)
+
+        primary = self.sort_order[0] if self.sort_order else None
+        columns = {key: column for column, key in SORT_COLUMNS.items()}
+        self.ui.set_sort_indicator(columns[primary[0]] if primary else -1, primary[1] if primary else False)
+
+        # HIDDEN ROWS STAY AT THEIR POSITION: FILTER THE MOVED ROWS AGAIN
+        search_text = self.ui.entry_ligh_search.text()
+        if search_text:
+            self.search_light(search_text, light_table)
+
     def search_light(self, *args: str | object):
         """
         Filters the visibility of rows in the table based on a search string.
@@ -492,12 +1011,264 @@ class BlenderLightLogic(QObject):
                     args[1].hideRow(row)
 
     def render(self):
-        """ Triggers the rendering of the current scene in Blender."""
-        # Render Engine : "BLENDER_EEVEE","BLENDER_WORKBENCH","CYCLES"
-        bpy.context.scene.render.engine = "CYCLES"
+        """ Opens the contact sheet of per-light isolation renders. """
+        if self.contact_sheet is None:
+            self.contact_sheet = LightContactSheetUI()
+            self.contact_sheet.signal_render.connect(self.render_contact_sheet)
+            self.contact_sheet.signal_cancel.connect(self.render_queue.cancel)
+        self.contact_sheet.show()
+        self.contact_sheet.activateWindow()
+
+    def render_contact_sheet(self, resolution: int, grouping: str):
+        """
+        Queues one isolated preview render per light, or per collection, of the active view layer.
+        Previews of unchanged lights come from the cache.
+        """
+        groups = {}
+        for light in self.active_model().lights():
+            if grouping == "Per Collection" and light.users_collection:
+                groups.setdefault(light.users_collection[0].name, []).append(light)
+            else:
+                groups[light.name] = [light]
+        if not groups:
+            self.info_timer("No light to render.")
+            return
+
+        self.contact_sheet.clear_thumbnails()
+        self.contact_sheet.set_progress(0, len(groups))
+        self.contact_sheet.set_running(True)
+        self.render_queue.start(groups, resolution)
+
+    def on_render_progress(self, done: int, total: int, job: object, cached: bool):
+        """ Shows a finished isolation render in the contact sheet. """
+        self.contact_sheet.set_progress(done, total)
+        self.contact_sheet.add_thumbnail(job.label, job.path, cached)
+
+    def on_render_error(self, job: object, error: Exception):
+        """ Reports a failed isolation render; the queue goes on with the next one. """
+        self.info_timer(f"Error: Could not render '{job.label}': {error}")
+
+    def on_render_finished(self, cancelled: bool):
+        """ Resets the contact sheet once the render queue is done. """
+        self.contact_sheet.set_running(False)
+        self.info_timer("Preview renders cancelled." if cancelled else "Preview renders finished.")
+
+    def animate(self):
+        """ Opens the window to key, bake or generate light animation. """
+        if self.animation_window is None:
+            self.animation_window = LightAnimationUI()
+            self.animation_window.signal_apply.connect(self.animate_selected_lights)
+        self.animation_window.show()
+        self.animation_window.activateWindow()
+
+    def selected_lights(self) -> list:
+        """ Returns the lights selected in Blender, or the light of the selected table row. """
+        lights = [obj for obj in bpy.context.selected_objects if obj.type == 'LIGHT']
+        if not lights:
+            selected_items = self.ui.light_table.selectedItems()
+            if selected_items:
+                name_item = self.ui.light_table.item(selected_items[0].row(), 0)
+                light = bpy.data.objects.get(name_item.text()) if name_item else None
+                lights = [light] if light is not None else []
+        return lights
+
+    def animate_selected_lights(self, settings: dict):
+        """
+        Writes keys for one attribute of the selected lights over a frame range, all lights at once.
+        Args:
+            settings (dict): attribute, mode ("Key Current", "Bake", "Flicker", "Ramp"), start, end,
+                amplitude, frequency, target and seed, as gathered by LightAnimationUI.
+        """
+        lights = self.selected_lights()
+        if not lights:
+            self.info_timer("Error: Select the lights to animate.")
+            return
+        if settings["end"] < settings["start"]:
+            self.info_timer("Error: The end frame is before the start frame.")
+            return
+        if settings["mode"] == "Flicker" and settings["frequency"] <= 0:
+            self.info_timer("Error: The flicker frequency must be above 0.")
+            return
+
+        attribute = settings["attribute"]
+        frames = np.arange(settings["start"], settings["end"] + 1, dtype=float)
+        mode = settings["mode"]
+        if mode == "Bake":
+            values = LightAnimation.bake(lights, attribute, frames)
+        else:
+            base = LightAnimation.read_values(lights, attribute)
+            if mode == "Flicker":
+                values = LightAnimation.flicker(frames, base, attribute, settings["amplitude"],
+                                                settings["frequency"], settings["seed"])
+            elif mode == "Ramp":
+                values = LightAnimation.ramp(frames, base, settings["target"])
+            else:
+                # KEY CURRENT: HOLD THE CURRENT VALUES OVER THE RANGE
+                values = np.repeat(base[:, None], len(frames), axis=1)
+
+        # THE BULK WRITE IS ONE UNDO STEP: EACH LIGHT'S FCURVES BEFORE AND AFTER
+        old_keys = [LightAnimation.read_keys(light, attribute) for light in lights]
+        LightAnimation.write_keys(lights, attribute, frames, values)
+        deltas = [Delta(self.handles.handle(light), "keys", (attribute, old),
+                        (attribute, LightAnimation.read_keys(light, attribute)))
+                  for light, old in zip(lights, old_keys)]
+        self.journal.record(f"{mode} {attribute}", deltas)
+        self.info_timer(f"{mode}: keyed {attribute} of {len(lights)} light(s) on {len(frames)} frame(s).")
+
+    def show_stats(self):
+        """ Opens the lighting statistics panel. """
+        if self.stats_window is None:
+            self.stats_window = LightStatsUI()
+            self.stats_window.signal_select.connect(self.select_light)
+        self.stats_window.show()
+        self.stats_window.activateWindow()
+        self.stats.dirty = True
+        self.refresh_stats()
+
+    def schedule_stats(self):
+        """ Recomputes the statistics shortly, once for a burst of updates, while the panel is shown. """
+        if self.stats_window is not None and self.stats_window.isVisible() and not self.stats_timer.isActive():
+            self.stats_timer.start()
+
+    def refresh_stats(self):
+        """ Recomputes the statistics if lights changed since the last summary. """
+        if self.stats_window is None or not self.stats_window.isVisible() or not self.stats.dirty:
+            return
+        self.stats_window.show_stats(self.stats.compute(OUTLIER_STOPS), OUTLIER_STOPS)
+        self.stats.dirty = False
+
+    def select_light(self, light_name: str):
+        """ Selects a light in the table, which selects it in Blender. """
+        for row in range(self.ui.light_table.rowCount()):
+            name_item = self.ui.light_table.item(row, 0)
+            if name_item and name_item.text() == light_name:
+                self.ui.light_table.selectRow(row)
+                self.ui.light_table.scrollToItem(name_item)
+                return
 
-        # "INVOKE_DEFAULT": Non-Blocking(work in background, "EXEC_DEFAULT": Blocking (wait until the render is completely finished)
-        # bpy.ops.render.render("INVOKE_DEFAULT")
+    def estimate_costs(self) -> tuple:
+        """
+        Estimates the cost and contribution of the displayed lights against the current scene bounds.
+        Returns:
+            tuple: (records, estimation) - fresh light records and LightCost.estimate() of them.
+        """
+        records = self.current_records()
+        bounds = LightCost.scene_bounds([obj for obj in bpy.context.view_layer.objects if obj.type != 'LIGHT'])
+        return records, LightCost.estimate(records, bounds)
+
+    def current_records(self) -> list:
+        """ Fresh records of the displayed lights: the model only catches up on the next depsgraph update. """
+        view_layer = bpy.context.view_layer
+        return [dict(snapshot_light(light, view_layer), handle=self.handles.handle(light))
+                for light in self.model.lights()]
+
+    def flag_costly_lights(self):
+        """ Highlights the lights whose shadow and sampling cost outweighs their contribution. """
+        if self.model is None:
+            return
+        records, estimation = self.estimate_costs()
+        self.cost_flags = {record["handle"]: reasons for record, reasons, flagged
+                           in zip(records, estimation["reasons"], estimation["flagged"]) if flagged}
+        light_table = self.ui.light_table
+        for row in range(light_table.rowCount()):
+            name_item = light_table.item(row, 0)
+            if name_item:
+                self.highlight_cost(name_item)
+        self.info_timer(f"{len(self.cost_flags)} costly light(s) flagged." if self.cost_flags
+                        else "No costly light found.")
+
+    def fix_costly_lights(self):
+        """
+        Applies the cost fix to the flagged lights as one undo step:
+        low contribution shadows are disabled and huge radii are capped.
+        """
+        if self.model is None:
+            return
+        records, estimation = self.estimate_costs()
+        changes = LightCost.fix_changes(records, estimation)
+        if not changes:
+            self.info_timer("Nothing to fix.")
+            return
+        self.write_changes(changes, "Fix costly lights")
+        self.flag_costly_lights()  # FLAGS WHAT IS STILL COSTLY AFTER THE FIX
+        self.info_timer(f"Fixed {len({change[0] for change in changes})} costly light(s).")
+
+    def highlight_cost(self, name_item: QTableWidgetItem):
+        """ Colors a name cell after the last cost estimate and lists the reasons in its tooltip. """
+        reasons = self.cost_flags.get(name_item.data(HANDLE_ROLE))
+        if reasons is None:
+            name_item.setData(Qt.BackgroundRole, None)
+            name_item.setToolTip("")
+        else:
+            name_item.setBackground(QColor("#7a3b12"))
+            name_item.setToolTip("Costly: " + ", ".join(reasons))
+
+    def diff_rig(self):
+        """ Opens the window comparing the lights with a rig preset, another scene or another .blend file. """
+        if self.diff_window is None:
+            self.diff_window = LightRigDiffUI()
+            self.diff_window.signal_compare.connect(self.compare_rig)
+            self.diff_window.signal_merge.connect(self.merge_rig)
+            self.diff_window.signal_save_preset.connect(self.save_rig_preset)
+        self.diff_window.set_scenes([scene.name for scene in bpy.data.scenes if scene != bpy.context.scene])
+        self.diff_window.show()
+        self.diff_window.activateWindow()
+
+    def compare_rig(self, settings: dict):
+        """
+        Diffs the displayed lights against another light set and shows the changes.
+        Args:
+            settings (dict): "source" ("Preset", "Scene" or "Blend File"), "target" (scene name or file path),
+                "pattern" (glob of the light names compared) and "mode" (one of LightDiff.MATCH_MODES).
+        """
+        if self.model is None:
+            return
+        self.diff_settings = settings
+        try:
+            if settings["source"] == "Scene":
+                other = LightDiff.scene_records(bpy.data.scenes[settings["target"]])
+            elif settings["source"] == "Blend File":
+                other = LightDiff.blend_records(settings["target"])
+            else:
+                other = LightDiff.load_preset(settings["target"])
+        except (OSError, ValueError, KeyError, RuntimeError) as error:
+            self.diff_window.show_error(f"Error: Could not read '{settings['target']}': {error}")
+            return
+        records = self.current_records()
+        self.diff_handles = {record["name"]: record["handle"] for record in records}
+        entries = LightDiff.diff_records(records, other, settings["pattern"], settings["mode"])
+        self.diff_window.show_diff(entries)
+
+    def merge_rig(self, changes: list):
+        """
+        Writes the checked changes of the rig diff as one undo step, then compares again.
+        The lights are resolved through the handles taken at compare time: a light renamed or
+        deleted since is still found, or skipped, never mistaken for another light of that name.
+        """
+        if not changes:
+            self.info_timer("No change checked.")
+            return
+        lights = {name: self.handles.resolve(self.diff_handles[name]) for name, _attribute, _value in changes
+                  if name in self.diff_handles}
+        changes = [(lights[name], attribute, value) for name, attribute, value in changes if lights.get(name)]
+        if not changes:
+            self.info_timer("Error: The compared lights no longer exist.")
+            return
+        self.write_changes(changes, f"Merge rig ({len(changes)} changes)")
+        self.info_timer(f"Merged {len(changes)} change(s) into {len({change[0] for change in changes})} light(s).")
+        if self.diff_settings is not None:
+            self.compare_rig(self.diff_settings)  # SHOWS WHAT IS LEFT
+
+    def save_rig_preset(self, path: str):
+        """ Saves the displayed lights as a JSON rig preset. """
+        if self.model is None:
+            return
+        try:
+            LightDiff.save_preset(path, self.current_records())
+        except OSError as error:
+            self.info_timer(f"Error: Could not save '{path}': {error}")
+            return
+        self.info_timer(f"Rig preset saved to '{path}'")
 
     def info_timer(self, text: str, duration_ms: int = 3500):
         """
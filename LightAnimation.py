@@ -0,0 +1,243 @@
+###############################
+# Blender Light Animation
+###############################
+
+import numpy as np
+import bpy
+
+
+# ATTRIBUTE -> (OWNER, DATA PATHS, CHANNELS). OWNER IS "data" FOR THE LIGHT DATA, "object" FOR THE OBJECT
+ANIMATED_ATTRIBUTES = {
+    "exposure": ("data", ["exposure"], 1),
+    "color": ("data", ["color"], 3),
+    "temperature": ("data", ["temperature"], 1),
+    "radius": ("data", ["shadow_soft_size"], 1),
+    "visibility": ("object", ["hide_render", "hide_viewport"], 1),
+}
+INTERPOLATION = {"CONSTANT": 0, "LINEAR": 1, "BEZIER": 2}  # FCURVE KEYFRAME INTERPOLATION ENUM VALUES
+# KEYFRAME PROPERTY -> (VALUES PER KEY, DTYPE), READ AND WRITTEN IN BULK. HANDLE TYPES BEFORE HANDLES
+KEY_PROPERTIES = {
+    "co": (2, np.float32),
+    "interpolation": (1, np.int32),
+    "handle_left_type": (1, np.int32),
+    "handle_right_type": (1, np.int32),
+    "handle_left": (2, np.float32),
+    "handle_right": (2, np.float32),
+}
+
+
+# READ / WRITE --------------------------------------------
+def read_values(lights: list, attribute: str) -> np.ndarray:
+    """
+    Reads the current value of an animated attribute for many lights.
+    Returns:
+        np.ndarray: (L,) values, or (L, 3) for "color". Visibility is 1.0 when visible.
+    """
+    if attribute == "visibility":
+        return np.array([0.0 if light.hide_render or light.hide_viewport else 1.0 for light in lights])
+    owner, data_paths, channels = ANIMATED_ATTRIBUTES[attribute]
+    values = [getattr(light.data, data_paths[0]) for light in lights]
+    return np.array([tuple(value) for value in values] if channels > 1 else values, dtype=float)
+
+
+def write_fcurve(id_data: bpy.types.ID, data_path: str, index: int, frames: np.ndarray, values: np.ndarray,
+                 interpolation: str = "BEZIER"):
+    """
+    Replaces the keys of one fcurve inside the frame range with one key per frame,
+    written in bulk through `keyframe_points.foreach_set` instead of per-frame keyframe_insert calls.
+    Keys outside the frame range are kept.
+    """
+    fcurve = find_fcurve(id_data, data_path, index, create=True)
+
+    # KEEP THE EXISTING KEYS OUTSIDE THE RANGE
+    points = fcurve.keyframe_points
+    existing = np.empty(len(points) * 2, dtype=np.float32)
+    points.foreach_get("co", existing)
+    existing = existing.reshape(-1, 2)
+    existing_interpolation = np.empty(len(points), dtype=np.int32)
+    points.foreach_get("interpolation", existing_interpolation)
+    outside = (existing[:, 0] < frames[0]) | (existing[:, 0] > frames[-1])
+    kept = existing[outside]
+    kept_interpolation = existing_interpolation[outside]
+
+    keys = np.concatenate([kept, np.column_stack([frames, values]).astype(np.float32)])
+    key_interpolation = np.concatenate([kept_interpolation,
+                                        np.full(len(frames), INTERPOLATION[interpolation], dtype=np.int32)])
+    order = np.argsort(keys[:, 0], kind="stable")
+
+    points.clear()
+    points.add(len(keys))
+    points.foreach_set("co", keys[order].ravel())
+    points.foreach_set("interpolation", key_interpolation[order])
+    fcurve.update()  # SORTS THE KEYS AND RECALCULATES THE HANDLES
+
+
+def find_fcurve(id_data: bpy.types.ID, data_path: str, index: int, create: bool = False):
+    """ Returns the fcurve of a data path of `id_data`, creating it (and its action) if `create` is True. """
+    animation_data = id_data.animation_data
+    if not create:
+        action = animation_data.action if animation_data else None
+        return action.fcurves.find(data_path, index=index) if action else None
+    animation_data = animation_data or id_data.animation_data_create()
+    if animation_data.action is None:
+        animation_data.action = bpy.data.actions.new(name=f"{id_data.name}Action")
+    fcurves = animation_data.action.fcurves
+    return fcurves.find(data_path, index=index) or fcurves.new(data_path, index=index)
+
+
+def read_keys(light: bpy.types.Object, attribute: str) -> tuple:
+    """
+    Reads every key of the fcurves of an animated attribute of a light, to restore them on undo.
+    Returns:
+        tuple: (data_path, index, keys) per fcurve. keys is a tuple of values per KEY_PROPERTIES
+        entry, or None when the fcurve does not exist.
+    """
+    owner, data_paths, channels = ANIMATED_ATTRIBUTES[attribute]
+    id_data = light.data if owner == "data" else light
+    curves = []
+    for data_path in data_paths:
+        for index in range(channels):
+            fcurve = find_fcurve(id_data, data_path, index)
+            keys = None
+            if fcurve is not None:
+                points = fcurve.keyframe_points
+                keys = []
+                for name, (size, dtype) in KEY_PROPERTIES.items():
+                    values = np.empty(len(points) * size, dtype=dtype)
+                    points.foreach_get(name, values)
+                    keys.append(tuple(values.tolist()))
+                keys = tuple(keys)
+            curves.append((data_path, index, keys))
+    return tuple(curves)
+
+
+def restore_keys(light: bpy.types.Object, attribute: str, curves: tuple):
+    """
+    Replaces the fcurves of an animated attribute of a light with keys from read_keys().
+    Fcurves that did not exist are removed.
+    """
+    owner, data_paths, channels = ANIMATED_ATTRIBUTES[attribute]
+    id_data = light.data if owner == "data" else light
+    for data_path, index, keys in curves:
+        if keys is None:
+            fcurve = find_fcurve(id_data, data_path, index)
+            if fcurve is not None:
+                id_data.animation_data.action.fcurves.remove(fcurve)
+            continue
+        fcurve = find_fcurve(id_data, data_path, index, create=True)
+        points = fcurve.keyframe_points
+        points.clear()
+        points.add(len(keys[0]) // KEY_PROPERTIES["co"][0])
+        for name, values in zip(KEY_PROPERTIES, keys):
+            points.foreach_set(name, values)
+        fcurve.update()
+
+
+def write_keys(lights: list, attribute: str, frames: np.ndarray, values: np.ndarray):
+    """
+    Keys an attribute of many lights over a frame range.
+    Args:
+        lights (list): The light objects.
+        attribute (str): One of ANIMATED_ATTRIBUTES.
+        frames (np.ndarray): (F,) frame numbers.
+        values (np.ndarray): (L, F) values, or (L, F, 3) for "color". Visibility is 1.0 when visible.
+    """
+    owner, data_paths, channels = ANIMATED_ATTRIBUTES[attribute]
+    frames = np.asarray(frames, dtype=float)
+    values = np.asarray(values, dtype=float)
+    for light, light_values in zip(lights, values):
+        id_data = light.data if owner == "data" else light
+        if attribute == "visibility":
+            hidden = (light_values < 0.5).astype(float)
+            for data_path in data_paths:
+                write_fcurve(id_data, data_path, 0, frames, hidden, "CONSTANT")
+        elif channels > 1:
+            for index in range(channels):
+                write_fcurve(id_data, data_paths[0], index, frames, light_values[:, index])
+        else:
+            write_fcurve(id_data, data_paths[0], 0, frames, light_values)
+
+
+# GENERATORS --------------------------------------------
+def value_noise(frames: np.ndarray, count: int, frequency: float, seed: int) -> np.ndarray:
+    """
+    Smooth 1D value noise in [-1, 1] for `count` independent curves over the whole frame range at once.
+    Returns:
+        np.ndarray: (count, F) noise.
+    """
+    if frequency <= 0:
+        raise ValueError(f"Noise frequency must be positive, got {frequency}.")
+    t = (frames - frames[0]) * frequency
+    lattice = np.random.default_rng(seed).uniform(-1.0, 1.0, size=(count, int(t[-1]) + 2))
+    cell = np.floor(t).astype(int)
+    fraction = t - cell
+    fraction = fraction * fraction * (3.0 - 2.0 * fraction)  # SMOOTHSTEP BETWEEN LATTICE VALUES
+    return lattice[:, cell] * (1.0 - fraction) + lattice[:, cell + 1] * fraction
+
+
+def flicker(frames: np.ndarray, base: np.ndarray, attribute: str, amplitude: float, frequency: float,
+            seed: int = 0, octaves: int = 3) -> np.ndarray:
+    """
+    Noise flicker around the current values, one independent curve per light.
+    Args:
+        frames (np.ndarray): (F,) frame numbers.
+        base (np.ndarray): (L,) or (L, 3) current values, from read_values().
+        attribute (str): One of ANIMATED_ATTRIBUTES.
+        amplitude (float): Flicker strength in the attribute's unit (stops for exposure, Kelvin for
+            temperature); a relative strength for color, and the fraction of frames off for visibility.
+        frequency (float): Flickers per frame of the first octave.
+        seed (int, optional): Random seed. Defaults to 0.
+        octaves (int, optional): Number of noise octaves summed. Defaults to 3.
+    Returns:
+        np.ndarray: (L, F) or (L, F, 3) values.
+    """
+    noise = np.zeros((len(base), len(frames)))
+    weight_sum = 0.0
+    for octave in range(octaves):
+        weight = 0.5 ** octave
+        noise += weight * value_noise(frames, len(base), frequency * 2 ** octave, seed + octave)
+        weight_sum += weight
+    noise /= weight_sum
+
+    if attribute == "visibility":
+        # THE `amplitude` QUANTILE OF EACH CURVE SETS THE SHARE OF FRAMES OFF
+        threshold = np.quantile(noise, np.clip(amplitude, 0.0, 1.0), axis=1)[:, None]
+        return np.where(noise < threshold, 0.0, base[:, None])
+    if attribute == "color":
+        return np.clip(base[:, None, :] * (1.0 + amplitude * noise)[:, :, None], 0.0, None)
+    values = base[:, None] + amplitude * noise
+    return np.clip(values, 0.0, None) if attribute in ("radius", "temperature") else values
+
+
+def ramp(frames: np.ndarray, base: np.ndarray, target: float, ease: bool = True) -> np.ndarray:
+    """
+    Ramp from the current values to a target value over the frame range.
+    For "color", the target is a multiplier of the current color.
+    Returns:
+        np.ndarray: (L, F) or (L, F, 3) values.
+    """
+    t = (frames - frames[0]) / max(frames[-1] - frames[0], 1.0)
+    if ease:
+        t = t * t * (3.0 - 2.0 * t)
+    if base.ndim == 2:  # COLOR
+        return base[:, None, :] * (1.0 + (target - 1.0) * t)[None, :, None]
+    return base[:, None] + (target - base[:, None]) * t[None, :]
+
+
+def bake(lights: list, attribute: str, frames: np.ndarray) -> np.ndarray:
+    """
+    Evaluates an attribute on every frame (drivers, constraints, existing animation) so it can be
+    written back as plain keys. Frames are stepped once for all lights.
+    Returns:
+        np.ndarray: (L, F) or (L, F, 3) values.
+    """
+    scene = bpy.context.scene
+    current_frame = scene.frame_current
+    samples = []
+    try:
+        for frame in frames:
+            scene.frame_set(int(frame))
+            samples.append(read_values(lights, attribute))
+    finally:
+        scene.frame_set(current_frame)
+    return np.stack(samples, axis=1)
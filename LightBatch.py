@@ -0,0 +1,321 @@
+###############################
+# Blender Light Batch Processor
+###############################
+#
+# Applies the same light fixes to many .blend files with a pool of background Blender workers.
+#
+#   python LightBatch.py --operations fixes.json --manifest progress.jsonl --workers 4 shots/
+#
+# fixes.json holds a list of operations, applied in order to every file:
+#   [{"op": "rename_convention"},
+#    {"op": "offset", "match": "LGT_key*", "attribute": "exposure", "delta": -0.5},
+#    {"op": "set", "type": "SUN", "attributes": {"use_shadow": false}}]
+#
+# Results are streamed as JSON lines and appended to the manifest; running the same
+# command again skips the files already processed successfully with the same operations.
+# --dry-run results are recorded as "dry-run" and never count as processed.
+
+import argparse
+import hashlib
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from fnmatch import fnmatchcase
+
+
+SCRIPT_PATH = os.path.dirname(os.path.abspath(__file__))
+SCRIPT_FILE = os.path.abspath(__file__)
+RESULT_MARKER = "BLM_RESULT "  # PREFIX OF RESULT LINES, BLENDER PRINTS ITS OWN OUTPUT ON STDOUT
+
+
+# WORKER SIDE (RUNS INSIDE BLENDER) --------------------------------------------
+def matching_lights(operation: dict) -> list:
+    """ Returns the light objects selected by the "match" name pattern and "type" of an operation. """
+    import bpy
+
+    pattern = operation.get("match", "*")
+    light_type = operation.get("type")
+    return [obj for obj in bpy.data.objects
+            if obj.type == 'LIGHT'
+            and fnmatchcase(obj.name, pattern)
+            and (light_type is None or obj.data.type == light_type)]
+
+
+def apply_operations(operations: list) -> int:
+    """
+    Applies operations to the open file with the Light Manager's create/rename/attribute logic.
+    Returns the number of changes made.
+    """
+    import bpy
+    import LightCore
+    from LightJournal import read_value, write_value
+
+    changes = 0
+    for operation in operations:
+        op = operation["op"]
+        if op == "rename_convention":
+            for light in matching_lights(operation):
+                if not LightCore.follows_convention(light.name):
+                    light.name = LightCore.naming_convention(LightCore.base_name(light.name))
+                    changes += 1
+        elif op == "set":
+            for light in matching_lights(operation):
+                for attribute_name, value in operation["attributes"].items():
+                    value = tuple(value) if isinstance(value, list) else value
+                    if read_value(light, attribute_name) != value:
+                        write_value(light, attribute_name, value)
+                        changes += 1
+        elif op == "offset":
+            for light in matching_lights(operation):
+                value = read_value(light, operation["attribute"])
+                write_value(light, operation["attribute"], value + operation["delta"])
+                changes += 1
+        elif op == "create":
+            collection = bpy.data.collections.get(operation.get("collection", "")) or bpy.context.scene.collection
+            LightCore.new_light(operation.get("name", ""), operation.get("type", "POINT"), collection)
+            changes += 1
+        elif op == "delete":
+            for light in matching_lights(operation):
+                bpy.data.objects.remove(light, do_unlink=True)
+                changes += 1
+        else:
+            raise ValueError(f"Unknown operation '{op}'")
+    return changes
+
+
+def process_file(path: str, operations: list, save: bool = True) -> dict:
+    """
+    Opens a .blend file, applies the operations and saves it.
+    Returns the result record of the file.
+    """
+    import bpy
+
+    start = time.time()
+    try:
+        bpy.ops.wm.open_mainfile(filepath=path)
+        changes = apply_operations(operations)
+        if save and changes:
+            bpy.ops.wm.save_mainfile()
+    except Exception as error:  # A BROKEN FILE MUST NOT STOP THE WORKER
+        return {"file": path, "status": "failed", "error": f"{type(error).__name__}: {error}",
+                "seconds": round(time.time() - start, 3)}
+    return {"file": path, "status": "ok" if save else "dry-run", "changes": changes,
+            "seconds": round(time.time() - start, 3)}
+
+
+def serve():
+    """ Worker loop: reads one job per stdin line and writes one result line per job. """
+    if SCRIPT_PATH not in sys.path:
+        sys.path.append(SCRIPT_PATH)
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        job = json.loads(line)
+        result = process_file(job["file"], job["operations"], job.get("save", True))
+        sys.stdout.write(RESULT_MARKER + json.dumps(result) + "\n")
+        sys.stdout.flush()
+
+
+# DRIVER SIDE (PLAIN PYTHON) --------------------------------------------
+class BlenderWorker:
+    """
+    A background Blender process reused for many files.
+    It is restarted if it dies, e.g. when Blender crashes on a broken file.
+    """
+
+    def __init__(self, command: list, env: dict = None, verbose: bool = False):
+        """
+        Args:
+            command (list): The command line starting the worker in serve mode.
+            env (dict, optional): Environment of the worker process.
+            verbose (bool, optional): Whether to show the worker's own output on stderr. Defaults to False.
+        """
+        self.command = command
+        self.env = env
+        self.verbose = verbose
+        self.process = None
+
+    def start(self):
+        """ Starts the worker process. """
+        self.process = subprocess.Popen(
+            self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=None if self.verbose else subprocess.DEVNULL,
+            env=self.env, text=True, bufsize=1)
+
+    def run(self, job: dict) -> dict:
+        """ Sends a job to the worker and waits for its result. """
+        if self.process is None or self.process.poll() is not None:
+            self.start()
+        try:
+            self.process.stdin.write(json.dumps(job) + "\n")
+            self.process.stdin.flush()
+            for line in self.process.stdout:
+                if line.startswith(RESULT_MARKER):
+                    return json.loads(line[len(RESULT_MARKER):])
+                if self.verbose:
+                    sys.stderr.write(line)
+        except (BrokenPipeError, OSError):
+            pass
+        # THE WORKER DIED WITHOUT ANSWERING, THE NEXT JOB RESTARTS IT
+        code = self.process.wait()
+        self.process = None
+        return {"file": job["file"], "status": "failed", "error": f"Worker exited with code {code}"}
+
+    def stop(self):
+        """ Closes the worker's stdin so it exits after its current job. """
+        if self.process is not None and self.process.poll() is None:
+            self.process.stdin.close()
+            self.process.wait()
+        self.process = None
+
+
+def worker_command(blender: str, stand_in: str = None) -> tuple:
+    """
+    Returns the (command, env) starting a worker in serve mode.
+    With `stand_in`, the worker is a plain Python process importing `bpy` from that directory.
+    """
+    env = dict(os.environ)
+    if stand_in:
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [stand_in, SCRIPT_PATH, env.get("PYTHONPATH")]))
+        return [sys.executable, SCRIPT_FILE, "--serve"], env
+    return [blender, "--background", "--factory-startup", "--python", SCRIPT_FILE, "--", "--serve"], env
+
+
+def collect_files(paths: list) -> list:
+    """ Expands directories into the .blend files they contain, recursively. """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, name) for name in sorted(names) if name.endswith(".blend"))
+        else:
+            files.append(path)
+    return [os.path.abspath(path) for path in files]
+
+
+def operations_digest(operations: list) -> str:
+    """ Identifies a list of operations, so a manifest only resumes runs of the same fixes. """
+    return hashlib.sha1(json.dumps(operations, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def read_manifest(manifest_path: str, digest: str = None) -> set:
+    """
+    Returns the files already processed successfully according to a progress manifest.
+    Args:
+        manifest_path (str): The JSON lines progress manifest.
+        digest (str, optional): operations_digest() of the current operations. Results of other
+            operations are not counted as done. Defaults to None, which counts every result.
+    """
+    done = set()
+    if not manifest_path or not os.path.exists(manifest_path):
+        return done
+    with open(manifest_path, encoding="utf-8") as manifest:
+        for line in manifest:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue  # TRUNCATED LAST LINE OF AN INTERRUPTED RUN
+            if result.get("status") == "ok" and (digest is None or result.get("operations") == digest):
+                done.add(result["file"])
+    return done
+
+
+def run_batch(files: list, operations: list, manifest_path: str = None, workers: int = None,
+              blender: str = "blender", stand_in: str = None, save: bool = True, verbose: bool = False):
+    """
+    Processes files with a pool of background workers and yields each result as soon as it is ready.
+    Files recorded as done with the same operations in the manifest are skipped,
+    and every new result is appended to it with the digest of the operations.
+    Args:
+        files (list): Absolute paths of the .blend files.
+        operations (list): The operations applied to every file.
+        manifest_path (str, optional): JSON lines progress manifest used to resume interrupted runs.
+        workers (int, optional): Number of worker processes. Defaults to the CPU count.
+        blender (str, optional): The Blender executable. Defaults to "blender".
+        stand_in (str, optional): Directory of a stand-in `bpy` package, used instead of Blender.
+        save (bool, optional): Whether to save the modified files. Defaults to True.
+        verbose (bool, optional): Whether to show the workers' own output. Defaults to False.
+    """
+    digest = operations_digest(operations)
+    done = read_manifest(manifest_path, digest)
+    pending = [path for path in files if path not in done]
+    if not pending:
+        return
+
+    jobs = queue.Queue()
+    for path in pending:
+        jobs.put({"file": path, "operations": operations, "save": save})
+    results = queue.Queue()
+    command, env = worker_command(blender, stand_in)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(pending)))
+
+    def _work():
+        worker = BlenderWorker(command, env, verbose)
+        try:
+            while True:
+                try:
+                    job = jobs.get_nowait()
+                except queue.Empty:
+                    return
+                results.put(worker.run(job))
+        finally:
+            worker.stop()
+
+    threads = [threading.Thread(target=_work, daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+
+    manifest = open(manifest_path, "a", encoding="utf-8") if manifest_path else None
+    try:
+        for _ in range(len(pending)):
+            result = results.get()
+            if manifest:
+                manifest.write(json.dumps({**result, "operations": digest}) + "\n")
+                manifest.flush()
+            yield result
+    finally:
+        if manifest:
+            manifest.close()
+        for thread in threads:
+            thread.join(timeout=1.0)
+
+
+def main(argv: list) -> int:
+    """ Command line entry point. Returns the process exit code. """
+    parser = argparse.ArgumentParser(description="Apply light fixes to many .blend files.")
+    parser.add_argument("paths", nargs="*", help=".blend files or directories to process")
+    parser.add_argument("--operations", help="JSON file holding the list of operations")
+    parser.add_argument("--manifest", help="progress manifest (JSON lines), used to resume")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--blender", default="blender", help="Blender executable")
+    parser.add_argument("--stand-in-bpy", dest="stand_in", help="directory of a stand-in bpy package, e.g. tests/stand_in")
+    parser.add_argument("--dry-run", action="store_true", help="apply the operations without saving")
+    parser.add_argument("--verbose", action="store_true", help="show the workers' own output")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)  # WORKER MODE
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        serve()
+        return 0
+    if not args.operations or not args.paths:
+        parser.error("--operations and at least one path are required")
+
+    with open(args.operations, encoding="utf-8") as operations_file:
+        operations = json.load(operations_file)
+
+    failed = 0
+    for result in run_batch(collect_files(args.paths), operations, args.manifest, args.workers,
+                            args.blender, args.stand_in, not args.dry_run, args.verbose):
+        failed += result["status"] == "failed"
+        print(json.dumps(result), flush=True)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    # INSIDE BLENDER THE SCRIPT ARGUMENTS FOLLOW "--"
+    script_args = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    sys.exit(main(script_args))
@@ -0,0 +1,123 @@
+###############################
+# Blender Light Color
+###############################
+
+import numpy as np
+
+
+# BLACKBODY LOOKUP TABLE -------------------------------------------
+TEMPERATURE_MIN = 800.0
+TEMPERATURE_MAX = 12000.0
+TEMPERATURE_STEP = 25.0
+WAVELENGTHS = np.arange(380.0, 781.0, 5.0)  # NANOMETERS
+
+# LINEAR REC.709 / sRGB PRIMARIES FROM CIE XYZ (D65)
+XYZ_TO_RGB = np.array([
+    [3.2406, -1.5372, -0.4986],
+    [-0.9689, 1.8758, 0.0415],
+    [0.0557, -0.2040, 1.0570],
+])
+
+
+def _lobe(wavelengths: np.ndarray, mean: float, sigma_low: float, sigma_high: float) -> np.ndarray:
+    """ Piecewise gaussian of the CIE 1931 colour matching functions fit (Wyman, Sloan & Shirley 2013). """
+    sigma = np.where(wavelengths < mean, sigma_low, sigma_high)
+    return np.exp(-0.5 * ((wavelengths - mean) / sigma) ** 2)
+
+
+def _color_matching_functions(wavelengths: np.ndarray) -> np.ndarray:
+    """ Returns the (3, N) x̄, ȳ, z̄ colour matching functions sampled at the wavelengths. """
+    x = (1.056 * _lobe(wavelengths, 599.8, 37.9, 31.0) + 0.362 * _lobe(wavelengths, 442.0, 16.0, 26.7)
+         - 0.065 * _lobe(wavelengths, 501.1, 20.4, 26.2))
+    y = 0.821 * _lobe(wavelengths, 568.8, 46.9, 40.5) + 0.286 * _lobe(wavelengths, 530.9, 16.3, 31.1)
+    z = 1.217 * _lobe(wavelengths, 437.0, 11.8, 36.0) + 0.681 * _lobe(wavelengths, 459.0, 26.0, 13.8)
+    return np.stack([x, y, z])
+
+
+def _build_blackbody_table() -> tuple:
+    """
+    Integrates Planck's law against the colour matching functions for every table temperature.
+    Each colour is normalized so its brightest channel is 1: the table holds the tint only.
+    Returns:
+        tuple: (temperatures (T,), linear RGB colours (T, 3))
+    """
+    temperatures = np.arange(TEMPERATURE_MIN, TEMPERATURE_MAX + TEMPERATURE_STEP, TEMPERATURE_STEP)
+    wavelengths_m = WAVELENGTHS * 1e-9
+    c2 = 1.4388e-2  # SECOND RADIATION CONSTANT (m.K)
+    radiance = 1.0 / (wavelengths_m ** 5 * np.expm1(c2 / (wavelengths_m[None, :] * temperatures[:, None])))
+    xyz = radiance @ _color_matching_functions(WAVELENGTHS).T
+    rgb = np.clip(xyz @ XYZ_TO_RGB.T, 0.0, None)
+    rgb /= rgb.max(axis=1, keepdims=True)
+    return temperatures, rgb
+
+
+BLACKBODY_TEMPERATURES, BLACKBODY_TABLE = _build_blackbody_table()
+
+
+def blackbody(temperatures: np.ndarray) -> np.ndarray:
+    """
+    Looks up the blackbody tint of many temperatures at once.
+    Args:
+        temperatures (np.ndarray): (N,) temperatures in Kelvin, clamped to the table range.
+    Returns:
+        np.ndarray: (N, 3) linear RGB tints.
+    """
+    temperatures = np.clip(np.asarray(temperatures, dtype=float), TEMPERATURE_MIN, TEMPERATURE_MAX)
+    position = (temperatures - TEMPERATURE_MIN) / TEMPERATURE_STEP
+    index = np.minimum(position.astype(int), len(BLACKBODY_TEMPERATURES) - 2)
+    weight = (position - index)[:, None]
+    return BLACKBODY_TABLE[index] * (1.0 - weight) + BLACKBODY_TABLE[index + 1] * weight
+
+
+def effective_colors(colors: np.ndarray, temperatures: np.ndarray, use_temperature: np.ndarray) -> np.ndarray:
+    """
+    Computes the colour lights actually emit: `color` tinted by the blackbody colour
+    of `temperature` where `use_temperature` is on.
+    Args:
+        colors (np.ndarray): (N, 3) light colours.
+        temperatures (np.ndarray): (N,) temperatures in Kelvin.
+        use_temperature (np.ndarray): (N,) booleans.
+    Returns:
+        np.ndarray: (N, 3) effective colours clipped to [0, 1].
+    """
+    colors = np.asarray(colors, dtype=float).reshape(-1, 3)
+    tint = np.where(np.asarray(use_temperature, dtype=bool)[:, None], blackbody(temperatures), 1.0)
+    return np.clip(colors * tint, 0.0, 1.0)
+
+
+def color_key(light) -> tuple:
+    """ Cache key of a light's effective colour: (r, g, b, temperature or None). """
+    data = light.data
+    temperature = data.temperature if getattr(data, "use_temperature", False) else None
+    return (*data.color, temperature)
+
+
+class EffectiveColorCache:
+    """
+    Caches effective colours by (color, temperature) key.
+    Misses of a whole refresh or update batch are computed in one vectorized pass.
+    """
+
+    def __init__(self, max_size: int = 65536):
+        """
+        Args:
+            max_size (int, optional): Number of cached colours before the cache is reset. Defaults to 65536.
+        """
+        self.max_size = max_size
+        self.colors = {}
+
+    def lookup(self, keys: list) -> list:
+        """
+        Returns the effective (r, g, b) colour of every key.
+        Args:
+            keys (list): Keys built by color_key().
+        """
+        misses = [key for key in dict.fromkeys(keys) if key not in self.colors]
+        if misses:
+            if len(self.colors) + len(misses) > self.max_size:
+                self.colors.clear()
+            table = np.array([(key[0], key[1], key[2], key[3] or 0.0) for key in misses], dtype=float)
+            use_temperature = np.array([key[3] is not None for key in misses])
+            computed = effective_colors(table[:, :3], table[:, 3], use_temperature)
+            self.colors.update(zip(misses, map(tuple, computed.tolist())))
+        return [self.colors[key] for key in keys]
@@ -0,0 +1,440 @@
+###############################
+# Blender Light Command Server
+###############################
+
+import json
+import os
+import queue
+import selectors
+import socket
+import struct
+import threading
+
+import bpy
+
+from LightCore import rename_convention
+from LightJournal import Delta, capture_light, change_deltas, read_value
+from LightModel import snapshot_light
+
+try:
+    import msgpack
+except ImportError:  # MSGPACK IS OPTIONAL, JSON IS ALWAYS AVAILABLE
+    msgpack = None
+
+
+# FRAME: 4 BYTES BIG ENDIAN PAYLOAD LENGTH + 1 BYTE CODEC + PAYLOAD
+HEADER = struct.Struct(">IB")
+CODEC_JSON = ord("j")
+CODEC_MSGPACK = ord("m")
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+POLL_INTERVAL = 0.05  # SECONDS BETWEEN MAIN THREAD QUEUE DRAINS
+
+
+def parse_address(address: str) -> tuple:
+    """
+    Parses "host:port" into a TCP address, anything else is a UNIX socket path.
+    Returns:
+        tuple: (socket family, address)
+    """
+    host, separator, port = address.rpartition(":")
+    if separator and port.isdigit():
+        return socket.AF_INET, (host or "127.0.0.1", int(port))
+    return socket.AF_UNIX, address
+
+
+def encode(message: object, codec: int) -> bytes:
+    """ Encodes a message into a frame. """
+    if codec == CODEC_MSGPACK:
+        if msgpack is None:
+            raise ValueError("msgpack is not installed")
+        payload = msgpack.packb(message, use_bin_type=True)
+    else:
+        payload = json.dumps(message).encode("utf-8")
+    return HEADER.pack(len(payload), codec) + payload
+
+
+def decode(payload: bytes, codec: int) -> object:
+    """ Decodes the payload of a frame. """
+    if codec == CODEC_MSGPACK:
+        if msgpack is None:
+            raise ValueError("msgpack is not installed")
+        return msgpack.unpackb(payload, raw=False)
+    return json.loads(payload.decode("utf-8"))
+
+
+def send_commands(address: str, commands: list, codec: int = CODEC_JSON, sock: socket.socket = None) -> list:
+    """
+    Client helper for pipeline scripts: sends one batch of commands and waits for the results.
+    Pass an open socket to reuse the connection across batches.
+    Args:
+        address (str): "host:port" or a UNIX socket path.
+        commands (list): Command dicts, e.g. {"op": "set", "light": "LGT_key.000", "attributes": {"exposure": 1.0}}.
+        codec (int, optional): CODEC_JSON or CODEC_MSGPACK. Defaults to CODEC_JSON.
+        sock (socket.socket, optional): An already connected socket.
+    """
+    owned = sock is None
+    if owned:
+        family, target = parse_address(address)
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.connect(target)
+    try:
+        sock.sendall(encode({"commands": commands}, codec))
+        header = _recv_exactly(sock, HEADER.size)
+        length, reply_codec = HEADER.unpack(header)
+        return decode(_recv_exactly(sock, length), reply_codec)["results"]
+    finally:
+        if owned:
+            sock.close()
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    """ Reads exactly `size` bytes from a blocking socket. """
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Connection closed by the light manager.")
+        data += chunk
+    return bytes(data)
+
+
+class _Connection:
+    """ Buffers of one persistent client connection. """
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.inbox = bytearray()
+        self.outbox = bytearray()
+
+
+class LightCommandServer:
+    """
+    Serves the Light Manager operations to pipeline scripts over a local socket.
+    Connections are persistent and each message carries a batch of commands.
+    The network runs on a background thread; batches are executed on Blender's main thread
+    through a queue drained by a bpy timer, with one undo step and one table update per batch.
+    """
+
+    def __init__(self, logic, address: str):
+        """
+        Args:
+            logic (BlenderLightLogic): The logic whose operations are exposed.
+            address (str): "host:port" (localhost recommended) or a UNIX socket path.
+        """
+        self.logic = logic
+        self.address = address
+        self.requests = queue.Queue()  # (connection, codec, message) FROM THE NETWORK THREAD
+        self.deltas = []  # STATE OF THE BATCH BEING EXECUTED
+        self.affected = set()
+        self.structural = False
+        self.selector = selectors.DefaultSelector()
+        self.connections = {}
+        self.lock = threading.Lock()  # GUARDS THE OUTBOXES
+        self.running = False
+        self.thread = None
+        self.listener = None
+        self.wake_reader, self.wake_writer = socket.socketpair()
+
+    # LIFECYCLE --------------------------------------------
+    def start(self):
+        """ Opens the socket and starts serving. """
+        family, target = parse_address(self.address)
+        self.listener = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_INET:
+            self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind(target)
+        self.listener.listen()
+        self.listener.setblocking(False)
+        self.selector.register(self.listener, selectors.EVENT_READ)
+        self.selector.register(self.wake_reader, selectors.EVENT_READ)
+
+        self.running = True
+        self.thread = threading.Thread(target=self._serve, name="LightCommandServer", daemon=True)
+        self.thread.start()
+        bpy.app.timers.register(self._drain, first_interval=POLL_INTERVAL, persistent=True)
+
+    def stop(self):
+        """ Stops serving and closes every connection. """
+        if not self.running:
+            return
+        self.running = False
+        self.wake_writer.send(b"\0")
+        self.thread.join(timeout=2.0)
+        if bpy.app.timers.is_registered(self._drain):
+            bpy.app.timers.unregister(self._drain)
+        for connection in list(self.connections.values()):
+            connection.sock.close()
+        self.connections.clear()
+        self.listener.close()
+        self.selector.close()
+        self.wake_reader.close()
+        self.wake_writer.close()
+        family, target = parse_address(self.address)
+        if family == socket.AF_UNIX:
+            try:
+                os.unlink(target)
+            except OSError:
+                pass
+
+    # NETWORK THREAD --------------------------------------------
+    def _serve(self):
+        """ Accepts connections, reads frames and writes replies until stopped. """
+        while self.running:
+            for key, events in self.selector.select(timeout=1.0):
+                if key.fileobj is self.listener:
+                    try:
+                        sock, _ = self.listener.accept()
+                    except (BlockingIOError, InterruptedError):
+                        continue
+                    sock.setblocking(False)
+                    self.connections[sock.fileno()] = _Connection(sock)
+                    self.selector.register(sock, selectors.EVENT_READ)
+                elif key.fileobj is self.wake_reader:
+                    self.wake_reader.recv(4096)
+                else:
+                    connection = self.connections.get(key.fileobj.fileno())
+                    if connection is None:
+                        continue
+                    if events & selectors.EVENT_READ:
+                        self._read(connection)
+                    if events & selectors.EVENT_WRITE:
+                        self._write(connection)
+            self._update_write_interest()
+
+    def _read(self, connection: _Connection):
+        """ Reads available bytes and queues every complete frame. """
+        try:
+            data = connection.sock.recv(65536)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._close(connection)
+            return
+        connection.inbox += data
+        while len(connection.inbox) >= HEADER.size:
+            length, codec = HEADER.unpack_from(connection.inbox)
+            if length > MAX_FRAME_SIZE:
+                self._close(connection)
+                return
+            if len(connection.inbox) < HEADER.size + length:
+                break
+            payload = bytes(connection.inbox[HEADER.size:HEADER.size + length])
+            del connection.inbox[:HEADER.size + length]
+            try:
+                message = decode(payload, codec)
+            except ValueError as error:
+                self.reply(connection, CODEC_JSON, {"error": f"Invalid message: {error}"})
+                continue
+            self.requests.put((connection, codec, message))
+
+    def _write(self, connection: _Connection):
+        """ Sends as much of the outbox as the socket accepts. """
+        with self.lock:
+            if not connection.outbox:
+                return
+            try:
+                sent = connection.sock.send(connection.outbox)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                sent = None
+            if sent is not None:
+                del connection.outbox[:sent]
+        if sent is None:
+            self._close(connection)
+
+    def _update_write_interest(self):
+        """ Watches for writability only on connections with pending replies. """
+        with self.lock:
+            for connection in self.connections.values():
+                events = selectors.EVENT_READ | (selectors.EVENT_WRITE if connection.outbox else 0)
+                self.selector.modify(connection.sock, events)
+
+    def _close(self, connection: _Connection):
+        """ Forgets a client connection. """
+        self.connections.pop(connection.sock.fileno(), None)
+        try:
+            self.selector.unregister(connection.sock)
+        except (KeyError, ValueError):
+            pass
+        connection.sock.close()
+
+    def reply(self, connection: _Connection, codec: int, message: dict):
+        """ Queues a reply frame; called from either thread. """
+        try:
+            frame = encode(message, codec)
+        except (TypeError, ValueError) as error:
+            frame = encode({"error": f"Cannot encode reply: {error}"}, CODEC_JSON)
+        with self.lock:
+            connection.outbox += frame
+        self.wake_writer.send(b"\0")
+
+    # MAIN THREAD --------------------------------------------
+    def _drain(self) -> float:
+        """ bpy timer callback: executes the queued batches on Blender's main thread. """
+        while True:
+            try:
+                connection, codec, message = self.requests.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                commands = message.get("commands") if isinstance(message, dict) else message
+                if not isinstance(commands, list):
+                    raise TypeError('A batch is a list of commands or {"commands": [...]}')
+                reply = {"results": self.execute_batch(commands)}
+            except Exception as error:  # AN EXCEPTION HERE WOULD UNREGISTER THE TIMER AND STOP THE SERVER
+                reply = {"error": f"{type(error).__name__}: {error}"}
+            if isinstance(message, dict) and "id" in message:
+                reply["id"] = message["id"]
+            self.reply(connection, codec, reply)
+        return POLL_INTERVAL if self.running else None
+
+    def execute_batch(self, commands: list) -> list:
+        """
+        Executes a batch of commands as one undo step with one table update.
+        A failing command reports its error without aborting the rest of the batch.
+        """
+        self.deltas = []
+        self.affected = set()
+        self.structural = False
+        results = []
+        try:
+            for command in commands:
+                try:
+                    if not isinstance(command, dict):
+                        raise TypeError("A command is an object with an 'op' key")
+                    handler = getattr(self, f"op_{command['op']}", None)
+                    if handler is None:
+                        raise ValueError(f"Unknown operation '{command['op']}'")
+                    results.append({"ok": True, "result": handler(command)})
+                except (KeyError, ValueError, TypeError, AttributeError, RuntimeError, ReferenceError) as error:
+                    results.append({"ok": False, "error": f"{type(error).__name__}: {error}"})
+        finally:
+            # WHAT WAS WRITTEN IS JOURNALED AND SHOWN EVEN IF THE BATCH STOPPED EARLY
+            if self.deltas:
+                self.logic.journal.record(f"Command batch ({len(commands)})", self.deltas)
+            if self.affected or self.structural:
+                self.logic.update_rows(self.logic.ui.light_table, self.affected, self.structural, clear_solo=True)
+        return results
+
+    def _apply(self, deltas: list):
+        """
+        Writes deltas immediately so later commands of the batch see them.
+        Each delta is journaled as soon as it is written: if a later one fails, the earlier
+        writes can still be undone and their rows are still updated.
+        """
+        for delta in deltas:
+            if delta.old == delta.new:
+                continue
+            affected, structural = self.logic.apply_deltas([delta], undo=False)
+            if delta.attribute == "name":
+                # JOURNAL THE NAME BLENDER GAVE, WHICH CARRIES A SUFFIX IF THE NAME WAS TAKEN
+                delta = delta._replace(new=self.logic.handles.resolve(delta.light).name)
+            self.deltas.append(delta)
+            self.affected |= affected
+            self.structural = self.structural or structural
+
+    def _coerce(self, light: bpy.types.Object, attribute_name: str, value):
+        """
+        Checks a value against the current value of the attribute before anything is written,
+        so a command with one bad value fails as a whole. Returns the value to write.
+        """
+        current = read_value(light, attribute_name)
+        if isinstance(current, bool):
+            if not isinstance(value, bool):
+                raise TypeError(f"'{attribute_name}' expects a boolean, got {value!r}")
+        elif isinstance(current, (int, float)):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise TypeError(f"'{attribute_name}' expects a number, got {value!r}")
+            value = type(current)(value)
+        elif isinstance(current, tuple):
+            if (not isinstance(value, (list, tuple)) or len(value) != len(current)
+                    or not all(isinstance(item, (int, float)) and not isinstance(item, bool) for item in value)):
+                raise TypeError(f"'{attribute_name}' expects {len(current)} numbers, got {value!r}")
+            value = tuple(float(item) for item in value)
+        elif isinstance(current, str) and not isinstance(value, str):
+            raise TypeError(f"'{attribute_name}' expects a string, got {value!r}")
+        return value
+
+    def _light(self, name: str) -> bpy.types.Object:
+        """ Returns a light object by name, raising KeyError if it does not exist or is parked by a delete. """
+        light = bpy.data.objects.get(name)
+        if light is None or light.type != 'LIGHT' or not light.users_collection:
+            raise KeyError(f"No light named '{name}'")
+        return light
+
+    # OPERATIONS --------------------------------------------
+    def op_list(self, command: dict) -> list:
+        """ {"op": "list"} -> [{"name", "type"}] of the lights of the active view layer. """
+        return [{"name": light.name, "type": light.data.type} for light in self.logic.active_model().lights()]
+
+    def op_snapshot(self, command: dict) -> list:
+        """ {"op": "snapshot", "lights": [names] (optional)} -> the attribute records of the lights. """
+        if "lights" in command:
+            lights = [self._light(name) for name in command["lights"]]
+        else:
+            lights = self.logic.active_model().lights()
+        records = [snapshot_light(light, bpy.context.view_layer) for light in lights]
+        for record in records:
+            record["color"] = list(record["color"])
+        return records
+
+    def op_create(self, command: dict) -> str:
+        """ {"op": "create", "name": str, "type": "POINT" | "SUN" | "SPOT" | "AREA"} -> the new light name. """
+        light = self.logic.new_light(command.get("name", ""), command.get("type", "POINT"))
+        self.deltas.append(Delta(self.logic.handles.handle(light), "exists", None, capture_light(light)))
+        self.structural = True
+        return light.name
+
+    def op_rename(self, command: dict) -> str:
+        """ {"op": "rename", "light": str, "name": str} -> the name Blender gave the light. """
+        light = self._light(command["light"])
+        if not command["name"].strip():
+            raise ValueError("New name cannot be empty.")
+        # SAME CONVENTION AS A RENAME FROM THE TABLE
+        self._apply([Delta(self.logic.handles.handle(light), "name", light.name, rename_convention(command["name"]))])
+        return light.name
+
+    def op_delete(self, command: dict) -> bool:
+        """ {"op": "delete", "light": str} """
+        light = self._light(command["light"])
+        self._apply([Delta(self.logic.handles.handle(light), "exists", capture_light(light), None)])
+        return True
+
+    def op_set(self, command: dict) -> bool:
+        """ {"op": "set", "light": str, "attributes": {attribute_name: value}} """
+        light = self._light(command["light"])
+        deltas = []
+        for attribute_name, value in command["attributes"].items():
+            if attribute_name in ("name", "exists"):
+                raise ValueError(f"Use the '{attribute_name}' specific operation instead of 'set'.")
+            if attribute_name != "visible" and not hasattr(light.data, attribute_name):
+                raise AttributeError(f"'{light.name}' has no attribute '{attribute_name}'")
+            value = self._coerce(light, attribute_name, value)
+            deltas += change_deltas(self.logic.handles.handle(light), light, attribute_name, value)
+        self._apply(deltas)
+        return True
+
+    def op_mute(self, command: dict) -> bool:
+        """ {"op": "mute", "lights": [names], "muted": bool (default True)} """
+        visible = not command.get("muted", True)
+        lights = [self._light(name) for name in command["lights"]]
+        deltas = []
+        for light in lights:
+            deltas += change_deltas(self.logic.handles.handle(light), light, "visible", visible)
+        self._apply(deltas)
+        return True
+
+    def op_solo(self, command: dict) -> bool:
+        """ {"op": "solo", "lights": [names]} shows only these lights, an empty list shows every light. """
+        solo = set(command["lights"])
+        for name in solo:
+            self._light(name)
+        deltas = []
+        for light in self.logic.active_model().lights():
+            visible = not solo or light.name in solo
+            deltas += change_deltas(self.logic.handles.handle(light), light, "visible", visible)
+        self._apply(deltas)
+        return True
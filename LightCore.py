@@ -0,0 +1,65 @@
+###############################
+# Blender Light Core
+###############################
+
+import re
+
+import bpy
+
+
+LIGHT_TYPES = ["POINT", "SUN", "SPOT", "AREA"]
+NAME_PREFIX = "LGT_"
+SUFFIX_PATTERN = re.compile(r"\.\d+$")  # BLENDER DUPLICATE SUFFIX, e.g. ".001"
+
+
+def naming_convention(light_name: str) -> str:
+    """ Returns the name a light called `light_name` gets under the naming convention. """
+    num = 0
+    return f"{NAME_PREFIX}{light_name}.{num:03d}"
+
+
+def rename_convention(new_name: str) -> str:
+    """ Returns the name a light renamed to `new_name` gets: the name with a ".000" suffix. """
+    num = 0
+    return f"{new_name}.{num:03d}"
+
+
+def base_name(name: str) -> str:
+    """ Strips the naming convention prefix and the numeric suffix from a light name. """
+    name = SUFFIX_PATTERN.sub("", name)
+    if name.startswith(NAME_PREFIX):
+        name = name[len(NAME_PREFIX):]
+    return name
+
+
+def follows_convention(name: str) -> bool:
+    """ Returns True if a light name already follows the naming convention. """
+    return name.startswith(NAME_PREFIX) and bool(SUFFIX_PATTERN.search(name))
+
+
+def new_light(light_name: str, light_type: str, collection: bpy.types.Collection) -> bpy.types.Object:
+    """
+    Creates a light object following the naming convention.
+    Args:
+        light_name (str): The base name of the light. The light type is used if empty.
+        light_type (str): One of LIGHT_TYPES.
+        collection (bpy.types.Collection): The collection the light is linked to.
+    Returns the new light object.
+    """
+    if light_type not in LIGHT_TYPES:
+        raise ValueError(f"Light type '{light_type}' is invalid.")
+
+    if not light_name.strip():
+        light_name = light_type
+
+    # INCREMENTAL NAMING CONVENTION
+    name = naming_convention(light_name)
+
+    # Create a new light data-block
+    light_data = bpy.data.lights.new(name=name, type=light_type)
+
+    # Create a new object with the light data-block
+    light_object = bpy.data.objects.new(name=name, object_data=light_data)
+
+    collection.objects.link(light_object)
+    return light_object
@@ -0,0 +1,141 @@
+###############################
+# Blender Light Cost Estimator
+###############################
+
+import numpy as np
+
+from LightCore import LIGHT_TYPES
+
+
+# RELATIVE SAMPLING COST OF EACH LIGHT TYPE, IN LIGHT_TYPES ORDER (POINT, SUN, SPOT, AREA)
+TYPE_COST = np.array([1.0, 1.5, 1.0, 2.0])
+DEFAULT_TYPE_COST = 2.0  # COST OF A TYPE MISSING FROM LIGHT_TYPES, AS EXPENSIVE AS AN AREA LIGHT
+SUN_SHADOW_COST = 3.0  # A SHADOWED SUN TRACES SHADOW RAYS ACROSS THE WHOLE SCENE
+RADIUS_CAP = 1.0  # LARGEST SHADOW SOFT SIZE KEPT BY THE FIX, IN METERS
+FLAG_RATIO = 20.0  # COST / RELATIVE CONTRIBUTION ABOVE WHICH A LIGHT IS FLAGGED
+LOW_CONTRIBUTION = 0.05  # RELATIVE CONTRIBUTION UNDER WHICH SHADOWS ARE NOT WORTH THEIR COST
+RADIUS_TYPES = ("POINT", "SPOT")  # TYPES WHOSE RADIUS IS shadow_soft_size
+RECTANGULAR_SHAPES = ("RECTANGLE", "ELLIPSE")  # AREA SHAPES SIZED BY size AND size_y, THE OTHERS BY size ONLY
+
+
+def scene_bounds(objects: list) -> tuple:
+    """
+    Computes the world bounding box of renderable objects in one vectorized pass.
+    Args:
+        objects (list): Non-light objects of the view layer.
+    Returns:
+        tuple: (minimum, maximum) corners, or None if there is no object.
+    """
+    objects = [obj for obj in objects if obj.type not in ('LIGHT', 'CAMERA', 'EMPTY') and not obj.hide_render]
+    if not objects:
+        return None
+    matrices = np.array([np.array(obj.matrix_world) for obj in objects])  # (N, 4, 4)
+    corners = np.array([[tuple(corner) for corner in obj.bound_box] for obj in objects])  # (N, 8, 3)
+    corners = np.concatenate([corners, np.ones(corners.shape[:2] + (1,))], axis=2)
+    world = np.einsum("nij,nkj->nki", matrices, corners)[:, :, :3]
+    return world.reshape(-1, 3).min(axis=0), world.reshape(-1, 3).max(axis=0)
+
+
+def estimate(records: list, bounds: tuple) -> dict:
+    """
+    Estimates the relative render cost and contribution of every light.
+    Args:
+        records (list): Light model records (type, energy, exposure, use_shadow, shadow_soft_size,
+            shape, size, size_y, visible and location).
+        bounds (tuple): Scene bounds from scene_bounds(), or None.
+    Returns:
+        dict: NumPy arrays "cost", "contribution" (relative to the median visible light), "ratio",
+        "distance" and "flagged", plus "reasons" (one list of strings per light).
+    """
+    count = len(records)
+    types = np.array([LIGHT_TYPES.index(record["type"]) if record["type"] in LIGHT_TYPES else -1
+                      for record in records], dtype=int)
+    is_sun = types == LIGHT_TYPES.index("SUN")
+    is_area = types == LIGHT_TYPES.index("AREA")
+    has_radius = np.isin(types, [LIGHT_TYPES.index(name) for name in RADIUS_TYPES])
+    shadow = np.array([bool(record["use_shadow"]) for record in records], dtype=bool)
+    radius = np.array([record["shadow_soft_size"] or 0.0 for record in records], dtype=float)
+    side = np.array([area_side(record) for record in records], dtype=float)
+    # THE SOFT SHADOW EXTENT: THE RADIUS, OR HALF THE LONGEST SIDE OF AN AREA LIGHT
+    extent = np.where(is_area, 0.5 * side, np.where(has_radius, radius, 0.0))
+    visible = np.array([bool(record["visible"]) for record in records], dtype=bool)
+    brightness = (np.array([record["energy"] for record in records], dtype=float)
+                  * np.exp2(np.array([record["exposure"] or 0.0 for record in records], dtype=float)))
+    location = np.array([record["location"] for record in records], dtype=float).reshape(count, 3)
+
+    # DISTANCE FROM EACH LIGHT TO THE SCENE BOUNDS, 0 INSIDE
+    if bounds is None:
+        distance = np.zeros(count)
+    else:
+        low, high = bounds
+        distance = np.linalg.norm(np.maximum(np.maximum(low - location, location - high), 0.0), axis=1)
+
+    # COST: TYPE, SHADOW RAYS AND THE EXTRA SAMPLES SOFT SHADOWS NEED
+    softness = np.log2(1.0 + 4.0 * extent)
+    cost = np.where(types >= 0, TYPE_COST[types], DEFAULT_TYPE_COST) * np.where(shadow, 1.0 + softness, 0.5)
+    cost = np.where(is_sun & shadow, cost * SUN_SHADOW_COST, cost)
+
+    # CONTRIBUTION: IRRADIANCE REACHING THE SCENE. SUN STRENGTH IS ALREADY AN IRRADIANCE
+    falloff = 4.0 * np.pi * np.maximum(distance, 1.0) ** 2
+    contribution = np.where(is_sun, brightness, brightness / falloff)
+    reference = np.median(contribution[visible]) if visible.any() else 1.0
+    contribution = contribution / max(reference, 1e-9)
+
+    ratio = cost / np.maximum(contribution, 1e-6)
+    huge_radius = shadow & (extent > RADIUS_CAP)
+    shadowed_sun = is_sun & shadow
+    low_contribution = shadow & (contribution < LOW_CONTRIBUTION)
+    flagged = visible & ((ratio >= FLAG_RATIO) | huge_radius)
+
+    reasons = []
+    for index in range(count):
+        light_reasons = []
+        if huge_radius[index] and is_area[index]:
+            light_reasons.append(f"size {side[index]:.2f} m above {2.0 * RADIUS_CAP:g} m")
+        elif huge_radius[index]:
+            light_reasons.append(f"radius {radius[index]:.2f} m above {RADIUS_CAP:g} m")
+        if shadowed_sun[index]:
+            light_reasons.append("shadowed sun")
+        if low_contribution[index]:
+            light_reasons.append(f"{contribution[index]:.1%} of the median light's contribution")
+        if ratio[index] >= FLAG_RATIO:
+            light_reasons.append(f"cost/benefit {ratio[index]:.0f}")
+        reasons.append(light_reasons)
+
+    return {"cost": cost, "contribution": contribution, "ratio": ratio, "distance": distance,
+            "flagged": flagged, "low_contribution": low_contribution, "huge_radius": huge_radius,
+            "shadowed_sun": shadowed_sun, "reasons": reasons}
+
+
+def area_side(record: dict) -> float:
+    """ The longest side of an area light record, 0 for the other types. """
+    if record["type"] != "AREA":
+        return 0.0
+    size = record.get("size") or 0.0
+    if record.get("shape") in RECTANGULAR_SHAPES:
+        return max(size, record.get("size_y") or 0.0)
+    return size
+
+
+def fix_changes(records: list, estimation: dict) -> list:
+    """
+    Builds the batched fix of the flagged lights: shadows off for suns and where they barely contribute,
+    radius capped where it is huge. Area lights are scaled down to a longest side of twice the
+    radius cap, keeping their aspect.
+    Returns:
+        list: (light_name, attribute_name, value) changes for BlenderLightLogic.write_changes().
+    """
+    changes = []
+    for index, record in enumerate(records):
+        if not estimation["flagged"][index]:
+            continue
+        if estimation["low_contribution"][index] or estimation["shadowed_sun"][index]:
+            changes.append((record["name"], "use_shadow", False))
+        if estimation["huge_radius"][index] and record["type"] == "AREA":
+            scale = 2.0 * RADIUS_CAP / area_side(record)
+            changes.append((record["name"], "size", record["size"] * scale))
+            if record.get("shape") in RECTANGULAR_SHAPES:
+                changes.append((record["name"], "size_y", record["size_y"] * scale))
+        elif estimation["huge_radius"][index]:
+            changes.append((record["name"], "shadow_soft_size", RADIUS_CAP))
+    return changes
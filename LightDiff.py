@@ -0,0 +1,146 @@
+###############################
+# Blender Light Rig Diff
+###############################
+
+import json
+import os
+from collections import namedtuple
+from fnmatch import fnmatchcase
+
+import bpy
+
+from LightCore import base_name
+from LightModel import MANAGED_ATTRIBUTES, snapshot_light
+from LightSort import natural_key
+
+
+DIFF_ATTRIBUTES = ["type", "color", "energy", *MANAGED_ATTRIBUTES, "visible"]  # IN MERGE ORDER: TYPE FIRST
+MATCH_MODES = ["Base name", "Exact name"]  # BASE NAME IGNORES THE "LGT_" PREFIX AND THE ".NNN" SUFFIX
+TOLERANCE = 1e-4  # FLOAT DIFFERENCES BELOW THIS ARE NOT CHANGES
+
+# ONE MATCHED PAIR OF LIGHTS. current / other ARE LIGHT NAMES, None WHEN THE LIGHT ONLY EXISTS ON ONE SIDE
+# changes: (attribute_name, current_value, other_value) TUPLES
+RigDiffEntry = namedtuple("RigDiffEntry", ["key", "current", "other", "changes"])
+
+
+# SOURCES --------------------------------------------
+def scene_records(scene: bpy.types.Scene) -> list:
+    """ Records of the lights of another scene, visibility evaluated in its first view layer. """
+    view_layer = scene.view_layers[0]
+    return [snapshot_light(obj, view_layer) for obj in scene.objects if obj.type == 'LIGHT']
+
+
+def blend_records(path: str) -> list:
+    """
+    Records of the lights of another .blend file.
+    Its objects are linked for reading only, the library is removed afterwards
+    unless the current file already linked it.
+    """
+    path = os.path.abspath(bpy.path.abspath(path))
+    if not os.path.isfile(path):
+        raise OSError(f"No such file: '{path}'")
+    linked = {os.path.abspath(bpy.path.abspath(library.filepath)) for library in bpy.data.libraries}
+    with bpy.data.libraries.load(path, link=True) as (data_from, data_to):
+        data_to.objects = list(data_from.objects)
+
+    try:
+        records = []
+        for obj in data_to.objects:
+            if obj is None or obj.type != 'LIGHT':
+                continue
+            record = snapshot_light(obj)
+            record["visible"] = not obj.hide_render  # THE OBJECT IS IN NO VIEW LAYER OF THIS FILE
+            records.append(record)
+    finally:
+        if path not in linked:
+            for library in list(bpy.data.libraries):
+                if os.path.abspath(bpy.path.abspath(library.filepath)) == path:
+                    bpy.data.libraries.remove(library)
+    return records
+
+
+def save_preset(path: str, records: list):
+    """ Writes light records to a JSON rig preset. """
+    records = [{key: value for key, value in record.items() if key != "handle"}  # ONLY VALID IN THIS SESSION
+               for record in records]
+    with open(path, "w", encoding="utf-8") as preset_file:
+        json.dump({"lights": records}, preset_file, indent=1)
+
+
+def load_preset(path: str) -> list:
+    """
+    Reads the light records of a JSON rig preset.
+    Raises ValueError if the file is not a preset.
+    """
+    with open(path, encoding="utf-8") as preset_file:
+        data = json.load(preset_file)
+    records = data.get("lights") if isinstance(data, dict) else data
+    if not isinstance(records, list) or not all(isinstance(record, dict) and "name" in record for record in records):
+        raise ValueError(f"'{os.path.basename(path)}' is not a light rig preset")
+    for record in records:
+        for key in ("color", "location"):
+            if isinstance(record.get(key), list):
+                record[key] = tuple(record[key])
+    return records
+
+
+# DIFF --------------------------------------------
+def match_key(name: str, mode: str) -> str:
+    """ The key two lights are matched by. """
+    return base_name(name) if mode == "Base name" else name
+
+
+def values_equal(value, other) -> bool:
+    """ Compares attribute values, floats within TOLERANCE and sequences item by item. """
+    if isinstance(value, (list, tuple)) and isinstance(other, (list, tuple)):
+        return len(value) == len(other) and all(values_equal(a, b) for a, b in zip(value, other))
+    if isinstance(value, float) or isinstance(other, float):
+        if isinstance(value, (int, float)) and isinstance(other, (int, float)):
+            return abs(value - other) <= TOLERANCE
+    return value == other
+
+
+def index_records(records: list, pattern: str, mode: str) -> dict:
+    """
+    Hash index of the records matching a glob pattern.
+    Returns:
+        dict: Match key -> records, in natural name order.
+    """
+    index = {}
+    for record in records:
+        if fnmatchcase(record["name"], pattern):
+            index.setdefault(match_key(record["name"], mode), []).append(record)
+    for matches in index.values():
+        matches.sort(key=lambda record: natural_key(record["name"]))
+    return index
+
+
+def diff_records(current: list, other: list, pattern: str = "*", mode: str = "Base name") -> list:
+    """
+    Compares two light sets.
+    Lights are matched through hash indexes of their match key; lights sharing a key are
+    paired in natural name order.
+    Args:
+        current (list): Records of the current scene.
+        other (list): Records of the preset, scene or file compared against.
+        pattern (str, optional): Glob pattern of the light names compared. Defaults to "*".
+        mode (str, optional): One of MATCH_MODES. Defaults to "Base name".
+    Returns:
+        list: RigDiffEntry of every pair, changed or not, and of every unmatched light, in key order.
+    """
+    current_index = index_records(current, pattern, mode)
+    other_index = index_records(other, pattern, mode)
+    entries = []
+    for key in sorted(current_index.keys() | other_index.keys(), key=natural_key):
+        mine, theirs = current_index.get(key, []), other_index.get(key, [])
+        for position in range(max(len(mine), len(theirs))):
+            record = mine[position] if position < len(mine) else None
+            other_record = theirs[position] if position < len(theirs) else None
+            changes = []
+            if record is not None and other_record is not None:
+                changes = [(attribute, record[attribute], other_record[attribute]) for attribute in DIFF_ATTRIBUTES
+                           if attribute in record and attribute in other_record
+                           and not values_equal(record[attribute], other_record[attribute])]
+            entries.append(RigDiffEntry(key, record["name"] if record else None,
+                                        other_record["name"] if other_record else None, changes))
+    return entries
@@ -0,0 +1,115 @@
+###############################
+# Blender Light Handles
+###############################
+
+import bpy
+
+
+# ID.session_uid SURVIVES RENAMES AND UNDO. OLDER BLENDERS FALL BACK TO THE MEMORY ADDRESS,
+# WHICH DIES WITH AN UNDO OR A LOAD: ITS HANDLES THEN RESOLVE TO None
+HAS_SESSION_UID = "session_uid" in bpy.types.ID.bl_rna.properties
+
+
+def session_uid(id_data: bpy.types.ID) -> int:
+    """ Returns the per-session identifier of a data-block. """
+    return id_data.session_uid if HAS_SESSION_UID else id_data.as_pointer()
+
+
+class LightHandles:
+    """
+    Stable per-session handles on light objects.
+    Closures and journal entries keep a handle instead of a bpy reference or a name:
+    a handle survives renames, and resolving it never touches a removed object.
+    The handle -> object table is rebuilt lazily in one sweep after an undo, a load, a context
+    switch or an object deletion, dropping the dead entries in bulk.
+    Parked lights (deleted through the journal, linked to no collection) only resolve when asked
+    for explicitly, to unpark or remove them.
+    """
+
+    def __init__(self):
+        self.objects = {}  # HANDLE -> OBJECT
+        self.aliases = {}  # HANDLE OF A DELETED LIGHT -> HANDLE OF THE LIGHT RECREATED IN ITS PLACE
+        self.object_count = 0  # len(bpy.data.objects) AT THE LAST CHECK, SEE check_deletions()
+        self.stale = False
+
+    def handle(self, light: bpy.types.Object) -> int:
+        """ Returns the handle of a light, registering it on first use. """
+        uid = session_uid(light)
+        self.objects[uid] = light
+        return uid
+
+    def resolve(self, uid: int, parked: bool = False) -> bpy.types.Object:
+        """
+        Returns the light of a handle, or None if it no longer exists.
+        Args:
+            uid (int): The handle.
+            parked (bool, optional): Whether a parked light is returned too. Defaults to False.
+        """
+        if self.stale:
+            self.rebuild()
+        uid = self.aliases.get(uid, uid)
+        light = self.objects.get(uid)
+        if light is not None and not self.alive(light, uid):
+            self.rebuild()  # FREED OR REALLOCATED SINCE THE LAST SWEEP
+            light = self.objects.get(uid)
+        if light is not None and not light.users_collection and not parked:
+            return None  # PARKED SINCE THE LAST SWEEP
+        if light is None and parked:
+            light = self.find_parked(uid)
+        return light
+
+    def find_parked(self, uid: int) -> bpy.types.Object:
+        """ Sweeps the blend data for a parked light, which rebuild() leaves out. """
+        for obj in bpy.data.objects:
+            if obj.type == 'LIGHT' and not obj.users_collection and session_uid(obj) == uid:
+                self.objects[uid] = obj
+                return obj
+        return None
+
+    @staticmethod
+    def alive(light: bpy.types.Object, uid: int) -> bool:
+        """ Cheap check that a cached reference still points to the light of its handle. """
+        try:
+            return session_uid(light) == uid
+        except ReferenceError:  # THE OBJECT WAS REMOVED
+            return False
+
+    def invalidate(self):
+        """ Marks the table stale, e.g. after an undo: references may point to freed data. """
+        self.stale = True
+
+    def check_deletions(self):
+        """ Invalidates the table if objects were removed since the last check. Called on depsgraph updates. """
+        object_count = len(bpy.data.objects)
+        if object_count < self.object_count:
+            self.stale = True
+        self.object_count = object_count
+
+    def forget(self, uid: int):
+        """ Drops the light of a handle before it is removed. Aliases are kept for a later recreation. """
+        self.objects.pop(self.aliases.get(uid, uid), None)
+
+    def remap(self, uid: int, light: bpy.types.Object) -> int:
+        """
+        Points a handle, and every handle aliased to the same light, to a light recreated in its place.
+        Returns the handle of the recreated light.
+        """
+        new_uid = self.handle(light)
+        previous = self.aliases.get(uid, uid)
+        for old_uid in [key for key, target in self.aliases.items() if target == previous] + [uid, previous]:
+            if old_uid != new_uid:
+                self.aliases[old_uid] = new_uid
+        return new_uid
+
+    def rebuild(self):
+        """ Re-resolves every handle in one sweep of the blend data and drops the dead and parked ones. """
+        index = {session_uid(obj): obj for obj in bpy.data.objects if obj.type == 'LIGHT' and obj.users_collection}
+        self.objects = {uid: index[uid] for uid in self.objects if uid in index}
+        self.object_count = len(bpy.data.objects)
+        self.stale = False
+
+    def clear(self):
+        """ Drops every handle, e.g. after a new file is loaded. """
+        self.objects.clear()
+        self.aliases.clear()
+        self.stale = False
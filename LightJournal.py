@@ -0,0 +1,232 @@
+###############################
+# Blender Light Journal
+###############################
+
+from collections import deque, namedtuple
+
+import bpy
+
+from LightAnimation import restore_keys
+from LightModel import MANAGED_ATTRIBUTES
+
+
+# ONE ATTRIBUTE CHANGE OF ONE LIGHT, IDENTIFIED BY ITS LightHandles HANDLE
+# "name" RENAMES THE LIGHT, "hide_viewport" IS THE VIEWPORT HIDE, "hide_render" THE RENDER HIDE
+# ("visible" CHANGES ARE JOURNALED AS BOTH, SEE change_deltas()), "keys" HOLDS (ATTRIBUTE, FCURVE KEYS)
+# OF A LightAnimation ATTRIBUTE, SEE LightAnimation.read_keys(),
+# "exists" HOLDS A CAPTURE OF THE LIGHT (None WHEN THE LIGHT DOES NOT EXIST). A DELETED LIGHT IS PARKED,
+# NOT REMOVED: UNDO RELINKS THE ORIGINAL DATA-BLOCKS, THE CAPTURE IS ONLY A FALLBACK
+Delta = namedtuple("Delta", ["light", "attribute", "old", "new"])
+
+PARKED_PREFIX = ".blm_parked_"  # RESERVED NAME OF A PARKED LIGHT, SO NAME LOOKUPS DO NOT FIND IT
+
+
+def capture_light(light: bpy.types.Object) -> dict:
+    """
+    Captures what is needed to recreate a light if its parked data-blocks are lost,
+    e.g. purged or freed by a Blender undo.
+    Args:
+        light (bpy.types.Object): The light object to capture.
+    """
+    return {
+        "name": light.name,
+        "type": light.data.type,
+        "color": tuple(light.data.color),
+        "energy": light.data.energy,
+        "attributes": {name: getattr(light.data, name) for name in MANAGED_ATTRIBUTES if hasattr(light.data, name)},
+        "matrix": [list(row) for row in light.matrix_world],
+        "collections": [collection.name for collection in light.users_collection],
+        "scene": light.users_scene[0].name if light.users_scene else bpy.context.scene.name,
+        "hide_viewport": light.hide_viewport,
+        "hide_render": light.hide_render,
+    }
+
+
+def park_light(light: bpy.types.Object):
+    """
+    Deletes a light from the scene while keeping its data-blocks: the object is unlinked from
+    its collections and stays in bpy.data with no user until it is unparked or discarded.
+    Everything (light data, parenting, constraints, custom properties, animation) survives.
+    Its name is swapped for a reserved one, freeing the name for new lights.
+    """
+    for collection in list(light.users_collection):
+        collection.objects.unlink(light)
+    light.name = f"{PARKED_PREFIX}{light.as_pointer():x}"
+
+
+def unpark_light(light: bpy.types.Object, capture: dict):
+    """
+    Links a parked light back to the collections it was captured in, under its captured name
+    (Blender adds a suffix if a light took the name meanwhile).
+    """
+    light.name = capture["name"]
+    for collection in capture_collections(capture):
+        collection.objects.link(light)
+
+
+def capture_collections(capture: dict) -> list:
+    """ The collections of a capture that still exist, or the master collection of its scene. """
+    collections = [bpy.data.collections.get(name) for name in capture["collections"]]
+    collections = [collection for collection in collections if collection is not None]
+    if not collections:
+        scene = bpy.data.scenes.get(capture.get("scene", "")) or bpy.context.scene
+        collections = [scene.collection]
+    return collections
+
+
+def restore_light(capture: dict) -> bpy.types.Object:
+    """
+    Recreates a light from a capture and links it to its original collections.
+    Returns the new light object.
+    """
+    light_data = bpy.data.lights.new(name=capture["name"], type=capture["type"])
+    light_data.color = capture["color"]
+    light_data.energy = capture["energy"]
+    for name, value in capture["attributes"].items():
+        setattr(light_data, name, value)
+
+    light_object = bpy.data.objects.new(name=capture["name"], object_data=light_data)
+    light_object.matrix_world = capture["matrix"]
+    light_object.hide_viewport = capture.get("hide_viewport", False)
+    light_object.hide_render = capture["hide_render"]
+
+    for collection in capture_collections(capture):
+        collection.objects.link(light_object)
+    return light_object
+
+
+def change_deltas(handle: int, light: bpy.types.Object, attribute_name: str, value) -> list:
+    """
+    Returns the deltas of one attribute change.
+    "visible" sets the viewport hide and the render hide, journaled apart: undo restores
+    each one as it was, even when they did not match.
+    """
+    if attribute_name == "visible":
+        return [Delta(handle, "hide_viewport", light.hide_viewport, not value),
+                Delta(handle, "hide_render", light.hide_render, not value)]
+    return [Delta(handle, attribute_name, read_value(light, attribute_name), value)]
+
+
+def read_value(light: bpy.types.Object, attribute_name: str):
+    """ Reads the current value of a journaled attribute. """
+    if attribute_name == "name":
+        return light.name
+    if attribute_name == "visible":
+        return not (light.hide_viewport or light.hide_render)
+    if attribute_name == "hide_viewport":
+        return light.hide_viewport
+    if attribute_name == "hide_render":
+        return light.hide_render
+    if attribute_name == "exists":
+        return capture_light(light)
+    if attribute_name == "color":
+        return tuple(light.data.color)
+    return getattr(light.data, attribute_name)
+
+
+def write_value(light: bpy.types.Object, attribute_name: str, value):
+    """ Writes a journaled attribute. "exists" is handled by the caller. """
+    if attribute_name == "name":
+        light.name = value
+    elif attribute_name == "visible":
+        light.hide_viewport = not value  # VIEWPORT VISIBILITY, ANIMATABLE UNLIKE THE VIEW LAYER HIDE
+        light.hide_render = not value  # RENDER VISIBILITY
+    elif attribute_name == "hide_viewport":
+        light.hide_viewport = value
+    elif attribute_name == "hide_render":
+        light.hide_render = value
+    elif attribute_name == "keys":
+        restore_keys(light, *value)
+    else:
+        setattr(light.data, attribute_name, value)
+
+
+class LightJournal:
+    """
+    A bounded undo/redo history of Light Manager operations.
+    Each entry is a batch of Delta records; the total number of deltas kept is capped,
+    so memory stays fixed however long the session runs.
+    """
+
+    def __init__(self, max_batches: int = 128, max_deltas: int = 50000, on_discard=None):
+        """
+        Args:
+            max_batches (int, optional): Maximum number of undo steps kept. Defaults to 128.
+            max_deltas (int, optional): Maximum number of deltas kept across all steps. Defaults to 50000.
+            on_discard (callable, optional): Called as on_discard(steps) with the (label, deltas) steps
+                dropped from the history (evicted, or redo steps cleared by a new operation),
+                e.g. to remove the lights they parked.
+        """
+        self.max_deltas = max_deltas
+        self.on_discard = on_discard
+        self.undo_stack = deque(maxlen=max_batches)  # RING BUFFER: OLDEST STEPS FALL OFF
+        self.redo_stack = deque(maxlen=max_batches)
+        self.delta_count = 0
+
+    def record(self, label: str, deltas: list):
+        """
+        Records a batch of deltas as one undo step and clears the redo history.
+        Args:
+            label (str): A short description of the operation, shown in the UI.
+            deltas (list): The Delta records of the operation, in the order they were applied.
+        """
+        deltas = tuple(delta for delta in deltas if delta.old != delta.new)
+        if not deltas:
+            return
+        discarded = list(self.redo_stack)
+        self.redo_stack.clear()
+        self.delta_count -= sum(len(step[1]) for step in discarded)
+        self._discard(discarded)
+        self._push(self.undo_stack, (label, deltas))
+
+    def pop_undo(self) -> tuple:
+        """ Returns the last (label, deltas) step and moves it to the redo history, or None. """
+        if not self.undo_stack:
+            return None
+        step = self.undo_stack.pop()
+        self.delta_count -= len(step[1])
+        self._push(self.redo_stack, step)
+        return step
+
+    def pop_redo(self) -> tuple:
+        """ Returns the last undone (label, deltas) step and moves it back to the undo history, or None. """
+        if not self.redo_stack:
+            return None
+        step = self.redo_stack.pop()
+        self.delta_count -= len(step[1])
+        self._push(self.undo_stack, step)
+        return step
+
+    def clear(self):
+        """
+        Drops the whole history, e.g. after a new file is loaded.
+        on_discard is not called: the data-blocks of the history went away with the file.
+        """
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self.delta_count = 0
+
+    def _push(self, stack: deque, step: tuple):
+        """ Appends a step, evicting the oldest steps to stay within the delta budget. """
+        discarded = []
+        if len(stack) == stack.maxlen:
+            self.delta_count -= len(stack[0][1])
+            discarded.append(stack[0])
+        stack.append(step)
+        self.delta_count += len(step[1])
+        # NEVER EVICT THE STEP JUST PUSHED
+        while self.delta_count > self.max_deltas:
+            if len(self.undo_stack) > (1 if stack is self.undo_stack else 0):
+                evicted = self.undo_stack.popleft()
+            elif len(self.redo_stack) > (1 if stack is self.redo_stack else 0):
+                evicted = self.redo_stack.popleft()
+            else:
+                break
+            self.delta_count -= len(evicted[1])
+            discarded.append(evicted)
+        self._discard(discarded)
+
+    def _discard(self, steps: list):
+        """ Reports steps dropped from the history. """
+        if steps and self.on_discard:
+            self.on_discard(steps)
@@ -3,9 +3,13 @@
 ###############################
 
 from PySide6.QtCore import Qt, QSize, Signal
-from PySide6.QtGui import QFont, QWheelEvent
+from PySide6.QtGui import QFont, QWheelEvent, QKeySequence, QShortcut, QPixmap, QPainter, QColor
 from PySide6.QtWidgets import (QWidget, QTableWidget, QComboBox, QLabel, QLineEdit, QPushButton,
-                               QVBoxLayout, QHBoxLayout, QAbstractItemView, QGroupBox, QApplication, QMessageBox, QScrollArea)
+                               QVBoxLayout, QHBoxLayout, QGridLayout, QAbstractItemView, QGroupBox, QApplication,
+                               QMessageBox, QScrollArea, QProgressBar, QCheckBox, QListWidget, QTableWidgetItem,
+                               QFileDialog, QStackedWidget)
+
+from LightDiff import MATCH_MODES
 
 
 TABLE_HEADER = ["Name", "V", "S", "Type", "Color", "Exposure", "Use Temp.", "Temperature", "Radius", "Shadow"]
@@ -14,6 +18,8 @@ FONT = "Nimbus Sans, Bold"
 COLOR = "#c7c7c5"
 FONT_WEIGHT = 600
 FONT_SIZE = 11
+RANK_ROLE = Qt.UserRole + 1  # SORT RANK OF A ROW, STORED ON ITS NAME ITEM
+HANDLE_ROLE = Qt.UserRole + 2  # LIGHT HANDLE OF A ROW, STORED ON ITS NAME ITEM
 
 
 class LightManagerUI(QWidget):
@@ -29,6 +35,11 @@ class LightManagerUI(QWidget):
     signal_table_selection = Signal(object)  # (table_widget)
     signal_light_deleted = Signal(object)  # (table_widget)
     signal_refresh = Signal(object)  # (table_widget)
+    signal_undo = Signal(object)  # (table_widget)
+    signal_redo = Signal(object)  # (table_widget)
+    signal_temperature_tint = Signal(bool, object)  # (enabled, table_widget)
+    signal_sort = Signal(int, bool, object)  # (column, add_key, table_widget)
+    signal_closed = Signal()
 
     LIGHT_TYPES = [
         "POINT",
@@ -83,21 +94,48 @@ class LightManagerUI(QWidget):
         self.button_render.setLayoutDirection(Qt.RightToLeft)  # SET THE BUTTON TO POINT RIGHT
         self.button_render.setStyleSheet(" background-color: #FFC107 ; color: black;")
 
+        self.button_animate = self.push_button(" Animate ")
+        self.button_animate.setFixedSize(70, 30)
+        self.button_animate.setStyleSheet(" background-color: #90be6d ; color: black;")
+
+        self.button_diff = self.push_button(" Diff ")
+        self.button_diff.setFixedSize(70, 30)
+        self.button_diff.setStyleSheet(" background-color: #cdb4db ; color: black;")
+
+        self.button_stats = self.push_button(" Stats ")
+        self.button_stats.setFixedSize(70, 30)
+        self.button_stats.setStyleSheet(" background-color: #8ecae6 ; color: black;")
+
         self.button_rename = self.push_button("Rename Light")
         self.button_rename.setStyleSheet(" background-color: #D17D98 ; color: white;")
 
         self.button_delete = self.push_button("Delete")
         self.button_delete.setStyleSheet(" background-color: #c1121f ; color: white;")
 
-        self.light_table = QTableWidget()
-        self.light_table.setSelectionMode(QAbstractItemView.SingleSelection)  # SELECT ONLY ONE ROW AT A TIME
-        self.light_table.setEditTriggers(QAbstractItemView.NoEditTriggers)  # MAKE CELLS NON-EDITABLE
-        self.light_table.setStyleSheet("QTableWidget { background-color: #222b33 ; color: white; }")
-        for y in range(len(TABLE_HEADER)):
-            self.light_table.setColumnCount(y+1)
-            self.light_table.setHorizontalHeaderLabels(TABLE_HEADER)  # SET THE HEADER LABELS
-            header = self.light_table.horizontalHeader()
-            header.resizeSection(y, HEADER_SIZE[y])
+        self.button_undo = self.push_button("Undo")
+        self.button_undo.setStyleSheet(" background-color: #6c757d ; color: white;")
+
+        self.button_redo = self.push_button("Redo")
+        self.button_redo.setStyleSheet(" background-color: #6c757d ; color: white;")
+
+        self.button_cost = self.push_button("Flag Costly")
+        self.button_cost.setStyleSheet(" background-color: #b5651d ; color: white;")
+        self.button_cost.setToolTip("Flags lights whose shadow and sampling cost outweighs their contribution")
+
+        self.button_fix_cost = self.push_button("Fix Flagged")
+        self.button_fix_cost.setStyleSheet(" background-color: #b5651d ; color: white;")
+        self.button_fix_cost.setToolTip("Disables low contribution shadows and caps huge radii of the flagged lights")
+
+        self.checkbox_temperature_tint = QCheckBox("Tint Temperatures")
+        self.checkbox_temperature_tint.setFont(QFont(FONT, FONT_SIZE))
+        self.checkbox_temperature_tint.setStyleSheet(f"color:{COLOR}")
+
+        self.shortcut_undo = QShortcut(QKeySequence.Undo, self)  # CTRL+Z
+        self.shortcut_redo = QShortcut(QKeySequence.Redo, self)  # CTRL+SHIFT+Z / CTRL+Y
+
+        # ONE TABLE PER SCENE / VIEW LAYER, SWAPPED ON CONTEXT SWITCH. light_table IS THE ONE SHOWN
+        self.table_stack = QStackedWidget()
+        self.light_table = self.new_light_table()
 
         group_box_01 = QGroupBox()
         group_box_02 = QGroupBox()
@@ -110,8 +148,15 @@ class LightManagerUI(QWidget):
         layoutV_01_01 = QVBoxLayout()
         layoutH_02 = QHBoxLayout()
         layoutH_03 = QHBoxLayout()
-
-        # layoutV_01_01.addWidget(self.button_render) # DISABLED RENDER BUTTON
+        layoutH_04 = QHBoxLayout()
+
+        layoutH_01 = QHBoxLayout()
+        layoutH_01.addStretch()
+        layoutH_01.addWidget(self.button_diff)  # OPENS THE RIG DIFF AND MERGE WINDOW
+        layoutH_01.addWidget(self.button_stats)  # OPENS THE STATISTICS PANEL
+        layoutH_01.addWidget(self.button_animate)  # OPENS THE ANIMATION WINDOW
+        layoutH_01.addWidget(self.button_render)  # OPENS THE CONTACT SHEET
+        layoutV_01_01.addLayout(layoutH_01)
         layoutH_02.addWidget(title_light_name)
         layoutH_02.addWidget(self.entry_light_name)
         layoutH_02.addWidget(title_light_type)
@@ -120,7 +165,13 @@ class LightManagerUI(QWidget):
         layoutH_03.addWidget(self.button_rename)
         layoutV_02.addWidget(title_ligh_search)
         layoutV_02.addWidget(self.entry_ligh_search)
-        layoutV_02.addWidget(self.light_table)
+        layoutV_02.addWidget(self.table_stack)
+        layoutH_04.addWidget(self.button_undo)
+        layoutH_04.addWidget(self.button_redo)
+        layoutH_04.addWidget(self.button_cost)  # COST / BENEFIT ESTIMATE
+        layoutH_04.addWidget(self.button_fix_cost)
+        layoutH_04.addWidget(self.checkbox_temperature_tint)
+        layoutV_02.addLayout(layoutH_04)
         layoutV_02.addWidget(self.button_refresh)
         layoutV_02.addWidget(self.button_delete)
 
@@ -140,6 +191,34 @@ class LightManagerUI(QWidget):
         self.main_layout.setAlignment(Qt.AlignCenter)
         self.setLayout(self.main_layout)
 
+    # LIGHT TABLES --------------------------------------------
+    def new_light_table(self) -> QTableWidget:
+        """ Creates a light table in the table stack, without showing it. """
+        light_table = QTableWidget()
+        light_table.setSelectionMode(QAbstractItemView.SingleSelection)  # SELECT ONLY ONE ROW AT A TIME
+        light_table.setEditTriggers(QAbstractItemView.NoEditTriggers)  # MAKE CELLS NON-EDITABLE
+        light_table.setStyleSheet("QTableWidget { background-color: #222b33 ; color: white; }")
+        for y in range(len(TABLE_HEADER)):
+            light_table.setColumnCount(y+1)
+            light_table.setHorizontalHeaderLabels(TABLE_HEADER)  # SET THE HEADER LABELS
+            header = light_table.horizontalHeader()
+            header.resizeSection(y, HEADER_SIZE[y])
+        light_table.horizontalHeader().setSectionsClickable(True)  # CLICK SORTS, SHIFT+CLICK ADDS A SORT KEY
+        light_table.itemSelectionChanged.connect(self.emit_table_selection)
+        light_table.horizontalHeader().sectionClicked.connect(self.emit_sort)
+        self.table_stack.addWidget(light_table)
+        return light_table
+
+    def show_light_table(self, light_table: QTableWidget):
+        """ Shows one of the light tables; the emitters then pass it to the logic. """
+        self.table_stack.setCurrentWidget(light_table)
+        self.light_table = light_table
+
+    def remove_light_table(self, light_table: QTableWidget):
+        """ Deletes a light table that is not shown. """
+        self.table_stack.removeWidget(light_table)
+        light_table.deleteLater()
+
     # GENERIC WIDGETS --------------------------------------------
     def label_text(self, text: str) -> QLabel:
         """ Creates a QLabel with standardized font and color. 
@@ -192,8 +271,11 @@ class LightManagerUI(QWidget):
         self.button_rename.clicked.connect(self.emit_light_renamed)
         self.button_refresh.clicked.connect(self.emit_refresh)
         self.button_delete.clicked.connect(self.emit_light_deleted)
-        self.light_table.itemSelectionChanged.connect(
-            self.emit_table_selection)
+        self.button_undo.clicked.connect(self.emit_undo)
+        self.button_redo.clicked.connect(self.emit_redo)
+        self.shortcut_undo.activated.connect(self.emit_undo)
+        self.checkbox_temperature_tint.toggled.connect(self.emit_temperature_tint)
+        self.shortcut_redo.activated.connect(self.emit_redo)
         self.entry_ligh_search.textChanged.connect(self.emit_light_search)
 
     # EMITTERS --------------------------------------
@@ -251,6 +333,568 @@ class LightManagerUI(QWidget):
         """ Emits the `signal_refresh. """
         self.signal_refresh.emit(self.light_table)
 
+    def emit_undo(self):
+        """ Emits the `signal_undo`. """
+        self.signal_undo.emit(self.light_table)
+
+    def emit_redo(self):
+        """ Emits the `signal_redo`. """
+        self.signal_redo.emit(self.light_table)
+
+    def emit_temperature_tint(self, enabled: bool):
+        """ Emits the `signal_temperature_tint`. """
+        self.signal_temperature_tint.emit(enabled, self.light_table)
+
+    def emit_sort(self, column: int):
+        """ Emits the `signal_sort`. Shift+click adds the column to the sort keys. """
+        add_key = bool(QApplication.keyboardModifiers() & Qt.ShiftModifier)
+        self.signal_sort.emit(column, add_key, self.light_table)
+
+    def set_sort_indicator(self, column: int, descending: bool):
+        """ Shows the sort direction on the header of the primary sort column, or hides it if column is -1. """
+        header = self.light_table.horizontalHeader()
+        header.setSortIndicatorShown(column >= 0)
+        if column >= 0:
+            header.setSortIndicator(column, Qt.DescendingOrder if descending else Qt.AscendingOrder)
+
+    def closeEvent(self, event):
+        """ Emits the `signal_closed` so the logic can remove its Blender handlers. """
+        self.signal_closed.emit()
+        super().closeEvent(event)
+
+
+class LightContactSheetUI(QWidget):
+    """
+    A window showing one isolated preview render per light (or per collection),
+    with the progress and cancellation of the render queue.
+    """
+
+    signal_render = Signal(int, str)  # (resolution, grouping)
+    signal_cancel = Signal()
+
+    RESOLUTIONS = ["64", "128", "256"]
+    GROUPINGS = ["Per Light", "Per Collection"]
+    THUMBNAIL_COLUMNS = 4
+
+    def __init__(self):
+        """ Sets up the UI elements and connects signals to slots. """
+        super().__init__()
+        self.build_ui()
+        self.connect_signals()
+
+    def build_ui(self):
+        """ Constructs the render settings, the progress bar and the thumbnail grid. """
+        self.setWindowFlags(self.windowFlags() | Qt.WindowStaysOnTopHint)  # KEEP WINDOW ON TOP
+        self.setWindowTitle("Light Contact Sheet")
+        self.setMinimumSize(620, 520)
+
+        title_resolution = QLabel("Resolution:")
+        title_resolution.setFont(QFont(FONT, FONT_SIZE))
+        title_resolution.setStyleSheet(f"color:{COLOR}")
+        self.combo_resolution = QComboBox()
+        self.combo_resolution.addItems(self.RESOLUTIONS)
+        self.combo_resolution.setCurrentText("128")
+        self.combo_grouping = QComboBox()
+        self.combo_grouping.addItems(self.GROUPINGS)
+
+        self.button_render = QPushButton("Render")
+        self.button_render.setFont(QFont(FONT, FONT_SIZE))
+        self.button_render.setStyleSheet(" background-color: #FFC107 ; color: black;")
+        self.button_cancel = QPushButton("Cancel")
+        self.button_cancel.setFont(QFont(FONT, FONT_SIZE))
+        self.button_cancel.setStyleSheet(" background-color: #c1121f ; color: white;")
+        self.button_cancel.setEnabled(False)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setFormat("%v / %m")
+
+        self.thumbnails = QWidget()
+        self.thumbnail_layout = QGridLayout(self.thumbnails)
+        self.thumbnail_layout.setAlignment(Qt.AlignTop | Qt.AlignLeft)
+        scroll_area = QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setWidget(self.thumbnails)
+
+        layout_settings = QHBoxLayout()
+        layout_settings.addWidget(title_resolution)
+        layout_settings.addWidget(self.combo_resolution)
+        layout_settings.addWidget(self.combo_grouping)
+        layout_settings.addWidget(self.button_render)
+        layout_settings.addWidget(self.button_cancel)
+
+        main_layout = QVBoxLayout(self)
+        main_layout.addLayout(layout_settings)
+        main_layout.addWidget(self.progress_bar)
+        main_layout.addWidget(scroll_area)
+
+    def connect_signals(self):
+        """ Connects the buttons to their emitters. """
+        self.button_render.clicked.connect(self.emit_render)
+        self.button_cancel.clicked.connect(self.signal_cancel.emit)
+
+    def emit_render(self):
+        """ Emits the `signal_render` with the chosen resolution and grouping. """
+        self.signal_render.emit(int(self.combo_resolution.currentText()), self.combo_grouping.currentText())
+
+    def set_running(self, running: bool):
+        """ Toggles the buttons between the idle and rendering states. """
+        self.button_render.setEnabled(not running)
+        self.button_cancel.setEnabled(running)
+
+    def set_progress(self, done: int, total: int):
+        """ Updates the progress bar. """
+        self.progress_bar.setMaximum(max(total, 1))
+        self.progress_bar.setValue(done)
+
+    def clear_thumbnails(self):
+        """ Removes every thumbnail from the grid. """
+        while self.thumbnail_layout.count():
+            item = self.thumbnail_layout.takeAt(0)
+            if item.widget():
+                item.widget().deleteLater()
+
+    def add_thumbnail(self, label: str, image_path: str, cached: bool):
+        """
+        Adds a preview to the grid.
+        Args:
+            label (str): The light or collection name shown under the preview.
+            image_path (str): The rendered preview. A missing file is shown as a failed render.
+            cached (bool): Whether the preview came from the cache.
+        """
+        image = QLabel()
+        image.setAlignment(Qt.AlignCenter)
+        pixmap = QPixmap(image_path)
+        if pixmap.isNull():
+            image.setText("Render failed")
+        else:
+            image.setPixmap(pixmap)
+        caption = QLabel(f"{label}{'  (cached)' if cached else ''}")
+        caption.setAlignment(Qt.AlignCenter)
+        caption.setFont(QFont(FONT, 9))
+
+        cell = QWidget()
+        cell_layout = QVBoxLayout(cell)
+        cell_layout.addWidget(image)
+        cell_layout.addWidget(caption)
+        index = self.thumbnail_layout.count()
+        self.thumbnail_layout.addWidget(cell, index // self.THUMBNAIL_COLUMNS, index % self.THUMBNAIL_COLUMNS)
+
+
+class LightAnimationUI(QWidget):
+    """
+    A window to key, bake or generate (flicker, ramp) animation of a light attribute
+    over a frame range for the selected lights.
+    """
+
+    signal_apply = Signal(dict)  # (settings)
+
+    ATTRIBUTES = ["Exposure", "Color", "Temperature", "Radius", "Visibility"]
+    MODES = ["Key Current", "Bake", "Flicker", "Ramp"]
+
+    def __init__(self):
+        """ Sets up the UI elements and connects signals to slots. """
+        super().__init__()
+        self.build_ui()
+        self.connect_signals()
+
+    def build_ui(self):
+        """ Constructs the animation settings form. """
+        self.setWindowFlags(self.windowFlags() | Qt.WindowStaysOnTopHint)  # KEEP WINDOW ON TOP
+        self.setWindowTitle("Light Animation")
+        self.setMinimumWidth(360)
+
+        self.combo_attribute = QComboBox()
+        self.combo_attribute.addItems(self.ATTRIBUTES)
+        self.combo_mode = QComboBox()
+        self.combo_mode.addItems(self.MODES)
+        self.entry_start = self.number_entry("1")
+        self.entry_end = self.number_entry("100")
+        self.entry_amplitude = self.number_entry("0.5")
+        self.entry_frequency = self.number_entry("0.25")
+        self.entry_target = self.number_entry("0.0")
+        self.entry_seed = self.number_entry("0")
+
+        self.button_apply = QPushButton("Apply to Selected Lights")
+        self.button_apply.setFont(QFont(FONT, FONT_SIZE))
+        self.button_apply.setStyleSheet(" background-color: #90be6d ; color: black;")
+
+        form = QGridLayout()
+        rows = [("Attribute:", self.combo_attribute), ("Mode:", self.combo_mode),
+                ("Start Frame:", self.entry_start), ("End Frame:", self.entry_end),
+                ("Flicker Amplitude:", self.entry_amplitude), ("Flicker Frequency:", self.entry_frequency),
+                ("Ramp Target:", self.entry_target), ("Seed:", self.entry_seed)]
+        for row, (text, widget) in enumerate(rows):
+            label = QLabel(text)
+            label.setFont(QFont(FONT, FONT_SIZE))
+            label.setStyleSheet(f"color:{COLOR}")
+            form.addWidget(label, row, 0)
+            form.addWidget(widget, row, 1)
+
+        main_layout = QVBoxLayout(self)
+        main_layout.addLayout(form)
+        main_layout.addWidget(self.button_apply)
+
+    def number_entry(self, text: str) -> QLineEdit:
+        """ Creates a numeric QLineEdit with a default value. """
+        entry = CustomLineEditNum()
+        entry.setText(text)
+        entry.setFont(QFont(FONT, FONT_SIZE))
+        return entry
+
+    def connect_signals(self):
+        """ Connects the apply button to its emitter. """
+        self.button_apply.clicked.connect(self.emit_apply)
+
+    def emit_apply(self):
+        """ Gathers the settings and emits the `signal_apply`. """
+        try:
+            settings = {
+                "attribute": self.combo_attribute.currentText().lower(),
+                "mode": self.combo_mode.currentText(),
+                "start": int(float(self.entry_start.text())),
+                "end": int(float(self.entry_end.text())),
+                "amplitude": float(self.entry_amplitude.text()),
+                "frequency": float(self.entry_frequency.text()),
+                "target": float(self.entry_target.text()),
+                "seed": int(float(self.entry_seed.text())),
+            }
+        except ValueError:
+            QMessageBox.warning(self, "Light Animation", "Please enter numbers only.")
+            return
+        if settings["mode"] == "Flicker" and settings["frequency"] <= 0:
+            QMessageBox.warning(self, "Light Animation", "The flicker frequency must be above 0.")
+            return
+        self.signal_apply.emit(settings)
+
+
+class HistogramWidget(QWidget):
+    """ Draws the brightness distribution of the lights as vertical bars. """
+
+    def __init__(self):
+        super().__init__()
+        self.counts = []
+        self.setMinimumHeight(90)
+
+    def set_counts(self, counts: list):
+        """ Sets the bar heights and repaints. """
+        self.counts = counts
+        self.update()
+
+    def paintEvent(self, event):
+        """ Paints one bar per histogram bin, scaled to the fullest bin. """
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#222b33"))
+        if not self.counts or max(self.counts) == 0:
+            return
+        bar_width = self.width() / len(self.counts)
+        highest = max(self.counts)
+        for index, count in enumerate(self.counts):
+            height = int((self.height() - 4) * count / highest)
+            painter.fillRect(int(index * bar_width) + 1, self.height() - height, max(int(bar_width) - 2, 1), height,
+                             QColor("#FFC107"))
+
+
+class LightStatsUI(QWidget):
+    """
+    A panel summarizing the lighting of the active view layer: counts per type, energy per
+    collection, brightness distribution, shadows, muted lights and brightness outliers.
+    """
+
+    signal_select = Signal(str)  # (light_name)
+
+    def __init__(self):
+        """ Sets up the UI elements and connects signals to slots. """
+        super().__init__()
+        self.build_ui()
+        self.connect_signals()
+
+    def build_ui(self):
+        """ Constructs the summary labels, the histogram, the group table and the outlier list. """
+        self.setWindowFlags(self.windowFlags() | Qt.WindowStaysOnTopHint)  # KEEP WINDOW ON TOP
+        self.setWindowTitle("Lighting Statistics")
+        self.setMinimumSize(420, 560)
+
+        self.summary_text = QLabel()
+        self.summary_text.setFont(QFont(FONT, FONT_SIZE))
+        self.summary_text.setStyleSheet(f"color:{COLOR}")
+        self.histogram = HistogramWidget()
+        self.histogram_range = QLabel()
+        self.histogram_range.setFont(QFont(FONT, 9))
+
+        self.group_table = QTableWidget(0, 3)
+        self.group_table.setHorizontalHeaderLabels(["Collection", "Lights", "Brightness"])
+        self.group_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.group_table.setStyleSheet("QTableWidget { background-color: #222b33 ; color: white; }")
+
+        self.outlier_list = QListWidget()
+        self.outlier_list.setStyleSheet("QListWidget { background-color: #222b33 ; color: #f94144; }")
+
+        main_layout = QVBoxLayout(self)
+        main_layout.addWidget(self.summary_text)
+        main_layout.addWidget(QLabel("Brightness distribution (stops):"))
+        main_layout.addWidget(self.histogram)
+        main_layout.addWidget(self.histogram_range)
+        main_layout.addWidget(self.group_table)
+        self.outlier_title = QLabel("Outliers:")
+        main_layout.addWidget(self.outlier_title)
+        main_layout.addWidget(self.outlier_list)
+
+    def connect_signals(self):
+        """ Selecting an outlier emits its name. """
+        self.outlier_list.itemClicked.connect(lambda item: self.signal_select.emit(item.text()))
+
+    def show_stats(self, stats: dict, outlier_stops: float):
+        """
+        Displays a summary computed by LightStats.compute().
+        Args:
+            stats (dict): The summary.
+            outlier_stops (float): The outlier threshold used, in stops above the median.
+        """
+        per_type = "   ".join(f"{name}: {count}" for name, count in stats["per_type"].items())
+        self.summary_text.setText(
+            f"Lights: {stats['count']}   ({per_type})\n"
+            f"Visible: {stats['visible']}   Muted: {stats['muted']}   Shadows on: {stats['shadows']}\n"
+            f"Total energy: {stats['total_energy']:.1f} W   With exposure: {stats['total_brightness']:.1f} W\n"
+            f"Median brightness: {stats['median_stops']:.2f} stops")
+
+        counts, edges = stats["histogram"]
+        self.histogram.set_counts(counts)
+        self.histogram_range.setText(f"{edges[0]:.1f}  to  {edges[-1]:.1f}")
+
+        self.group_table.setRowCount(0)
+        for name, (count, brightness) in sorted(stats["per_group"].items(), key=lambda item: -item[1][1]):
+            row = self.group_table.rowCount()
+            self.group_table.insertRow(row)
+            self.group_table.setItem(row, 0, QTableWidgetItem(name))
+            self.group_table.setItem(row, 1, QTableWidgetItem(str(count)))
+            self.group_table.setItem(row, 2, QTableWidgetItem(f"{brightness:.1f}"))
+
+        self.outlier_title.setText(f"Outliers (more than {outlier_stops:g} stops above the median):")
+        self.outlier_list.clear()
+        self.outlier_list.addItems(stats["outliers"])
+
+
+class LightRigDiffUI(QWidget):
+    """
+    A window comparing the lights of the active view layer with a rig preset, another scene
+    or another .blend file, attribute by attribute, and merging the checked changes.
+    """
+
+    signal_compare = Signal(dict)  # (settings)
+    signal_merge = Signal(list)  # ([(light_name, attribute_name, value)])
+    signal_save_preset = Signal(str)  # (path)
+
+    SOURCES = ["Preset", "Scene", "Blend File"]
+    DIFF_HEADER = ["Merge", "Light", "Other Light", "Attribute", "Current", "Other"]
+
+    def __init__(self):
+        """ Sets up the UI elements and connects signals to slots. """
+        super().__init__()
+        self.merge_values = []  # ROW DATA INDEX -> (light_name, attribute_name, value)
+        self.build_ui()
+        self.connect_signals()
+
+    def build_ui(self):
+        """ Constructs the source form, the change table and the merge buttons. """
+        self.setWindowFlags(self.windowFlags() | Qt.WindowStaysOnTopHint)  # KEEP WINDOW ON TOP
+        self.setWindowTitle("Light Rig Diff")
+        self.setMinimumSize(640, 560)
+
+        self.combo_source = QComboBox()
+        self.combo_source.addItems(self.SOURCES)
+        self.combo_scene = QComboBox()
+        self.entry_path = QLineEdit()
+        self.entry_path.setPlaceholderText("Preset (.json) or .blend file")
+        self.button_browse = QPushButton("Browse...")
+        self.entry_pattern = QLineEdit("*")
+        self.entry_pattern.setToolTip("Glob pattern of the light names compared, e.g. LGT_Key*")
+        self.combo_match = QComboBox()
+        self.combo_match.addItems(MATCH_MODES)
+        self.combo_match.setToolTip("Base name ignores the LGT_ prefix and the .NNN suffix")
+        self.checkbox_changed_only = QCheckBox("Changed only")
+        self.checkbox_changed_only.setChecked(True)
+
+        self.button_compare = QPushButton("Compare")
+        self.button_compare.setStyleSheet(" background-color: #cdb4db ; color: black;")
+        self.button_save_preset = QPushButton("Save Current as Preset...")
+
+        self.diff_table = QTableWidget(0, len(self.DIFF_HEADER))
+        self.diff_table.setHorizontalHeaderLabels(self.DIFF_HEADER)
+        self.diff_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.diff_table.setStyleSheet("QTableWidget { background-color: #222b33 ; color: white; }")
+        self.diff_table.horizontalHeader().setStretchLastSection(True)
+
+        self.summary_text = QLabel()
+        self.summary_text.setStyleSheet(f"color:{COLOR}")
+        self.button_check_all = QPushButton("Check All")
+        self.button_check_none = QPushButton("Check None")
+        self.button_merge = QPushButton("Merge Checked")
+        self.button_merge.setStyleSheet(" background-color: #90be6d ; color: black;")
+
+        form = QGridLayout()
+        path_layout = QHBoxLayout()
+        path_layout.addWidget(self.entry_path)
+        path_layout.addWidget(self.button_browse)
+        rows = [("Compare with:", self.combo_source), ("Scene:", self.combo_scene), ("File:", path_layout),
+                ("Lights:", self.entry_pattern), ("Match by:", self.combo_match)]
+        for row, (text, widget) in enumerate(rows):
+            label = QLabel(text)
+            label.setFont(QFont(FONT, FONT_SIZE))
+            label.setStyleSheet(f"color:{COLOR}")
+            form.addWidget(label, row, 0)
+            if isinstance(widget, QHBoxLayout):
+                form.addLayout(widget, row, 1)
+            else:
+                form.addWidget(widget, row, 1)
+
+        compare_layout = QHBoxLayout()
+        compare_layout.addWidget(self.checkbox_changed_only)
+        compare_layout.addStretch()
+        compare_layout.addWidget(self.button_save_preset)
+        compare_layout.addWidget(self.button_compare)
+        merge_layout = QHBoxLayout()
+        merge_layout.addWidget(self.button_check_all)
+        merge_layout.addWidget(self.button_check_none)
+        merge_layout.addStretch()
+        merge_layout.addWidget(self.button_merge)
+
+        main_layout = QVBoxLayout(self)
+        main_layout.addLayout(form)
+        main_layout.addLayout(compare_layout)
+        main_layout.addWidget(self.diff_table)
+        main_layout.addWidget(self.summary_text)
+        main_layout.addLayout(merge_layout)
+
+    def connect_signals(self):
+        """ Connects the buttons to their emitters. """
+        self.button_browse.clicked.connect(self.browse)
+        self.button_compare.clicked.connect(self.emit_compare)
+        self.button_save_preset.clicked.connect(self.emit_save_preset)
+        self.button_merge.clicked.connect(self.emit_merge)
+        self.button_check_all.clicked.connect(lambda: self.set_all_checked(True))
+        self.button_check_none.clicked.connect(lambda: self.set_all_checked(False))
+
+    def set_scenes(self, scene_names: list):
+        """ Lists the scenes the current one can be compared with. """
+        current = self.combo_scene.currentText()
+        self.combo_scene.clear()
+        self.combo_scene.addItems(scene_names)
+        if current in scene_names:
+            self.combo_scene.setCurrentText(current)
+
+    def browse(self):
+        """ Picks the preset or .blend file compared with. """
+        blend = self.combo_source.currentText() == "Blend File"
+        file_filter = "Blender Files (*.blend)" if blend else "Light Rig Presets (*.json)"
+        path, _ = QFileDialog.getOpenFileName(self, "Compare With", self.entry_path.text(), file_filter)
+        if path:
+            self.entry_path.setText(path)
+
+    def emit_compare(self):
+        """ Gathers the source settings and emits the `signal_compare`. """
+        source = self.combo_source.currentText()
+        target = self.combo_scene.currentText() if source == "Scene" else self.entry_path.text().strip()
+        if not target:
+            QMessageBox.warning(self, "Light Rig Diff", "Please choose a scene or a file to compare with.")
+            return
+        self.signal_compare.emit({"source": source, "target": target, "pattern": self.entry_pattern.text() or "*",
+                                  "mode": self.combo_match.currentText()})
+
+    def emit_save_preset(self):
+        """ Asks for a path and emits the `signal_save_preset`. """
+        path, _ = QFileDialog.getSaveFileName(self, "Save Light Rig Preset", "", "Light Rig Presets (*.json)")
+        if path:
+            self.signal_save_preset.emit(path if path.endswith(".json") else f"{path}.json")
+
+    def emit_merge(self):
+        """ Emits the `signal_merge` with the checked changes. """
+        changes = []
+        for row in range(self.diff_table.rowCount()):
+            item = self.diff_table.item(row, 0)
+            if item is not None and item.checkState() == Qt.Checked:
+                changes.append(self.merge_values[item.data(Qt.UserRole)])
+        self.signal_merge.emit(changes)
+
+    def set_all_checked(self, checked: bool):
+        """ Checks or unchecks every mergeable change. """
+        state = Qt.Checked if checked else Qt.Unchecked
+        for row in range(self.diff_table.rowCount()):
+            item = self.diff_table.item(row, 0)
+            if item is not None:
+                item.setCheckState(state)
+
+    def show_error(self, text: str):
+        """ Clears the table and reports why the comparison failed. """
+        self.diff_table.setRowCount(0)
+        self.merge_values = []
+        self.summary_text.setText(text)
+
+    def show_diff(self, entries: list):
+        """
+        Displays the entries of LightDiff.diff_records(): one row per changed attribute,
+        one row per unmatched light, and one row per identical pair unless "Changed only" is checked.
+        """
+        changed_only = self.checkbox_changed_only.isChecked()
+        rows = []
+        self.merge_values = []
+        counts = {"changed": 0, "identical": 0, "current": 0, "other": 0}
+        for entry in entries:
+            if entry.current is None or entry.other is None:
+                side = "current" if entry.other is None else "other"
+                counts[side] += 1
+                rows.append((None, entry.current or "", entry.other or "", f"Only in {side}", "", ""))
+            elif entry.changes:
+                counts["changed"] += 1
+                for attribute, value, other_value in entry.changes:
+                    self.merge_values.append((entry.current, attribute, other_value))
+                    rows.append((len(self.merge_values) - 1, entry.current, entry.other, attribute,
+                                 self.format_value(value), self.format_value(other_value)))
+            else:
+                counts["identical"] += 1
+                if not changed_only:
+                    rows.append((None, entry.current, entry.other, "Identical", "", ""))
+
+        # ITEMS ONLY, NO CELL WIDGETS: FILLING THOUSANDS OF ROWS STAYS FAST
+        self.diff_table.setUpdatesEnabled(False)
+        self.diff_table.setRowCount(0)
+        self.diff_table.setRowCount(len(rows))
+        for row, (merge_index, *texts) in enumerate(rows):
+            if merge_index is not None:
+                merge_item = QTableWidgetItem()
+                merge_item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsUserCheckable)
+                merge_item.setCheckState(Qt.Checked)
+                merge_item.setData(Qt.UserRole, merge_index)
+                self.diff_table.setItem(row, 0, merge_item)
+            for column, text in enumerate(texts, start=1):
+                self.diff_table.setItem(row, column, QTableWidgetItem(text))
+        self.diff_table.setUpdatesEnabled(True)
+
+        self.summary_text.setText(
+            f"Changed lights: {counts['changed']} ({len(self.merge_values)} attributes)   "
+            f"Identical: {counts['identical']}   Only in current: {counts['current']}   "
+            f"Only in other: {counts['other']}")
+
+    def format_value(self, value) -> str:
+        """ Formats an attribute value for the change table. """
+        if isinstance(value, (list, tuple)):
+            return ", ".join(self.format_value(item) for item in value)
+        if isinstance(value, float):
+            return f"{value:.3f}"
+        return f"{value}"
+
+
+class RankedTableItem(QTableWidgetItem):
+    """
+    A table item compared by the precomputed rank stored in its RANK_ROLE data, so sorting the table
+    only moves rows: the cell widgets follow their row and are never rebuilt.
+    """
+
+    def __lt__(self, other: QTableWidgetItem) -> bool:
+        rank, other_rank = self.data(RANK_ROLE), other.data(RANK_ROLE)
+        if rank is None or other_rank is None:
+            return super().__lt__(other)
+        return rank < other_rank
+
 
 class CustomLineEditNum(QLineEdit):
     """
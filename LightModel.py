@@ -0,0 +1,280 @@
+###############################
+# Blender Light Model
+###############################
+
+import bpy
+
+
+# LIGHT DATA ATTRIBUTES MIRRORED IN THE MODEL
+MANAGED_ATTRIBUTES = ["exposure", "use_temperature", "temperature", "shadow_soft_size", "use_shadow"]
+
+
+def context_key(scene: bpy.types.Scene, view_layer: bpy.types.ViewLayer) -> tuple:
+    """ Returns the key under which the model of a (scene, view layer) pair is cached. """
+    return (scene.name, view_layer.name)
+
+
+def snapshot_light(light: bpy.types.Object, view_layer: bpy.types.ViewLayer = None) -> dict:
+    """
+    Reads the attributes displayed by the Light Manager into a plain dict.
+    Args:
+        light (bpy.types.Object): The light object to read.
+        view_layer (bpy.types.ViewLayer, optional): The view layer used to evaluate visibility.
+    """
+    record = {
+        "name": light.name,
+        "data": light.data.name,
+        "type": light.data.type,
+        "visible": light.visible_get(view_layer=view_layer) if view_layer else light.visible_get(),
+        "color": tuple(light.data.color),
+        "energy": light.data.energy,
+        "shape": getattr(light.data, "shape", None),  # AREA LIGHTS ONLY
+        "size": getattr(light.data, "size", None),
+        "size_y": getattr(light.data, "size_y", None),
+        "location": tuple(light.matrix_world.translation),
+        "collection": light.users_collection[0].name if light.users_collection else "",
+    }
+    for attribute_name in MANAGED_ATTRIBUTES:
+        record[attribute_name] = getattr(light.data, attribute_name, None)
+    return record
+
+
+class LightModel:
+    """
+    A cached snapshot of the lights of one scene and view layer.
+    Records are kept in display order and updated incrementally from depsgraph updates.
+    """
+
+    def __init__(self, scene: bpy.types.Scene, view_layer: bpy.types.ViewLayer):
+        """
+        Builds the model of the given scene and view layer.
+        Args:
+            scene (bpy.types.Scene): The scene the model follows.
+            view_layer (bpy.types.ViewLayer): The view layer the model follows.
+        """
+        self.key = context_key(scene, view_layer)
+        self.records = {}  # OBJECT NAME -> RECORD
+        self.order = []  # OBJECT NAMES IN DISPLAY ORDER
+        self.data_users = {}  # LIGHT DATA NAME -> OBJECT NAMES
+        self.pending = set()  # NAMES OF THE LIGHTS EDITED WHILE ANOTHER CONTEXT WAS ACTIVE
+        self.needs_resync = False  # LIGHTS MAY HAVE BEEN LINKED, UNLINKED OR RENAMED MEANWHILE
+        self.rebuild()
+
+    @property
+    def stale(self) -> bool:
+        """ Whether the model missed updates while another context was active. """
+        return self.needs_resync or bool(self.pending)
+
+    def view_layer(self) -> bpy.types.ViewLayer:
+        """ Returns the view layer the model follows, or None if it no longer exists. """
+        scene = bpy.data.scenes.get(self.key[0])
+        if scene is None:
+            return None
+        return scene.view_layers.get(self.key[1])
+
+    def lights(self) -> list:
+        """ Returns the light objects of the view layer, in display order. """
+        return [bpy.data.objects[name] for name in self.order if name in bpy.data.objects]
+
+    def rebuild(self):
+        """ Rescans the view layer and replaces every record. """
+        self.records.clear()
+        self.order.clear()
+        self.data_users.clear()
+        view_layer = self.view_layer()
+        if view_layer is None:
+            return
+        for obj in view_layer.objects:
+            if obj.type == 'LIGHT':
+                self._store(obj, view_layer)
+
+    def update(self, depsgraph: bpy.types.Depsgraph) -> tuple:
+        """
+        Applies the changes reported by a depsgraph update to the model.
+        Args:
+            depsgraph (bpy.types.Depsgraph): The depsgraph passed to the update handler.
+        Returns:
+            tuple: (changed, structural) - the names of the updated lights and whether lights were added or removed.
+        """
+        view_layer = self.view_layer()
+        if view_layer is None:
+            return set(), False
+
+        changed = set()
+        structural = False
+        for update in depsgraph.updates:
+            id_data = update.id.original
+            if isinstance(id_data, bpy.types.Object):
+                if id_data.type != 'LIGHT':
+                    continue
+                if id_data.name not in self.records:
+                    structural = True  # NEW OR RENAMED LIGHT
+                    continue
+                self._store(id_data, view_layer)
+                changed.add(id_data.name)
+            elif isinstance(id_data, bpy.types.Light):
+                for name in self.data_users.get(id_data.name, ()):
+                    obj = bpy.data.objects.get(name)
+                    if obj is not None:
+                        self._store(obj, view_layer)
+                        changed.add(name)
+            elif isinstance(id_data, (bpy.types.Collection, bpy.types.Scene)):
+                structural = True  # OBJECTS LINKED OR UNLINKED
+
+        if structural:
+            structural = self.resync(view_layer)
+        return changed, structural
+
+    def resync(self, view_layer: bpy.types.ViewLayer) -> bool:
+        """
+        Adds and removes records so the model matches the lights of the view layer.
+        Existing records keep their position. Returns True if the set of lights changed.
+        """
+        current = [obj for obj in view_layer.objects if obj.type == 'LIGHT']
+        current_names = {obj.name for obj in current}
+        removed = [name for name in self.order if name not in current_names]
+        for name in removed:
+            self._discard(name)
+        added = [obj for obj in current if obj.name not in self.records]
+        for obj in added:
+            self._store(obj, view_layer)
+        return bool(removed or added)
+
+    def mark_stale(self, id_data: bpy.types.ID):
+        """
+        Notes an update reported by the depsgraph of another context, if it concerns this model:
+        only the records of the updated lights are re-read on refresh(), and the view layer is
+        rescanned only if lights may have been linked, unlinked or renamed in it.
+        """
+        if isinstance(id_data, bpy.types.Object):
+            if id_data.type != 'LIGHT':
+                return
+            if id_data.name in self.records:
+                self.pending.add(id_data.name)
+            elif not self.needs_resync:
+                # NEW OR RENAMED LIGHT: ONLY IF IT IS IN THIS VIEW LAYER
+                view_layer = self.view_layer()
+                self.needs_resync = view_layer is not None and view_layer.objects.get(id_data.name) is not None
+        elif isinstance(id_data, bpy.types.Light):
+            self.pending |= self.data_users.get(id_data.name, set())
+        elif isinstance(id_data, bpy.types.Collection) and not self.needs_resync:
+            scene = bpy.data.scenes.get(self.key[0])
+            self.needs_resync = scene is not None and (
+                id_data == scene.collection or id_data in scene.collection.children_recursive)
+        elif isinstance(id_data, bpy.types.Scene) and id_data.name == self.key[0]:
+            self.needs_resync = True  # ANOTHER VIEW LAYER OF THE SAME SCENE
+
+    def refresh(self) -> tuple:
+        """
+        Brings a stale model up to date. Existing records keep their position.
+        Returns:
+            tuple: (changed, structural) - the names of the re-read lights and whether lights were added or removed.
+        """
+        pending, needs_resync = self.pending, self.needs_resync
+        self.pending, self.needs_resync = set(), False
+        view_layer = self.view_layer()
+        if view_layer is None:
+            return set(), False
+        structural = self.resync(view_layer) if needs_resync else False
+        changed = set()
+        for name in pending & self.records.keys():
+            obj = bpy.data.objects.get(name)
+            if obj is not None:
+                self._store(obj, view_layer)
+                changed.add(name)
+        return changed, structural
+
+    def _store(self, light: bpy.types.Object, view_layer: bpy.types.ViewLayer):
+        """ Snapshots a light into the model, appending it to the display order if new. """
+        record = snapshot_light(light, view_layer)
+        previous = self.records.get(light.name)
+        if previous is None:
+            self.order.append(light.name)
+        elif previous["data"] != record["data"]:
+            self.data_users.get(previous["data"], set()).discard(light.name)
+        self.records[light.name] = record
+        self.data_users.setdefault(record["data"], set()).add(light.name)
+
+    def _discard(self, name: str):
+        """ Removes a light from the model. """
+        record = self.records.pop(name, None)
+        if record is None:
+            return
+        self.order.remove(name)
+        self.data_users.get(record["data"], set()).discard(name)
+
+
+class LightModelCache:
+    """
+    Keeps one warm LightModel per (scene, view layer) so switching context swaps models
+    instead of rescanning the blend data.
+    Depsgraph updates only reach the active context: the other models holding the updated
+    lights note them, and catch up on those records only when they are next returned.
+    """
+
+    def __init__(self):
+        self.models = {}  # (SCENE NAME, VIEW LAYER NAME) -> LightModel
+
+    def get(self, scene: bpy.types.Scene, view_layer: bpy.types.ViewLayer, refresh: bool = True) -> LightModel:
+        """
+        Returns the cached model of a context, building it on first use.
+        Args:
+            refresh (bool, optional): Whether to bring a stale model up to date. Callers that need to
+                know what changed pass False and call LightModel.refresh() themselves. Defaults to True.
+        """
+        key = context_key(scene, view_layer)
+        model = self.models.get(key)
+        if model is None:
+            model = LightModel(scene, view_layer)
+            self.models[key] = model
+        elif refresh and model.stale:
+            model.refresh()
+        return model
+
+    def rebuild(self, scene: bpy.types.Scene, view_layer: bpy.types.ViewLayer) -> LightModel:
+        """ Returns the model of a context after rescanning its view layer. """
+        key = context_key(scene, view_layer)
+        model = self.models.get(key)
+        if model is None:
+            return self.get(scene, view_layer)
+        model.rebuild()
+        return model
+
+    def update(self, depsgraph: bpy.types.Depsgraph) -> tuple:
+        """
+        Updates the model of the depsgraph's context, if it has been built.
+        Returns:
+            tuple: (model, changed, structural), with model None if the context is not cached.
+        """
+        key = context_key(depsgraph.scene, depsgraph.view_layer)
+        self.mark_stale(depsgraph, skip_key=key)  # LIGHTS, THEIR DATA AND COLLECTIONS CAN BE SHARED
+        model = self.models.get(key)
+        if model is None:
+            return None, set(), False
+        changed, structural = model.update(depsgraph)
+        return model, changed, structural
+
+    def mark_stale(self, depsgraph: bpy.types.Depsgraph, skip_key: tuple = None):
+        """
+        Notes the updates of a depsgraph in the cached models they concern, to be applied by
+        LightModel.refresh() later.
+        Args:
+            skip_key (tuple, optional): Key of a model left out, e.g. the one updated right away. Defaults to None.
+        """
+        models = [model for key, model in self.models.items() if key != skip_key]
+        if not models:
+            return
+        for update in depsgraph.updates:
+            id_data = update.id.original
+            for model in models:
+                model.mark_stale(id_data)
+
+    def prune(self):
+        """ Drops the models of scenes or view layers that no longer exist. """
+        for key, model in list(self.models.items()):
+            if model.view_layer() is None:
+                del self.models[key]
+
+    def clear(self):
+        """ Drops every cached model, e.g. after a new file is loaded. """
+        self.models.clear()
@@ -0,0 +1,314 @@
+###############################
+# Blender Light Render Queue
+###############################
+
+import hashlib
+import json
+import os
+import tempfile
+from collections import deque, namedtuple
+
+import bpy
+
+
+RenderJob = namedtuple("RenderJob", ["label", "lights", "path"])  # lights: OBJECT NAMES SHOWN IN THE RENDER
+
+# PROPERTIES THAT CHANGE A PREVIEW. AN ALLOWLIST: SESSION STATE (session_uid, users, tag, ...) MUST NOT
+# CHANGE THE CACHE KEY, OR PREVIEWS WOULD NEVER BE REUSED ACROSS SESSIONS
+LIGHT_PROPERTIES = ["type", "color", "energy", "exposure", "use_temperature", "temperature", "use_shadow",
+                    "shadow_soft_size", "spot_size", "spot_blend", "size", "size_y", "shape", "angle", "spread",
+                    "use_custom_distance", "cutoff_distance", "diffuse_factor", "specular_factor",
+                    "volume_factor", "use_nodes"]
+CAMERA_PROPERTIES = ["type", "lens", "lens_unit", "sensor_fit", "sensor_width", "sensor_height",
+                     "shift_x", "shift_y", "clip_start", "clip_end", "ortho_scale"]
+MATERIAL_PROPERTIES = ["use_nodes", "diffuse_color", "metallic", "roughness", "blend_method"]
+NODE_PROPERTIES = ["blend_type", "operation", "data_type", "interpolation", "projection", "extension",
+                   "distribution", "subsurface_method"]  # NODE SETTINGS THAT ARE NOT SOCKETS
+TICK_INTERVAL = 0.01  # SECONDS BETWEEN TWO JOBS, LETS BLENDER AND THE UI PROCESS EVENTS
+
+
+def rna_state(id_data: bpy.types.ID, property_names: list) -> dict:
+    """
+    Reads the listed properties of a data-block.
+    Properties the data-block does not have (other light type, other Blender version) are skipped.
+    """
+    state = {}
+    for name in property_names:
+        if not hasattr(id_data, name):
+            continue
+        value = getattr(id_data, name)
+        if hasattr(value, "__len__") and not isinstance(value, str):
+            value = list(value)
+        state[name] = value
+    return state
+
+
+def plain_value(value):
+    """ A JSON friendly copy of an RNA value: sequences become lists, data-blocks their name. """
+    if isinstance(value, bpy.types.ID):
+        return value.name
+    if hasattr(value, "__len__") and not isinstance(value, str):
+        return [plain_value(item) for item in value]
+    return value
+
+
+def node_tree_state(node_tree: bpy.types.NodeTree, seen: set = None) -> list:
+    """
+    Node types, settings, socket values and links of a node tree, node groups included.
+    Args:
+        seen (set, optional): Names of the trees already read, so shared or recursive groups are read once.
+    """
+    seen = set() if seen is None else seen
+    if node_tree is None or node_tree.name in seen:
+        return None
+    seen.add(node_tree.name)
+    nodes = []
+    for node in node_tree.nodes:
+        state = [node.bl_idname, node.name, rna_state(node, NODE_PROPERTIES),
+                 [plain_value(getattr(socket, "default_value", None)) for socket in node.inputs]]
+        if getattr(node, "node_tree", None) is not None:
+            state.append(node_tree_state(node.node_tree, seen))
+        if getattr(node, "image", None) is not None:
+            state.append([node.image.name, node.image.filepath])
+        if getattr(node, "color_ramp", None) is not None:
+            state.append([[element.position, list(element.color)] for element in node.color_ramp.elements])
+        nodes.append(state)
+    links = [[link.from_node.name, link.from_socket.identifier, link.to_node.name, link.to_socket.identifier]
+             for link in node_tree.links]
+    return [sorted(nodes, key=lambda state: state[1]), sorted(links)]
+
+
+def material_state(material: bpy.types.Material) -> list:
+    """ Everything about a material that changes how it looks in a preview, its shader nodes included. """
+    return [rna_state(material, MATERIAL_PROPERTIES),
+            node_tree_state(material.node_tree) if material.use_nodes else None]
+
+
+def light_state(light: bpy.types.Object) -> dict:
+    """ Everything about a light that changes its contribution to the render. """
+    state = {
+        "data": rna_state(light.data, LIGHT_PROPERTIES),
+        "matrix": [list(row) for row in light.matrix_world],
+        "nodes": node_tree_state(light.data.node_tree) if getattr(light.data, "use_nodes", False) else None,
+    }
+    linking = getattr(light, "light_linking", None)  # BLENDER 4.0+
+    if linking is not None:
+        state["linking"] = [sorted(obj.name for obj in collection.all_objects) if collection else None
+                            for collection in (linking.receiver_collection, linking.blocker_collection)]
+    return state
+
+
+def scene_state(scene: bpy.types.Scene, view_layer: bpy.types.ViewLayer) -> str:
+    """
+    Digests the non-light state of the scene seen by the isolation renders:
+    render settings, camera, the placement of every renderable object and the state of its materials.
+    The world is not part of it: the isolation renders are made without it.
+    """
+    digest = hashlib.sha1()
+    camera = scene.camera
+    settings = {
+        "engine": scene.render.engine,
+        "frame": scene.frame_current,
+        "camera": [list(row) for row in camera.matrix_world] if camera else None,
+        "lens": rna_state(camera.data, CAMERA_PROPERTIES) if camera else None,
+    }
+    digest.update(json.dumps(settings, sort_keys=True, default=str).encode("utf-8"))
+    materials = {}  # MATERIAL NAME -> STATE, EACH SHARED MATERIAL READ ONCE
+    for obj in view_layer.objects:
+        if obj.type == 'LIGHT' or obj.hide_render:
+            continue
+        digest.update(obj.name.encode("utf-8"))
+        digest.update(repr([list(row) for row in obj.matrix_world]).encode("utf-8"))
+        digest.update(repr(list(obj.dimensions)).encode("utf-8"))  # CATCHES MOST GEOMETRY EDITS
+        if obj.data is not None:
+            digest.update(obj.data.name.encode("utf-8"))
+        for slot in obj.material_slots:
+            digest.update((slot.material.name if slot.material else "").encode("utf-8"))
+            if slot.material is not None and slot.material.name not in materials:
+                materials[slot.material.name] = material_state(slot.material)
+    digest.update(json.dumps(materials, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def job_hash(lights: list, scene_digest: str, resolution: int, samples: int) -> str:
+    """ Cache key of an isolation render. """
+    digest = hashlib.sha1(scene_digest.encode("utf-8"))
+    digest.update(f"{resolution}:{samples}".encode("utf-8"))
+    for light in sorted(lights, key=lambda obj: obj.name):
+        digest.update(light.name.encode("utf-8"))
+        digest.update(json.dumps(light_state(light), sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def default_cache_dir() -> str:
+    """ Previews are kept next to the saved .blend file, or in the system temp directory. """
+    if bpy.data.filepath:
+        return bpy.path.abspath("//blm_previews")
+    return os.path.join(tempfile.gettempdir(), "blm_previews")
+
+
+class LightRenderQueue:
+    """
+    Renders one isolated low resolution preview per light or group of lights.
+    Jobs run one per bpy timer tick: each render blocks Blender, but Blender and the UI
+    process events (and the queue can be cancelled) between two renders,
+    and previews are cached on disk under a hash of the light and scene state:
+    after a tweak only the affected lights are rendered again.
+    """
+
+    def __init__(self, on_progress=None, on_finished=None, cache_dir: str = None, on_error=None):
+        """
+        Args:
+            on_progress (callable, optional): Called as on_progress(done, total, job, cached) after each job.
+            on_finished (callable, optional): Called as on_finished(cancelled) when the queue ends.
+            cache_dir (str, optional): Where previews are written. Defaults to default_cache_dir().
+            on_error (callable, optional): Called as on_error(job, error) when a job fails. The queue goes on.
+        """
+        self.on_progress = on_progress
+        self.on_finished = on_finished
+        self.on_error = on_error
+        self.cache_dir = cache_dir
+        self.jobs = deque()
+        self.done = 0
+        self.total = 0
+        self.running = False
+        self.settings = {}
+
+    def start(self, groups: dict, resolution: int = 128, samples: int = 16):
+        """
+        Queues one isolation render per group of lights and starts rendering.
+        Args:
+            groups (dict): Label -> list of light objects rendered together.
+            resolution (int, optional): Size in pixels of the longest side of the previews. Defaults to 128.
+            samples (int, optional): Render samples for Cycles and EEVEE. Defaults to 16.
+        """
+        if self.running:
+            self._stop()  # REPLACED, NOT CANCELLED: on_finished IS NOT CALLED FOR THE PREVIOUS RUN
+        cache_dir = self.cache_dir or default_cache_dir()
+        os.makedirs(cache_dir, exist_ok=True)
+
+        scene = bpy.context.scene
+        scene_digest = scene_state(scene, bpy.context.view_layer)
+        self.settings = {"resolution": resolution, "samples": samples}
+        self.jobs.clear()
+        self.done = 0
+        self.total = len(groups)
+
+        cached = []
+        for label, lights in groups.items():
+            path = os.path.join(cache_dir, f"{job_hash(lights, scene_digest, resolution, samples)}.png")
+            job = RenderJob(label, [light.name for light in lights], path)
+            if os.path.exists(path):
+                cached.append(job)
+            else:
+                self.jobs.append(job)
+
+        # CACHE HITS ARE REPORTED AT ONCE, ONLY THE MISSES ARE RENDERED
+        for job in cached:
+            self.done += 1
+            self._report_progress(job, True)
+
+        if not self.jobs:
+            self._finish(False)
+            return
+        self.running = True
+        bpy.app.timers.register(self._tick, first_interval=TICK_INTERVAL)
+
+    def cancel(self):
+        """ Drops the jobs not rendered yet. The render in progress, if any, completes. """
+        running = self.running
+        self._stop()
+        if running:
+            self._finish(True)
+
+    def _stop(self):
+        """ Drops the queued jobs and the timer without reporting the end of the run. """
+        self.jobs.clear()
+        if bpy.app.timers.is_registered(self._tick):
+            bpy.app.timers.unregister(self._tick)
+        self.running = False
+
+    def _tick(self) -> float:
+        """ bpy timer callback: renders the next job. """
+        if not self.jobs:
+            self._finish(False)
+            return None
+        job = self.jobs.popleft()
+        # AN EXCEPTION ESCAPING THE TIMER WOULD UNREGISTER IT AND LEAVE THE QUEUE RUNNING FOREVER
+        try:
+            self.render_isolated(job)
+        except Exception as error:  # NO PREVIEW IS WRITTEN, THE UI SHOWS THE JOB AS FAILED
+            if self.on_error:
+                self.on_error(job, error)
+        self.done += 1
+        self._report_progress(job, False)
+        if not self.jobs:
+            self._finish(False)
+            return None
+        return TICK_INTERVAL
+
+    def render_isolated(self, job: RenderJob):
+        """
+        Renders the job's lights alone and restores the scene settings afterwards.
+        The world is removed for the render; emissive materials still contribute.
+        bpy.ops.render.render blocks Blender until the render is done.
+        """
+        scene = bpy.context.scene
+        render = scene.render
+        view_layer = bpy.context.view_layer
+        lights = [obj for obj in view_layer.objects if obj.type == 'LIGHT']
+        saved_visibility = {obj.name: obj.hide_render for obj in lights}
+        saved_render = (render.resolution_x, render.resolution_y, render.resolution_percentage,
+                        render.filepath, render.image_settings.file_format)
+        saved_samples = self._samples(scene)
+        saved_world = scene.world
+
+        try:
+            scene.world = None  # NO WORLD LIGHTING
+            for obj in lights:
+                obj.hide_render = obj.name not in job.lights
+
+            # KEEP THE ASPECT RATIO, THE LONGEST SIDE GETS THE PREVIEW RESOLUTION
+            resolution = self.settings["resolution"]
+            scale = resolution / max(render.resolution_x, render.resolution_y)
+            render.resolution_x = max(1, round(render.resolution_x * scale))
+            render.resolution_y = max(1, round(render.resolution_y * scale))
+            render.resolution_percentage = 100
+            render.filepath = job.path
+            render.image_settings.file_format = "PNG"
+            self._set_samples(scene, self.settings["samples"])
+
+            bpy.ops.render.render(write_still=True)
+        finally:
+            scene.world = saved_world
+            for obj in lights:
+                obj.hide_render = saved_visibility[obj.name]
+            (render.resolution_x, render.resolution_y, render.resolution_percentage,
+             render.filepath, render.image_settings.file_format) = saved_render
+            self._set_samples(scene, saved_samples)
+
+    def _samples(self, scene: bpy.types.Scene) -> int:
+        """ Reads the sample count of the active render engine. """
+        if scene.render.engine == "CYCLES":
+            return scene.cycles.samples
+        if scene.render.engine.startswith("BLENDER_EEVEE"):
+            return scene.eevee.taa_render_samples
+        return None
+
+    def _set_samples(self, scene: bpy.types.Scene, samples: int):
+        """ Sets the sample count of the active render engine. """
+        if samples is None:
+            return
+        if scene.render.engine == "CYCLES":
+            scene.cycles.samples = samples
+        elif scene.render.engine.startswith("BLENDER_EEVEE"):
+            scene.eevee.taa_render_samples = samples
+
+    def _report_progress(self, job: RenderJob, cached: bool):
+        if self.on_progress:
+            self.on_progress(self.done, self.total, job, cached)
+
+    def _finish(self, cancelled: bool):
+        self.running = False
+        if self.on_finished:
+            self.on_finished(cancelled)
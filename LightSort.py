@@ -0,0 +1,82 @@
+###############################
+# Blender Light Sort Keys
+###############################
+
+import re
+
+
+NUMBER_PATTERN = re.compile(r"(\d+)")
+SORT_COLUMNS = {0: "name", 1: "visible", 3: "type", 5: "exposure", 7: "temperature", 8: "radius"}  # TABLE COLUMN -> KEY
+RADIUS_TYPES = ("POINT", "SPOT")  # TYPES WITH A RADIUS ENTRY IN THE TABLE
+
+
+def natural_key(name: str) -> tuple:
+    """
+    Sort key ordering the numbers of a name by value: "LGT_Key.2" before "LGT_Key.010".
+    Text parts are compared case-insensitively.
+    """
+    # SPLITTING ON A CAPTURING GROUP PUTS THE NUMBERS AT ODD POSITIONS, SO TWO KEYS NEVER COMPARE A STR WITH AN INT
+    return tuple(int(part) if index % 2 else part.casefold() for index, part in enumerate(NUMBER_PATTERN.split(name)))
+
+
+def sort_keys(record: dict) -> dict:
+    """
+    Precomputes the sort keys of a light model record.
+    Values the table shows as "N/A" are None and always sort last.
+    """
+    return {
+        "name": natural_key(record["name"]),
+        "visible": bool(record["visible"]),
+        "type": record["type"],
+        "exposure": record["exposure"],
+        "temperature": record["temperature"] if record["use_temperature"] else None,
+        "radius": record["shadow_soft_size"] if record["type"] in RADIUS_TYPES else None,
+    }
+
+
+class LightSortKeys:
+    """
+    The sort keys of every light of a model, rewritten only for the lights that change.
+    Sorting turns them into one rank per light, so the table only moves its rows.
+    """
+
+    def __init__(self):
+        self.keys = {}  # LIGHT NAME -> SORT KEYS
+
+    def load(self, records: dict):
+        """ Replaces the keys with the ones of every record of a model. """
+        self.keys = {name: sort_keys(record) for name, record in records.items()}
+
+    def update(self, records: dict, names: set) -> set:
+        """
+        Rewrites the keys of the given lights. Lights missing from the records are removed.
+        Returns:
+            set: The names of the keys whose value changed.
+        """
+        changed = set()
+        for name in names:
+            record = records.get(name)
+            if record is None:
+                if self.keys.pop(name, None) is not None:
+                    changed.update(("name", "visible", "type", "exposure", "temperature", "radius"))
+                continue
+            keys = sort_keys(record)
+            previous = self.keys.get(name)
+            changed.update(key for key, value in keys.items() if previous is None or previous[key] != value)
+            self.keys[name] = keys
+        return changed
+
+    def ranks(self, order: list) -> dict:
+        """
+        Ranks the lights by several keys.
+        Args:
+            order (list): (key, descending) tuples, most significant first.
+        Returns:
+            dict: Light name -> rank, 0 first.
+        """
+        names = sorted(self.keys, key=lambda name: self.keys[name]["name"])  # TIE BREAK
+        # STABLE SORTS FROM THE LEAST SIGNIFICANT KEY TO THE MOST SIGNIFICANT ONE
+        for key, descending in reversed(order):
+            names.sort(key=lambda name: self.keys[name][key] or 0, reverse=descending)
+            names.sort(key=lambda name: self.keys[name][key] is None)  # N/A LAST IN BOTH DIRECTIONS
+        return {name: rank for rank, name in enumerate(names)}
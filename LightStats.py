@@ -0,0 +1,134 @@
+###############################
+# Blender Light Statistics
+###############################
+
+import numpy as np
+
+from LightCore import LIGHT_TYPES
+
+
+HISTOGRAM_BINS = 16
+OUTLIER_STOPS = 10.0  # LIGHTS THIS MANY STOPS ABOVE THE MEDIAN ARE OUTLIERS
+
+
+class LightStats:
+    """
+    Columnar statistics of a light model.
+    Every light owns a row of NumPy columns that is rewritten when the light changes,
+    so a depsgraph update costs one row write and the summary is one vectorized pass.
+    """
+
+    def __init__(self, capacity: int = 256):
+        """
+        Args:
+            capacity (int, optional): Initial number of rows, grown as needed. Defaults to 256.
+        """
+        self.slots = {}  # LIGHT NAME -> ROW
+        self.free = []  # ROWS OF REMOVED LIGHTS
+        self.groups = {}  # GROUP NAME -> CODE
+        self.group_names = []
+        self.dirty = True
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int):
+        """ Creates empty columns. """
+        self.names = np.empty(capacity, dtype=object)
+        self.type_code = np.zeros(capacity, dtype=np.int8)
+        self.group_code = np.zeros(capacity, dtype=np.int32)
+        self.energy = np.zeros(capacity)
+        self.exposure = np.zeros(capacity)
+        self.shadow = np.zeros(capacity, dtype=bool)
+        self.visible = np.zeros(capacity, dtype=bool)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+    def _grow(self):
+        """ Doubles the number of rows. """
+        columns = ["names", "type_code", "group_code", "energy", "exposure", "shadow", "visible", "alive"]
+        old = {column: getattr(self, column) for column in columns}
+        self._allocate(len(self.alive) * 2)
+        for column, values in old.items():
+            getattr(self, column)[:len(values)] = values
+
+    def load(self, records: dict):
+        """ Replaces every row with the records of a model. """
+        self.slots.clear()
+        self.free.clear()
+        self.groups.clear()
+        self.group_names.clear()
+        self.alive[:] = False
+        self.update(records, records.keys())
+
+    def update(self, records: dict, names: set):
+        """
+        Rewrites the rows of the given lights from the model records.
+        Lights missing from the records are removed.
+        """
+        for name in names:
+            record = records.get(name)
+            row = self.slots.get(name)
+            if record is None:
+                if row is not None:
+                    self.alive[row] = False
+                    self.free.append(self.slots.pop(name))
+                continue
+            if row is None:
+                if not self.free and len(self.slots) >= len(self.alive):
+                    self._grow()
+                row = self.free.pop() if self.free else len(self.slots)
+                self.slots[name] = row
+
+            group = record.get("collection", "")
+            if group not in self.groups:
+                self.groups[group] = len(self.group_names)
+                self.group_names.append(group)
+            self.names[row] = name
+            self.type_code[row] = LIGHT_TYPES.index(record["type"]) if record["type"] in LIGHT_TYPES else 0
+            self.group_code[row] = self.groups[group]
+            self.energy[row] = record["energy"]
+            self.exposure[row] = record["exposure"] or 0.0
+            self.shadow[row] = bool(record["use_shadow"])
+            self.visible[row] = bool(record["visible"])
+            self.alive[row] = True
+        self.dirty = True
+
+    def compute(self, outlier_stops: float = OUTLIER_STOPS) -> dict:
+        """
+        Summarizes the lights in one vectorized pass.
+        Returns:
+            dict: count, per_type, total_energy, total_brightness, per_group, histogram (counts, stop edges),
+            shadows, visible, muted, median_stops and outliers (names, brightest first).
+        """
+        alive = self.alive
+        types = self.type_code[alive]
+        groups = self.group_code[alive]
+        energy = self.energy[alive]
+        # EXPOSURE SCALES THE INTENSITY BY 2^EXPOSURE
+        brightness = energy * np.exp2(self.exposure[alive])
+        stops = np.log2(np.maximum(brightness, 1e-6))
+        visible = self.visible[alive]
+
+        per_type = np.bincount(types, minlength=len(LIGHT_TYPES))
+        group_energy = np.bincount(groups, weights=brightness, minlength=len(self.group_names))
+        group_count = np.bincount(groups, minlength=len(self.group_names))
+        if len(stops):
+            counts, edges = np.histogram(stops, bins=HISTOGRAM_BINS)
+        else:
+            counts, edges = np.zeros(HISTOGRAM_BINS, dtype=int), np.zeros(HISTOGRAM_BINS + 1)
+        median = float(np.median(stops)) if len(stops) else 0.0
+
+        outlier_mask = stops > median + outlier_stops
+        outlier_order = np.argsort(-brightness[outlier_mask])
+        return {
+            "count": int(alive.sum()),
+            "per_type": dict(zip(LIGHT_TYPES, per_type.tolist())),
+            "total_energy": float(energy.sum()),
+            "total_brightness": float(brightness.sum()),
+            "per_group": {name: (int(group_count[code]), float(group_energy[code]))
+                          for code, name in enumerate(self.group_names) if group_count[code]},
+            "histogram": (counts.tolist(), edges.tolist()),
+            "shadows": int(self.shadow[alive].sum()),
+            "visible": int(visible.sum()),
+            "muted": int((~visible).sum()),
+            "median_stops": median,
+            "outliers": self.names[alive][outlier_mask][outlier_order].tolist(),
+        }
@@ -18,6 +18,9 @@ import os
 import sys
 
 directory = r"YOUR_PATH\Blender_Light_Manager"
+
+# "host:port" OR A UNIX SOCKET PATH TO SERVE PIPELINE COMMANDS, e.g. BLM_COMMAND_SERVER=127.0.0.1:8765
+COMMAND_SERVER_ADDRESS = os.environ.get("BLM_COMMAND_SERVER")
 if directory not in sys.path:
     sys.path.append(directory)
 
@@ -102,12 +105,25 @@ class LaunchLightManagerOperator(bpy.types.Operator):
         ui.signal_light_renamed.connect(logic.rename_light)
         ui.signal_light_search.connect(logic.search_light)
         ui.button_render.clicked.connect(logic.render)
+        ui.button_animate.clicked.connect(logic.animate)
+        ui.button_stats.clicked.connect(logic.show_stats)
+        ui.button_diff.clicked.connect(logic.diff_rig)
+        ui.button_cost.clicked.connect(logic.flag_costly_lights)
+        ui.button_fix_cost.clicked.connect(logic.fix_costly_lights)
         ui.signal_light_deleted.connect(logic.delete)
         ui.signal_refresh.connect(logic.refresh)
+        ui.signal_undo.connect(logic.undo)
+        ui.signal_redo.connect(logic.redo)
+        ui.signal_temperature_tint.connect(logic.toggle_temperature_tint)
+        ui.signal_sort.connect(logic.sort_by_column)
+        ui.signal_closed.connect(logic.shutdown)
         
         # Initial refresh to populate the UI
         logic.refresh(ui.light_table)
 
+        if COMMAND_SERVER_ADDRESS:
+            logic.start_command_server(COMMAND_SERVER_ADDRESS)
+
         main_window_instance.show()
         return {'FINISHED'}
 
@@ -0,0 +1,11 @@
+import os
+import sys
+
+
+REPO_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STAND_IN_PATH = os.path.join(REPO_PATH, "tests", "stand_in")
+
+# THE MODULES IMPORT bpy: THE STAND-IN REPLACES IT OUTSIDE BLENDER
+for path in (REPO_PATH, STAND_IN_PATH):
+    if path not in sys.path:
+        sys.path.insert(0, path)
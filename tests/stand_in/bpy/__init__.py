@@ -0,0 +1,248 @@
+###############################
+# Stand-in bpy for tests
+###############################
+#
+# Just enough of Blender's `bpy` to run LightBatch workers without Blender:
+#
+#   python LightBatch.py --stand-in-bpy tests/stand_in --operations fixes.json shots/
+#
+# The command server tests import it in-process.
+#
+# A stand-in ".blend" file is JSON: {"lights": [{"name": str, "type": str, "energy": float, ...}]}.
+# A file holding {"crash": true} kills the worker process the way a Blender crash would,
+# a file that is not JSON fails to open.
+
+import json
+import os
+import re
+import types as _types
+
+
+def _unique_name(name: str, taken) -> str:
+    """ Blender's de-duplication: a taken "Name" or "Name.000" becomes the first free "Name.NNN". """
+    if name not in taken:
+        return name
+    base, number = re.sub(r"\.\d{3}$", "", name), 1
+    while f"{base}.{number:03d}" in taken:
+        number += 1
+    return f"{base}.{number:03d}"
+
+
+# DATA --------------------------------------------
+class ID:
+    """ Base class of the stand-in data-blocks. """
+    bl_rna = _types.SimpleNamespace(properties={})
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def as_pointer(self) -> int:
+        if getattr(self, "_removed", False):
+            raise ReferenceError(f"StructRNA of type {type(self).__name__} has been removed")
+        return id(self)
+
+    @property
+    def original(self):
+        return self
+
+
+class Matrix(list):
+    """ A 4x4 matrix as rows. """
+
+    @property
+    def translation(self) -> tuple:
+        return tuple(row[3] for row in self[:3])
+
+
+class Light(ID):
+    def __init__(self, name: str, type: str = "POINT"):
+        super().__init__(name)
+        self.type = type
+        self.color = (1.0, 1.0, 1.0)
+        self.energy = 10.0
+        self.exposure = 0.0
+        self.use_temperature = False
+        self.temperature = 6500.0
+        self.shadow_soft_size = 0.25
+        self.use_shadow = True
+
+
+class Object(ID):
+    def __init__(self, name: str, object_data: Light = None):
+        self._name = name
+        self.data = object_data
+        self.type = "LIGHT" if isinstance(object_data, Light) else "EMPTY"
+        self.hide_render = False
+        self.hide_viewport = False
+        self._hide = False  # THE VIEW LAYER HIDE
+        self.users_collection = []
+        self.matrix_world = Matrix([[1.0, 0.0, 0.0, 0.0], [0.0, 1.0, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0],
+                                    [0.0, 0.0, 0.0, 1.0]])
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, value: str):
+        self._name = _unique_name(value, {obj.name for obj in data.objects if obj is not self})
+
+    @property
+    def users_scene(self) -> list:
+        return [scene for scene in data.scenes if scene.collection in self.users_collection]
+
+    def hide_set(self, state: bool):
+        self._hide = state
+
+    def hide_get(self) -> bool:
+        return self._hide
+
+    def visible_get(self, view_layer=None) -> bool:
+        return not (self._hide or self.hide_viewport or self.hide_render)
+
+
+class CollectionObjects(list):
+    """ The objects of a collection. """
+
+    def __init__(self, collection):
+        super().__init__()
+        self.collection = collection
+
+    def link(self, obj: Object):
+        self.append(obj)
+        obj.users_collection.append(self.collection)
+
+    def unlink(self, obj: Object):
+        self.remove(obj)
+        obj.users_collection.remove(self.collection)
+
+
+class Collection(ID):
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.objects = CollectionObjects(self)
+        self.children_recursive = []
+
+
+class Scene(ID):
+    """ A scene with a single master collection (no child collections). """
+
+    def __init__(self, name: str = "Scene"):
+        super().__init__(name)
+        self.collection = Collection("Scene Collection")
+        self.view_layers = BlendDataCollection(lambda name: ViewLayer(name, self))
+        self.view_layers.new("ViewLayer")
+
+    @property
+    def objects(self) -> list:
+        objects = BlendDataCollection(None)
+        objects.extend(self.collection.objects)
+        return objects
+
+
+class ViewLayer(ID):
+    def __init__(self, name: str, scene: Scene = None):
+        super().__init__(name)
+        self.scene = scene
+
+    @property
+    def objects(self) -> list:
+        return self.scene.objects if self.scene else BlendDataCollection(None)
+
+
+class Depsgraph:
+    """ Build one with the data-blocks it reports as updated. """
+
+    def __init__(self, scene: Scene, view_layer: ViewLayer, updated: list = ()):
+        self.scene = scene
+        self.view_layer = view_layer
+        self.updates = [_types.SimpleNamespace(id=id_data) for id_data in updated]
+
+
+class BlendDataCollection(list):
+    """ bpy.data.objects / lights / collections: a list looked up by name, with unique names. """
+
+    def __init__(self, factory):
+        super().__init__()
+        self.factory = factory
+
+    def get(self, name: str, default=None):
+        return next((item for item in self if item.name == name), default)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            item = self.get(key)
+            if item is None:
+                raise KeyError(key)
+            return item
+        return list.__getitem__(self, key)
+
+    def __contains__(self, name) -> bool:
+        return self.get(name) is not None if isinstance(name, str) else list.__contains__(self, name)
+
+    def new(self, name: str, **kwargs):
+        item = self.factory(_unique_name(name, {item.name for item in self}), **kwargs)
+        self.append(item)
+        return item
+
+    def remove(self, item, do_unlink: bool = True):
+        for collection in list(getattr(item, "users_collection", [])):
+            collection.objects.unlink(item)
+        list.remove(self, item)
+        item._removed = True
+
+
+def _reset():
+    data.objects = BlendDataCollection(Object)
+    data.lights = BlendDataCollection(Light)
+    data.collections = BlendDataCollection(Collection)
+    data.scenes = BlendDataCollection(Scene)
+    data.filepath = ""
+    context.scene = data.scenes.new("Scene")
+    context.view_layer = context.scene.view_layers[0]
+
+
+data = _types.SimpleNamespace()
+context = _types.SimpleNamespace()
+_reset()
+
+
+# FILES --------------------------------------------
+def _open_mainfile(filepath: str):
+    with open(filepath, encoding="utf-8") as blend_file:
+        content = json.load(blend_file)
+    if content.get("crash"):
+        os._exit(139)  # LIKE A SEGMENTATION FAULT: NO RESULT, NO CLEANUP
+    _reset()
+    data.filepath = filepath
+    for record in content.get("lights", []):
+        light = data.lights.new(record["name"], type=record.get("type", "POINT"))
+        for attribute_name, value in record.items():
+            if attribute_name not in ("name", "type", "hide_render"):
+                setattr(light, attribute_name, tuple(value) if isinstance(value, list) else value)
+        obj = data.objects.new(record["name"], object_data=light)
+        obj.hide_render = record.get("hide_render", False)
+        context.scene.collection.objects.link(obj)
+    return {"FINISHED"}
+
+
+def _save_mainfile():
+    lights = []
+    for obj in data.objects:
+        if obj.type != "LIGHT":
+            continue
+        record = {key: value for key, value in vars(obj.data).items() if key != "name"}
+        record.update({"name": obj.name, "hide_render": obj.hide_render})
+        lights.append(record)
+    with open(data.filepath, "w", encoding="utf-8") as blend_file:
+        json.dump({"lights": lights}, blend_file)
+    return {"FINISHED"}
+
+
+ops = _types.SimpleNamespace(wm=_types.SimpleNamespace(open_mainfile=_open_mainfile, save_mainfile=_save_mainfile))
+types = _types.SimpleNamespace(ID=ID, Light=Light, Object=Object, Collection=Collection, Scene=Scene,
+                               ViewLayer=ViewLayer, Depsgraph=Depsgraph, Material=type("Material", (ID,), {}),
+                               NodeTree=type("NodeTree", (ID,), {}))
+app = _types.SimpleNamespace(handlers=_types.SimpleNamespace(depsgraph_update_post=[], load_post=[],
+                                                             undo_post=[], redo_post=[]),
+                             timers=_types.SimpleNamespace(register=lambda *args, **kwargs: None))
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+import LightAnimation
+
+
+FRAMES = np.arange(1.0, 101.0)
+
+
+def test_value_noise_is_bounded_and_seeded():
+    noise = LightAnimation.value_noise(FRAMES, 3, 0.25, seed=7)
+    assert noise.shape == (3, len(FRAMES))
+    assert np.abs(noise).max() <= 1.0
+    np.testing.assert_array_equal(noise, LightAnimation.value_noise(FRAMES, 3, 0.25, seed=7))
+    assert not np.array_equal(noise[0], noise[1])  # ONE CURVE PER LIGHT
+
+
+@pytest.mark.parametrize("frequency", [0.0, -1.0])
+def test_value_noise_rejects_a_frequency_that_is_not_positive(frequency):
+    with pytest.raises(ValueError):
+        LightAnimation.value_noise(FRAMES, 1, frequency, seed=0)
+
+
+def test_flicker_keeps_exposure_around_the_base():
+    values = LightAnimation.flicker(FRAMES, np.array([0.0, 2.0]), "exposure", 0.5, 0.25)
+    assert values.shape == (2, len(FRAMES))
+    assert np.abs(values - np.array([[0.0], [2.0]])).max() <= 0.5
+
+
+def test_visibility_flicker_turns_off_the_amplitude_share_of_frames():
+    values = LightAnimation.flicker(FRAMES, np.ones(2), "visibility", 0.3, 0.25)
+    assert set(np.unique(values)) <= {0.0, 1.0}
+    np.testing.assert_allclose((values == 0.0).mean(axis=1), 0.3, atol=0.02)
+
+
+def test_ramp_ends_on_the_target():
+    values = LightAnimation.ramp(FRAMES, np.array([0.0, 4.0]), 2.0)
+    np.testing.assert_allclose(values[:, 0], [0.0, 4.0])
+    np.testing.assert_allclose(values[:, -1], [2.0, 2.0])
+    colors = LightAnimation.ramp(FRAMES, np.array([[1.0, 0.5, 0.0]]), 0.5)
+    np.testing.assert_allclose(colors[0, -1], [0.5, 0.25, 0.0])
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+import LightBatch
+from conftest import STAND_IN_PATH
+
+
+OPERATIONS = [{"op": "rename_convention"}, {"op": "offset", "attribute": "exposure", "delta": -0.5}]
+
+
+def write_blend(path, content):
+    path.write_text(json.dumps(content), encoding="utf-8")
+    return str(path)
+
+
+def read_blend(path):
+    with open(path, encoding="utf-8") as blend_file:
+        return json.load(blend_file)
+
+
+def run(files, operations=OPERATIONS, manifest=None, workers=2, save=True):
+    results = LightBatch.run_batch(files, operations, manifest, workers, stand_in=STAND_IN_PATH, save=save)
+    return {result["file"]: result for result in results}
+
+
+@pytest.fixture
+def shots(tmp_path):
+    return [write_blend(tmp_path / f"sh{index:03d}.blend", {"lights": [{"name": "Key", "exposure": 1.0}]})
+            for index in range(3)]
+
+
+def test_operations_are_applied_and_saved(shots):
+    results = run(shots)
+    assert {result["status"] for result in results.values()} == {"ok"}
+    light = read_blend(shots[0])["lights"][0]
+    assert light["name"] == "LGT_Key.000"
+    assert light["exposure"] == 0.5
+
+
+def test_manifest_resume_skips_done_files(shots, tmp_path):
+    manifest = str(tmp_path / "progress.jsonl")
+    assert len(run(shots[:2], manifest=manifest)) == 2
+    results = run(shots, manifest=manifest)
+    assert list(results) == [shots[2]]
+    assert read_blend(shots[0])["lights"][0]["exposure"] == 0.5  # NOT APPLIED TWICE
+
+
+def test_manifest_does_not_resume_other_operations(shots, tmp_path):
+    manifest = str(tmp_path / "progress.jsonl")
+    run(shots, manifest=manifest)
+    other_operations = [{"op": "set", "attributes": {"use_shadow": False}}]
+    results = run(shots, other_operations, manifest=manifest)
+    assert set(results) == set(shots)
+    assert read_blend(shots[0])["lights"][0]["use_shadow"] is False
+
+
+def test_dry_run_does_not_save_nor_count_as_done(shots, tmp_path):
+    manifest = str(tmp_path / "progress.jsonl")
+    results = run(shots, manifest=manifest, save=False)
+    assert {result["status"] for result in results.values()} == {"dry-run"}
+    assert read_blend(shots[0])["lights"][0]["name"] == "Key"
+
+    results = run(shots, manifest=manifest)
+    assert {result["status"] for result in results.values()} == {"ok"}
+    assert set(results) == set(shots)
+    assert read_blend(shots[0])["lights"][0]["name"] == "LGT_Key.000"
+
+
+def test_worker_restarts_after_a_crash(shots, tmp_path):
+    crash = write_blend(tmp_path / "crash.blend", {"crash": True})
+    files = [crash] + shots
+    results = run(files, workers=1)
+    assert results[crash]["status"] == "failed"
+    assert "Worker exited" in results[crash]["error"]
+    assert all(results[path]["status"] == "ok" for path in shots)
+
+
+def test_broken_file_fails_without_stopping_the_worker(shots, tmp_path):
+    broken = tmp_path / "broken.blend"
+    broken.write_text("not a blend file", encoding="utf-8")
+    results = run([str(broken)] + shots, workers=1)
+    assert results[str(broken)]["status"] == "failed"
+    assert all(results[path]["status"] == "ok" for path in shots)
+
+
+def test_failed_files_are_retried_on_resume(shots, tmp_path):
+    manifest = str(tmp_path / "progress.jsonl")
+    crash = write_blend(tmp_path / "crash.blend", {"crash": True})
+    run([crash] + shots, manifest=manifest, workers=1)
+    write_blend(tmp_path / "crash.blend", {"lights": []})
+    results = run([crash] + shots, manifest=manifest, workers=1)
+    assert list(results) == [crash]
+    assert results[crash]["status"] == "ok"
@@ -0,0 +1,32 @@
+import numpy as np
+
+from LightColor import TEMPERATURE_MAX, TEMPERATURE_MIN, EffectiveColorCache, blackbody, effective_colors
+
+
+def test_blackbody_endpoints():
+    warm, daylight, cold = blackbody([TEMPERATURE_MIN, 6500.0, TEMPERATURE_MAX])
+    assert warm[0] == 1.0 and warm[2] < 0.01  # RED, NO BLUE
+    assert np.all(daylight > 0.9)  # ABOUT WHITE
+    assert cold[2] == 1.0 and cold[0] < cold[1] < cold[2]  # BLUE
+
+
+def test_blackbody_clamps_to_the_table_range():
+    np.testing.assert_array_equal(blackbody([100.0, 50000.0]), blackbody([TEMPERATURE_MIN, TEMPERATURE_MAX]))
+
+
+def test_temperature_only_tints_the_lights_using_it():
+    colors = np.array([[0.5, 0.5, 0.5], [0.5, 0.5, 0.5]])
+    result = effective_colors(colors, np.array([TEMPERATURE_MIN, TEMPERATURE_MIN]), np.array([False, True]))
+    np.testing.assert_array_equal(result[0], colors[0])
+    assert result[1][0] == 0.5 and result[1][2] < 0.01
+
+
+def test_cache_matches_the_vectorized_colors():
+    cache = EffectiveColorCache(max_size=2)
+    keys = [(1.0, 1.0, 1.0, 3200.0), (1.0, 0.5, 0.0, None), (1.0, 1.0, 1.0, 3200.0)]
+    colors = cache.lookup(keys)
+    assert colors[0] == colors[2]
+    np.testing.assert_allclose(colors[0], blackbody([3200.0])[0])
+    assert colors[1] == (1.0, 0.5, 0.0)
+    cache.lookup([(0.2, 0.2, 0.2, None)])  # OVER max_size: THE CACHE STARTS OVER
+    assert len(cache.colors) == 1
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+import bpy
+import LightCommandServer
+from LightHandles import LightHandles
+from LightJournal import LightJournal, write_value
+
+
+class Logic:
+    """ The parts of BlenderLightLogic the command server uses. """
+
+    def __init__(self):
+        self.journal = LightJournal()
+        self.handles = LightHandles()
+        self.updated = set()
+
+    def apply_deltas(self, deltas, undo):
+        affected = set()
+        for delta in deltas:
+            light = self.handles.resolve(delta.light)
+            write_value(light, delta.attribute, delta.old if undo else delta.new)
+            affected.add(light.name)
+        return affected, False
+
+    def update_rows(self, light_table, names, structural, clear_solo=False):
+        self.updated |= names
+
+    ui = type("UI", (), {"light_table": None})
+
+
+@pytest.fixture
+def server(tmp_path):
+    path = tmp_path / "shot.blend"
+    path.write_text(json.dumps({"lights": [{"name": "LGT_Key.000", "exposure": 0.0}]}), encoding="utf-8")
+    bpy.ops.wm.open_mainfile(filepath=str(path))
+    server = LightCommandServer.LightCommandServer(Logic(), str(tmp_path / "blm.sock"))
+    server.running = True
+    return server
+
+
+def drain(server, message):
+    """ Queues a message, drains it like the bpy timer and returns the decoded reply. """
+    connection = LightCommandServer._Connection(None)
+    server.requests.put((connection, LightCommandServer.CODEC_JSON, message))
+    assert server._drain() == LightCommandServer.POLL_INTERVAL  # THE TIMER STAYS REGISTERED
+    length, codec = LightCommandServer.HEADER.unpack_from(connection.outbox)
+    return LightCommandServer.decode(bytes(connection.outbox[LightCommandServer.HEADER.size:]), codec)
+
+
+@pytest.mark.parametrize("message", [None, 5, {"commands": 5}, {"commands": None}])
+def test_malformed_batches_get_an_error_reply(server, message):
+    assert "error" in drain(server, message)
+    reply = drain(server, [{"op": "set", "light": "LGT_Key.000", "attributes": {"exposure": 1.0}}])
+    assert reply["results"] == [{"ok": True, "result": True}]
+
+
+def test_malformed_commands_fail_alone(server):
+    reply = drain(server, [5, {"op": "set", "light": "LGT_Key.000", "attributes": {"exposure": 1.0}}])
+    assert [result["ok"] for result in reply["results"]] == [False, True]
+
+
+def test_bad_value_fails_the_command_before_any_write(server):
+    reply = drain(server, [{"op": "set", "light": "LGT_Key.000", "attributes": {"exposure": 1, "use_shadow": "x"}}])
+    assert reply["results"][0]["ok"] is False
+    light = bpy.data.objects.get("LGT_Key.000")
+    assert light.data.exposure == 0.0
+    assert not server.logic.journal.undo_stack
+
+
+def test_written_deltas_are_journaled_when_a_later_write_fails(server, monkeypatch):
+    calls = []
+    original = server.logic.apply_deltas
+
+    def failing_apply(deltas, undo):
+        calls.append(deltas)
+        if len(calls) == 2:
+            raise RuntimeError("write failed")
+        return original(deltas, undo)
+
+    monkeypatch.setattr(server.logic, "apply_deltas", failing_apply)
+    reply = drain(server, [{"op": "set", "light": "LGT_Key.000", "attributes": {"exposure": 2.0, "energy": 5.0}}])
+    assert reply["results"][0]["ok"] is False
+    label, deltas = server.logic.journal.undo_stack[-1]
+    assert [delta.attribute for delta in deltas] == ["exposure"]
+    assert server.logic.updated == {"LGT_Key.000"}
+
+
+def test_rename_follows_the_convention_and_journals_the_given_name(server):
+    bpy.data.objects.new("Fill.000", object_data=bpy.data.lights.new("Fill"))
+    reply = drain(server, [{"op": "rename", "light": "LGT_Key.000", "name": "Fill"}])
+    assert reply["results"] == [{"ok": True, "result": "Fill.001"}]  # "Fill.000" IS TAKEN
+    label, deltas = server.logic.journal.pop_undo()
+    assert [(delta.old, delta.new) for delta in deltas] == [("LGT_Key.000", "Fill.001")]
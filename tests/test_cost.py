@@ -0,0 +1,53 @@
+import numpy as np
+
+import LightCost
+
+
+def record(name, light_type, energy=100.0, **attributes):
+    record = {"name": name, "type": light_type, "energy": energy, "exposure": 0.0, "use_shadow": True,
+              "shadow_soft_size": 0.25, "visible": True, "location": (0.0, 0.0, 0.0)}
+    record.update(attributes)
+    return record
+
+
+def fix(records):
+    return LightCost.fix_changes(records, LightCost.estimate(records, None))
+
+
+def test_shadowed_sun_is_fixed_by_turning_its_shadows_off():
+    records = [record("Key", "POINT"), record("Fill", "POINT"), record("Sun", "SUN", energy=0.5)]
+    estimation = LightCost.estimate(records, None)
+    assert estimation["flagged"].tolist() == [False, False, True]
+    assert "shadowed sun" in estimation["reasons"][2]
+    assert LightCost.fix_changes(records, estimation) == [("Sun", "use_shadow", False)]
+
+
+def test_huge_radius_is_capped():
+    assert fix([record("Key", "POINT", shadow_soft_size=5.0)]) == [("Key", "shadow_soft_size", LightCost.RADIUS_CAP)]
+
+
+def test_huge_area_is_scaled_down_keeping_its_aspect():
+    records = [record("Panel", "AREA", shape="RECTANGLE", size=8.0, size_y=4.0)]
+    assert fix(records) == [("Panel", "size", 2.0 * LightCost.RADIUS_CAP), ("Panel", "size_y", LightCost.RADIUS_CAP)]
+    records = [record("Disk", "AREA", shape="DISK", size=8.0, size_y=100.0)]  # size_y UNUSED BY THE SHAPE
+    assert fix(records) == [("Disk", "size", 2.0 * LightCost.RADIUS_CAP)]
+
+
+def test_soft_areas_cost_more():
+    records = [record("Small", "AREA", shape="SQUARE", size=0.1), record("Large", "AREA", shape="SQUARE", size=1.5)]
+    cost = LightCost.estimate(records, None)["cost"]
+    assert cost[1] > cost[0]
+
+
+def test_unknown_types_get_the_default_cost():
+    estimation = LightCost.estimate([record("Odd", "MESH"), record("Key", "POINT")], None)
+    assert estimation["cost"][0] == LightCost.DEFAULT_TYPE_COST  # SHADOWED, NO SOFT SHADOW EXTENT
+    assert np.isfinite(estimation["ratio"]).all()
+
+
+def test_distant_lights_contribute_less():
+    bounds = (np.zeros(3), np.ones(3))
+    records = [record("Near", "POINT", location=(0.5, 0.5, 0.5)), record("Far", "POINT", location=(100.0, 0.0, 0.0))]
+    estimation = LightCost.estimate(records, bounds)
+    assert estimation["distance"][0] == 0.0
+    assert estimation["contribution"][1] < estimation["contribution"][0]
@@ -0,0 +1,39 @@
+import json
+
+import LightDiff
+
+
+def record(name, exposure=0.0):
+    return {"name": name, "type": "POINT", "color": (1.0, 1.0, 1.0), "energy": 10.0, "exposure": exposure,
+            "use_temperature": False, "temperature": 6500.0, "shadow_soft_size": 0.25, "use_shadow": True,
+            "visible": True}
+
+
+def test_match_key_modes():
+    assert LightDiff.match_key("LGT_Key.003", "Base name") == "Key"
+    assert LightDiff.match_key("LGT_Key.003", "Exact name") == "LGT_Key.003"
+
+
+def test_lights_are_paired_by_base_name():
+    current = [record("LGT_Key.000"), record("LGT_Rim.000")]
+    other = [record("LGT_Key.002", exposure=1.0), record("LGT_Fill.000")]
+    entries = {entry.key: entry for entry in LightDiff.diff_records(current, other)}
+    assert entries["Key"].current == "LGT_Key.000" and entries["Key"].other == "LGT_Key.002"
+    assert entries["Key"].changes == [("exposure", 0.0, 1.0)]
+    assert entries["Rim"].other is None and entries["Fill"].current is None
+
+
+def test_exact_names_and_patterns():
+    current = [record("LGT_Key.000"), record("LGT_Rim.000")]
+    other = [record("LGT_Key.001"), record("LGT_Rim.000", exposure=LightDiff.TOLERANCE / 2)]
+    entries = LightDiff.diff_records(current, other, pattern="LGT_R*", mode="Exact name")
+    assert [(entry.key, entry.changes) for entry in entries] == [("LGT_Rim.000", [])]
+
+
+def test_preset_round_trip_leaves_the_handles_out(tmp_path):
+    path = str(tmp_path / "rig.json")
+    LightDiff.save_preset(path, [dict(record("LGT_Key.000"), handle=42, location=(1.0, 2.0, 3.0))])
+    with open(path, encoding="utf-8") as preset_file:
+        assert "handle" not in json.load(preset_file)["lights"][0]
+    loaded = LightDiff.load_preset(path)
+    assert loaded[0]["color"] == (1.0, 1.0, 1.0) and loaded[0]["location"] == (1.0, 2.0, 3.0)
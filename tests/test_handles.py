@@ -0,0 +1,64 @@
+import pytest
+
+import bpy
+from LightHandles import LightHandles
+from LightJournal import capture_light, park_light, restore_light, unpark_light
+
+
+@pytest.fixture
+def light():
+    bpy._reset()
+    light = bpy.data.objects.new("LGT_Key.000", object_data=bpy.data.lights.new("LGT_Key.000"))
+    bpy.context.scene.collection.objects.link(light)
+    return light
+
+
+def test_handle_survives_a_rename(light):
+    handles = LightHandles()
+    uid = handles.handle(light)
+    light.name = "LGT_Rim.000"
+    handles.invalidate()
+    assert handles.resolve(uid) is light
+
+
+def test_removed_light_resolves_to_none(light):
+    handles = LightHandles()
+    uid = handles.handle(light)
+    bpy.data.objects.remove(light)  # NOT INVALIDATED: THE CACHED REFERENCE IS CHECKED
+    assert handles.resolve(uid) is None
+    assert uid not in handles.objects
+
+
+def test_rebuild_leaves_parked_lights_out(light):
+    handles = LightHandles()
+    uid = handles.handle(light)
+    capture = capture_light(light)
+    park_light(light)
+    assert handles.resolve(uid) is None
+    handles.invalidate()
+    assert handles.resolve(uid) is None and uid not in handles.objects
+    assert handles.resolve(uid, parked=True) is light  # UNPARKING ASKS FOR IT
+    unpark_light(light, capture)
+    assert handles.resolve(uid) is light
+
+
+def test_remap_redirects_every_alias(light):
+    handles = LightHandles()
+    uid = handles.handle(light)
+    capture = capture_light(light)
+    bpy.data.objects.remove(light)
+    first = restore_light(capture)
+    first_uid = handles.remap(uid, first)
+    bpy.data.objects.remove(first)
+    second = restore_light(capture)
+    handles.remap(first_uid, second)
+    assert handles.resolve(uid) is second and handles.resolve(first_uid) is second
+
+
+def test_check_deletions_invalidates_on_fewer_objects(light):
+    handles = LightHandles()
+    handles.check_deletions()
+    assert not handles.stale
+    bpy.data.objects.remove(light)
+    handles.check_deletions()
+    assert handles.stale
@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+import bpy
+from LightJournal import (Delta, LightJournal, capture_light, change_deltas, park_light, restore_light,
+                          unpark_light, write_value)
+
+
+@pytest.fixture
+def light(tmp_path):
+    path = tmp_path / "shot.blend"
+    path.write_text(json.dumps({"lights": [{"name": "LGT_Key.000", "type": "SPOT"}]}), encoding="utf-8")
+    bpy.ops.wm.open_mainfile(filepath=str(path))
+    return bpy.data.objects.get("LGT_Key.000")
+
+
+def test_parked_light_keeps_its_data_blocks(light):
+    light.data.spot_size = 0.5  # NOT IN THE CAPTURE
+    capture = capture_light(light)
+    park_light(light)
+    assert light.users_collection == []
+    assert light not in bpy.context.scene.collection.objects
+    assert light in bpy.data.objects
+
+    unpark_light(light, capture)
+    assert light in bpy.context.scene.collection.objects
+    assert light.data.spot_size == 0.5
+
+
+def test_parked_light_frees_its_name(light):
+    capture = capture_light(light)
+    park_light(light)
+    assert bpy.data.objects.get("LGT_Key.000") is None
+    assert bpy.data.objects.new("LGT_Key.000", object_data=None).name == "LGT_Key.000"
+    bpy.data.objects.remove(bpy.data.objects.get("LGT_Key.000"))
+
+    unpark_light(light, capture)
+    assert light.name == "LGT_Key.000"
+
+
+def test_visibility_undo_restores_each_hide(light):
+    light.hide_render = True  # HIDDEN FROM RENDERS ONLY
+    deltas = change_deltas(1, light, "visible", False)
+    for delta in deltas:
+        write_value(light, delta.attribute, delta.new)
+    assert light.hide_viewport and light.hide_render
+    for delta in reversed(deltas):
+        write_value(light, delta.attribute, delta.old)
+    assert not light.hide_viewport
+    assert light.hide_render
+
+
+def test_restore_falls_back_to_the_captured_scene(light):
+    capture = capture_light(light)
+    bpy.data.objects.remove(light)
+    other = bpy.data.scenes.new("Other")
+    captured_scene, bpy.context.scene = bpy.context.scene, other
+    try:
+        restored = restore_light(capture)
+    finally:
+        bpy.context.scene = captured_scene
+    assert restored.users_collection == [captured_scene.collection]
+
+
+def test_cleared_redo_steps_are_discarded():
+    discarded = []
+    journal = LightJournal(on_discard=discarded.extend)
+    journal.record("Delete", [Delta(1, "exists", {}, None)])
+    journal.pop_undo()
+    journal.record("Exposure", [Delta(2, "exposure", 0.0, 1.0)])
+    assert [label for label, _deltas in discarded] == ["Delete"]
+    assert journal.delta_count == 1
+
+
+def test_evicted_steps_are_discarded():
+    discarded = []
+    journal = LightJournal(max_batches=2, on_discard=discarded.extend)
+    for index in range(3):
+        journal.record(f"Step {index}", [Delta(index, "exposure", 0.0, 1.0)])
+    assert [label for label, _deltas in discarded] == ["Step 0"]
+
+    journal = LightJournal(max_deltas=2, on_discard=discarded.extend)
+    journal.record("Big", [Delta(1, "exposure", 0.0, 1.0), Delta(2, "exposure", 0.0, 1.0)])
+    journal.record("Small", [Delta(3, "exposure", 0.0, 1.0)])
+    assert discarded[-1][0] == "Big"
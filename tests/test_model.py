@@ -0,0 +1,74 @@
+import pytest
+
+import bpy
+from LightModel import LightModelCache
+
+
+def add_light(scene, name):
+    light = bpy.data.objects.new(name, object_data=bpy.data.lights.new(name))
+    scene.collection.objects.link(light)
+    return light
+
+
+@pytest.fixture
+def scenes():
+    bpy._reset()
+    shot_a, shot_b = bpy.context.scene, bpy.data.scenes.new("Shot B")
+    shared = add_light(shot_a, "LGT_Key.000")
+    shot_b.collection.objects.link(shared)
+    add_light(shot_b, "LGT_Rim.000")
+    return shot_a, shot_b
+
+
+def update(models, scene, updated):
+    """ Reports an update of the given data-blocks through the depsgraph of a scene. """
+    return models.update(bpy.types.Depsgraph(scene, scene.view_layers[0], updated))
+
+
+def test_inactive_model_catches_up_when_shown_again(scenes):
+    shot_a, shot_b = scenes
+    models = LightModelCache()
+    model_b = models.get(shot_b, shot_b.view_layers[0])
+    model_a = models.get(shot_a, shot_a.view_layers[0])
+
+    # EDITED WHILE SHOT A IS ACTIVE: ONLY SHOT A'S DEPSGRAPH REPORTS IT
+    key = bpy.data.objects.get("LGT_Key.000")
+    key.data.exposure = 2.0
+    add_light(shot_b, "LGT_Fill.000")
+    shot_b.collection.objects.unlink(bpy.data.objects.get("LGT_Rim.000"))
+    update(models, shot_a, [key.data, shot_b.collection])
+    assert model_b.stale and not model_a.stale
+
+    model = models.get(shot_b, shot_b.view_layers[0], refresh=False)
+    assert model is model_b
+    assert model_b.refresh() == ({"LGT_Key.000"}, True)
+    assert model_b.order == ["LGT_Key.000", "LGT_Fill.000"]
+    assert model_b.records["LGT_Key.000"]["exposure"] == 2.0
+    assert not model_b.stale
+
+
+def test_only_models_holding_the_updated_lights_go_stale(scenes):
+    shot_a, shot_b = scenes
+    models = LightModelCache()
+    model_b = models.get(shot_b, shot_b.view_layers[0])
+    models.get(shot_a, shot_a.view_layers[0])
+
+    solo = add_light(shot_a, "LGT_Solo.000")
+    update(models, shot_a, [solo, solo.data, shot_a])  # A LIGHT OF SHOT A ONLY, AND A FRAME CHANGE
+    assert not model_b.stale
+
+    empty = bpy.data.objects.new("Empty", object_data=None)
+    update(models, shot_a, [empty])
+    assert not model_b.stale
+
+
+def test_stale_records_are_the_only_ones_read_again(scenes):
+    shot_a, shot_b = scenes
+    models = LightModelCache()
+    model_b = models.get(shot_b, shot_b.view_layers[0])
+    rim = bpy.data.objects.get("LGT_Rim.000")
+    rim.data.exposure = 3.0  # NOT REPORTED: STAYS AS CACHED
+    key = bpy.data.objects.get("LGT_Key.000")
+    update(models, shot_a, [key])
+    assert model_b.refresh() == ({"LGT_Key.000"}, False)
+    assert model_b.records["LGT_Rim.000"]["exposure"] == 0.0
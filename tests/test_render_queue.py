@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+
+import bpy
+import LightRenderQueue
+from LightRenderQueue import LightRenderQueue as Queue, RenderJob, job_hash, material_state
+
+
+def node(name, value, **settings):
+    return SimpleNamespace(bl_idname="ShaderNodeEmission", name=name,
+                           inputs=[SimpleNamespace(default_value=value)], **settings)
+
+
+def material(strength):
+    tree = SimpleNamespace(name="Glow", nodes=[node("Emission", strength)], links=[])
+    return SimpleNamespace(use_nodes=True, node_tree=tree, diffuse_color=(0.8, 0.8, 0.8, 1.0))
+
+
+def test_shader_edits_change_the_material_state():
+    assert material_state(material(1.0)) == material_state(material(1.0))
+    assert material_state(material(1.0)) != material_state(material(5.0))
+
+
+def test_a_failing_job_is_reported_and_the_queue_goes_on(monkeypatch):
+    errors, finished = [], []
+    queue = Queue(on_finished=finished.append, on_error=lambda job, error: errors.append((job.label, error)))
+    jobs = [RenderJob("Key", ["Key"], "key.png"), RenderJob("Rim", ["Rim"], "rim.png")]
+    queue.jobs.extend(jobs)
+    queue.total, queue.running = len(jobs), True
+
+    def render_isolated(job):
+        if job.label == "Key":
+            raise OSError("Disk full")
+    monkeypatch.setattr(queue, "render_isolated", render_isolated)
+
+    assert queue._tick() == LightRenderQueue.TICK_INTERVAL  # THE TIMER STAYS REGISTERED
+    assert [label for label, error in errors] == ["Key"]
+    assert queue._tick() is None
+    assert queue.done == 2 and finished == [False]
+
+
+def test_cache_key_follows_the_light_state():
+    bpy._reset()
+    key = bpy.data.objects.new("LGT_Key.000", object_data=bpy.data.lights.new("LGT_Key.000"))
+    rim = bpy.data.objects.new("LGT_Rim.000", object_data=bpy.data.lights.new("LGT_Rim.000"))
+    digest = job_hash([key, rim], "scene", 128, 16)
+    assert job_hash([rim, key], "scene", 128, 16) == digest  # ORDER DOES NOT MATTER
+    assert job_hash([key, rim], "scene", 256, 16) != digest
+    assert job_hash([key, rim], "other scene", 128, 16) != digest
+    key.data.exposure = 1.0
+    assert job_hash([key, rim], "scene", 128, 16) != digest
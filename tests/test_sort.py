@@ -0,0 +1,36 @@
+from LightSort import LightSortKeys, natural_key
+
+
+def record(name, exposure=0.0, light_type="POINT", temperature=None):
+    return {"name": name, "visible": True, "type": light_type, "exposure": exposure,
+            "use_temperature": temperature is not None, "temperature": temperature or 6500.0,
+            "shadow_soft_size": 0.25}
+
+
+def test_natural_sort_orders_numbers_by_value():
+    names = ["LGT_Key.010", "lgt_key.2", "LGT_Fill.1", "LGT_Key.1"]
+    assert sorted(names, key=natural_key) == ["LGT_Fill.1", "LGT_Key.1", "lgt_key.2", "LGT_Key.010"]
+
+
+def test_ranks_put_missing_values_last_both_ways():
+    keys = LightSortKeys()
+    keys.load({"A": record("A", temperature=3000.0), "B": record("B"), "C": record("C", temperature=9000.0)})
+    assert keys.ranks([("temperature", False)]) == {"A": 0, "C": 1, "B": 2}
+    assert keys.ranks([("temperature", True)]) == {"C": 0, "A": 1, "B": 2}
+
+
+def test_ranks_break_ties_with_the_next_key():
+    keys = LightSortKeys()
+    keys.load({"A": record("A", 1.0, "SPOT"), "B": record("B", 2.0, "AREA"), "C": record("C", 3.0, "SPOT")})
+    assert keys.ranks([("type", False), ("exposure", True)]) == {"B": 0, "C": 1, "A": 2}
+
+
+def test_update_reports_the_changed_keys():
+    keys = LightSortKeys()
+    records = {"A": record("A"), "B": record("B")}
+    keys.load(records)
+    records["A"] = record("A", exposure=2.0)
+    assert keys.update(records, {"A", "B"}) == {"exposure"}
+    del records["B"]
+    assert "name" in keys.update(records, {"B"})
+    assert list(keys.keys) == ["A"]
@@ -0,0 +1,32 @@
+from LightStats import LightStats
+
+
+def record(energy, light_type="POINT", collection="Key", visible=True):
+    return {"type": light_type, "energy": energy, "exposure": 0.0, "use_shadow": True, "visible": visible,
+            "collection": collection}
+
+
+def test_outliers_are_far_above_the_median_brightest_first():
+    records = {f"LGT_{index}": record(10.0) for index in range(5)}
+    records["LGT_Sun"] = record(10.0 * 2 ** 12, "SUN")
+    records["LGT_Flare"] = record(10.0 * 2 ** 11)
+    stats = LightStats()
+    stats.load(records)
+    summary = stats.compute()
+    assert summary["outliers"] == ["LGT_Sun", "LGT_Flare"]
+    assert summary["per_type"]["SUN"] == 1 and summary["count"] == 7
+    assert stats.compute(outlier_stops=20.0)["outliers"] == []
+
+
+def test_rows_are_reused_and_grown():
+    stats = LightStats(capacity=2)
+    records = {"A": record(1.0, collection="Fill"), "B": record(2.0, visible=False)}
+    stats.load(records)
+    del records["A"]
+    records["C"] = record(4.0)
+    records["D"] = record(8.0)
+    stats.update(records, {"A", "C", "D"})
+    summary = stats.compute()
+    assert summary["count"] == 3 and summary["total_energy"] == 14.0
+    assert summary["muted"] == 1
+    assert summary["per_group"] == {"Key": (3, 14.0)}